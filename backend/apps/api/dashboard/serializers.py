@@ -5,10 +5,12 @@ Dashboard API Serializers
 """
 from rest_framework import serializers
 
+from apps.core import bulk, export, search
 from apps.core.models import Comment, Post, User
+from apps.core.serializers import FastReadSerializerMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """ユーザーシリアライザー"""
 
     class Meta:
@@ -17,11 +19,25 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined']
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    """コメントシリアライザー"""
+class CommentPostSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
+    """コメント先の投稿シリアライザー（`?expand=post` 指定時）"""
+
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'is_published']
+
+
+class CommentSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
+    """
+    コメントシリアライザー
+
+    `post` は投稿IDで、`?expand=post` 指定時は投稿のオブジェクトになる
+    """
 
     author = UserSerializer(read_only=True)
 
+    expandable_fields = {'post': (CommentPostSerializer, {'read_only': True})}
+
     class Meta:
         model = Comment
         fields = ['id', 'post', 'author', 'content', 'created_at']
@@ -36,11 +52,10 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         fields = ['post', 'content']
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """投稿一覧用シリアライザー"""
 
     author = UserSerializer(read_only=True)
-    comment_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -54,21 +69,22 @@ class PostListSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
-    def get_comment_count(self, obj: Post) -> int:
-        """
-        コメント数を取得
-
-        :param obj: Postインスタンス
-        :return: コメント数
-        """
-        return obj.comments.count()
-
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """投稿詳細用シリアライザー"""
 
     author = UserSerializer(read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = CommentSerializer(
+        many=True,
+        read_only=True,
+        source='embedded_comments',
+        help_text='Newest comments of the post. Older comments are fetched from comments_next.',
+    )
+    comments_next = serializers.URLField(
+        read_only=True,
+        allow_null=True,
+        help_text='URL of the next page of comments, or null when all comments are embedded.',
+    )
 
     class Meta:
         model = Post
@@ -79,6 +95,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'author',
             'is_published',
             'comments',
+            'comments_next',
             'created_at',
             'updated_at',
         ]
@@ -90,3 +107,139 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ['title', 'content', 'is_published']
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """検索条件シリアライザー"""
+
+    q = serializers.CharField(
+        max_length=200,
+        help_text='Search terms separated by spaces. Each term must be at least 3 characters.',
+    )
+
+    def validate_q(self, value: str) -> str:
+        """
+        検索語を検証
+
+        trigramインデックスは3文字未満の語に一致しないため、短い語を拒否する
+
+        :param value: 検索語
+        :return: 検証済みの検索語
+        """
+        if any(len(term) < search.MIN_QUERY_LENGTH for term in value.split()):
+            raise serializers.ValidationError(
+                f'Each search term must be at least {search.MIN_QUERY_LENGTH} characters.'
+            )
+        return value
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """検索結果シリアライザー"""
+
+    type = serializers.ChoiceField(choices=search.RESULT_TYPES)
+    id = serializers.IntegerField()
+    post_id = serializers.IntegerField()
+    title = serializers.CharField(help_text='Post title as HTML, with matches wrapped in <mark>.')
+    snippet = serializers.CharField(help_text='Matching excerpt as HTML, with matches wrapped in <mark>.')
+    rank = serializers.FloatField(help_text='Relevance score (higher is more relevant).')
+
+
+class PostBulkUpdateSerializer(PostCreateUpdateSerializer):
+    """
+    投稿一括更新用シリアライザー
+
+    `id` 以外は省略可能（部分更新）
+    """
+
+    id = serializers.IntegerField()
+
+    class Meta(PostCreateUpdateSerializer.Meta):
+        fields = ['id', *PostCreateUpdateSerializer.Meta.fields]
+        extra_kwargs = {'title': {'required': False}, 'content': {'required': False}}
+
+
+class CommentBulkCreateSerializer(CommentCreateSerializer):
+    """
+    コメント一括作成用シリアライザー
+
+    投稿の存在はビューがまとめて取得したIDの集合（context['post_ids']）で確認し、
+    要素ごとのクエリを発行しない
+    """
+
+    post = serializers.IntegerField()
+
+    def validate_post(self, value: int) -> int:
+        """
+        投稿の存在を確認
+
+        :param value: 投稿ID
+        :return: 検証済みの投稿ID
+        """
+        if value not in self.context['post_ids']:
+            raise serializers.ValidationError(f'Invalid pk "{value}" - object does not exist.')
+        return value
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """一括削除用シリアライザー"""
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=bulk.MAX_ITEMS)
+
+
+class BulkResultItemSerializer(serializers.Serializer):
+    """一括操作の要素ごとの結果シリアライザー"""
+
+    index = serializers.IntegerField(help_text='Position of the item in the request.')
+    id = serializers.IntegerField(allow_null=True)
+    status = serializers.ChoiceField(choices=bulk.RESULT_STATUSES)
+    errors = serializers.DictField(allow_null=True, help_text='Validation errors when status is "error".')
+
+
+class BulkResultSerializer(serializers.Serializer):
+    """一括操作の結果シリアライザー"""
+
+    results = BulkResultItemSerializer(many=True)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """エクスポート条件シリアライザー"""
+
+    output = serializers.ChoiceField(
+        choices=list(export.FORMATS),
+        default='ndjson',
+        help_text='Output format: newline-delimited JSON or CSV with a header row.',
+    )
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    """差分同期条件シリアライザー"""
+
+    sync_token = serializers.CharField(
+        required=False, help_text='The sync_token returned by the previous sync. Takes precedence over updated_since.'
+    )
+    updated_since = serializers.DateTimeField(
+        required=False, help_text='Return rows changed after this date/time. Omit both to start a full sync.'
+    )
+    page_size = serializers.IntegerField(required=False, min_value=1, help_text='Number of results to return per page.')
+
+
+class PostSyncSerializer(serializers.Serializer):
+    """投稿の差分同期結果シリアライザー"""
+
+    results = PostListSerializer(many=True, help_text='Posts created or updated since the sync token.')
+    deleted = serializers.ListField(
+        child=serializers.IntegerField(), help_text='IDs of posts deleted since the sync token. Apply after results.'
+    )
+    sync_token = serializers.CharField(help_text='Token for the next sync.')
+    has_more = serializers.BooleanField(help_text='Whether more changes remain; sync again with sync_token.')
+
+
+class CommentSyncSerializer(serializers.Serializer):
+    """コメントの差分同期結果シリアライザー"""
+
+    results = CommentSerializer(many=True, help_text='Comments created or updated since the sync token.')
+    deleted = serializers.ListField(
+        child=serializers.IntegerField(), help_text='IDs of comments deleted since the sync token. Apply after results.'
+    )
+    sync_token = serializers.CharField(help_text='Token for the next sync.')
+    has_more = serializers.BooleanField(help_text='Whether more changes remain; sync again with sync_token.')
@@ -5,11 +5,12 @@ Dashboard API URLs
 """
 from rest_framework.routers import DefaultRouter
 
-from .views import CommentViewSet, PostViewSet, UserViewSet
+from .views import CommentViewSet, PostViewSet, SearchViewSet, UserViewSet
 
 router = DefaultRouter()
 router.register('posts', PostViewSet, basename='post')
 router.register('comments', CommentViewSet, basename='comment')
+router.register('search', SearchViewSet, basename='search')
 router.register('users', UserViewSet, basename='user')
 
 urlpatterns = router.urls
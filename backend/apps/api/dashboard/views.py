@@ -3,6 +3,9 @@ Dashboard API ViewSets
 
 管理用APIエンドポイントを定義する
 """
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -10,38 +13,98 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.core import bulk
+from apps.core.conditional import (
+    ConditionalGetMixin,
+    comment_list_state,
+    post_detail_state,
+    post_list_state,
+)
+from apps.core.export import FORMATS, export_response
+from apps.core.mixins import BulkActionMixin, EmbeddedCommentsMixin, SparseFieldsetMixin
 from apps.core.models import Comment, Post
-from apps.core.pagination import StandardPagination
+from apps.core.pagination import KeysetPagination, StandardPagination, UncountedPagination
+from apps.core.routers import read_from_primary
+from apps.core.search import search
+from apps.core.serializers import EXPAND_PARAMETER, FIELDS_PARAMETER
+from apps.core.sync import SyncPagination
 
 from .serializers import (
+    BulkDeleteSerializer,
+    BulkResultSerializer,
+    CommentBulkCreateSerializer,
     CommentCreateSerializer,
     CommentSerializer,
+    CommentSyncSerializer,
+    ExportQuerySerializer,
+    PostBulkUpdateSerializer,
     PostCreateUpdateSerializer,
     PostDetailSerializer,
     PostListSerializer,
+    PostSyncSerializer,
+    SearchQuerySerializer,
+    SearchResultSerializer,
+    SyncQuerySerializer,
     UserSerializer,
 )
 
 
 @extend_schema_view(
-    list=extend_schema(tags=['posts'], summary='List posts'),
-    retrieve=extend_schema(tags=['posts'], summary='Get post detail'),
+    list=extend_schema(tags=['posts'], summary='List posts', parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(
+        tags=['posts'], summary='Get post detail', parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]
+    ),
     create=extend_schema(tags=['posts'], summary='Create post'),
     update=extend_schema(tags=['posts'], summary='Update post'),
     partial_update=extend_schema(tags=['posts'], summary='Partial update post'),
     destroy=extend_schema(tags=['posts'], summary='Delete post'),
 )
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    BulkActionMixin, EmbeddedCommentsMixin, SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
     """
     投稿のViewSet
 
     投稿のCRUD操作を提供する
     """
 
-    queryset = Post.objects.select_related('author').prefetch_related('comments')
     permission_classes = [IsAuthenticated]
     pagination_class = StandardPagination
     lookup_field = 'id'
+    sparse_fieldset_actions = ('list', 'retrieve', 'comments', 'sync')
+
+    def get_queryset(self):
+        """
+        アクションに応じたQuerySetを返す
+
+        コメント本体は読み込まない（一覧のコメント数はPost.comment_countを使い、
+        詳細の先頭のコメントはEmbeddedCommentsMixinが取得する）。
+        `?fields=` で出力しない関連は読み込まない。
+
+        :return: 投稿のQuerySet
+        """
+        if self.action not in ['list', 'retrieve', 'sync']:
+            return Post.objects.all()
+        queryset = Post.objects.all()
+        if self.is_field_selected('author'):
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def get_comment_queryset(self, path: str):
+        """
+        出力に必要な関連を読み込んだコメントのQuerySetを返す
+
+        作者込みで読み込み、コメントごとのユーザー取得を発生させない
+
+        :param path: 出力でのコメントのパス（詳細では `comments.`、コメント一覧では空文字列）
+        :return: コメントのQuerySet
+        """
+        comments = Comment.objects.all()
+        if self.is_field_selected(f'{path}author'):
+            comments = comments.select_related('author')
+        if self.is_field_expanded(f'{path}post'):
+            comments = comments.select_related('post')
+        return comments
 
     def get_serializer_class(self):
         """
@@ -53,8 +116,20 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostCreateUpdateSerializer
         if self.action == 'retrieve':
             return PostDetailSerializer
+        if self.action == 'comments':
+            return CommentSerializer
         return PostListSerializer
 
+    def get_conditional_state(self):
+        """
+        条件付きGET用に投稿の状態を集計
+
+        :return: (状態を表す値, 最終更新日時)
+        """
+        if self.action == 'retrieve':
+            return post_detail_state(Post.objects.all(), self.kwargs[self.lookup_field])
+        return post_list_state()
+
     def perform_create(self, serializer):
         """
         投稿作成時に作者を設定
@@ -63,25 +138,218 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         serializer.save(author=self.request.user)
 
+    @extend_schema(
+        tags=['posts'],
+        summary='Bulk create posts',
+        request=PostCreateUpdateSerializer(many=True),
+        responses=BulkResultSerializer,
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request: Request) -> Response:
+        """
+        投稿を一括作成
+
+        要素ごとにPostCreateUpdateSerializerで検証し、検証に通った要素だけを
+        1つのトランザクションでまとめて作成する
+
+        :param request: リクエスト
+        :return: 要素ごとの結果
+        """
+        results = []
+        posts = []
+        indexes = []
+        for index, item in enumerate(self.get_bulk_items(request)):
+            serializer = PostCreateUpdateSerializer(data=item)
+            if not serializer.is_valid():
+                results.append(self.bulk_result(index, None, 'error', serializer.errors))
+                continue
+            posts.append(Post(author=request.user, **serializer.validated_data))
+            indexes.append(index)
+
+        with transaction.atomic():
+            posts = bulk.create_posts(posts)
+        results += [self.bulk_result(index, post.pk, 'created') for index, post in zip(indexes, posts)]
+        return self.bulk_response(results)
+
+    @extend_schema(
+        tags=['posts'],
+        summary='Bulk partial update posts',
+        request=PostBulkUpdateSerializer(many=True),
+        responses=BulkResultSerializer,
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request: Request) -> Response:
+        """
+        投稿を一括で部分更新
+
+        各要素の `id` で対象を指定する。対象はまとめて取得してロックし、
+        検証に通った要素だけを1つのトランザクションでまとめて更新する
+
+        :param request: リクエスト
+        :return: 要素ごとの結果
+        """
+        items = self.get_bulk_items(request)
+        pks, errors = self.get_bulk_pks(items)
+        results = [self.bulk_result(index, None, 'error', error) for index, error in errors.items()]
+        updated = []
+        fields = set()
+        seen = set()
+
+        with transaction.atomic():
+            posts = Post.objects.select_for_update().in_bulk(set(pks.values()))
+            was_published = {pk: post.is_published for pk, post in posts.items()}
+            for index, pk in pks.items():
+                if pk in seen:
+                    results.append(self.bulk_result(index, pk, 'error', {'id': ['Duplicate id.']}))
+                    continue
+                post = posts.get(pk)
+                if post is None:
+                    results.append(self.bulk_result(index, pk, 'error', {'id': ['Not found.']}))
+                    continue
+                seen.add(pk)
+                serializer = PostCreateUpdateSerializer(post, data=items[index], partial=True)
+                if not serializer.is_valid():
+                    results.append(self.bulk_result(index, pk, 'error', serializer.errors))
+                    continue
+                for field, value in serializer.validated_data.items():
+                    setattr(post, field, value)
+                    fields.add(field)
+                updated.append((index, post))
+
+            bulk.update_posts([post for _, post in updated], sorted(fields), was_published)
+        results += [self.bulk_result(index, post.pk, 'updated') for index, post in updated]
+        return self.bulk_response(results)
+
+    @extend_schema(
+        tags=['posts'],
+        summary='Bulk delete posts',
+        operation_id='posts_bulk_destroy',
+        request=BulkDeleteSerializer,
+        responses=BulkResultSerializer,
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_destroy(self, request: Request) -> Response:
+        """
+        投稿をコメントごと一括削除
+
+        :param request: リクエスト
+        :return: 要素ごとの結果
+        """
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            deleted = set(bulk.delete_posts(ids))
+        return self.bulk_response(self.bulk_delete_results(ids, deleted))
+
+    @extend_schema(
+        tags=['posts'],
+        summary='List comments of a post',
+        operation_id='posts_comments_list',
+        parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER],
+        responses=CommentSerializer(many=True),
+    )
+    @action(detail=True, methods=['get'], pagination_class=KeysetPagination)
+    def comments(self, request: Request, id=None) -> Response:
+        """
+        投稿のコメントを新しい順にカーソル方式で返す
+
+        投稿詳細に埋め込まれた先頭のコメントの続きは、詳細の `comments_next` から取得する
+
+        :param request: リクエスト
+        :param id: 投稿ID
+        :return: コメントのページ
+        """
+        post = self.get_object()
+        page = self.paginate_queryset(self.get_comment_queryset('').filter(post=post))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        tags=['posts'],
+        summary='Sync posts changed since a sync token',
+        operation_id='posts_sync',
+        parameters=[SyncQuerySerializer, FIELDS_PARAMETER],
+        responses=PostSyncSerializer,
+    )
+    @action(detail=False, methods=['get'], pagination_class=SyncPagination)
+    def sync(self, request: Request) -> Response:
+        """
+        前回の同期以降に作成・更新された投稿と、削除された投稿のIDを返す
+
+        一覧を取得し直す代わりに、クライアントのキャッシュへ差分を反映するために使う
+
+        :param request: リクエスト
+        :return: 差分同期のページ
+        """
+        # レプリケーションの遅れた行を同期トークンが追い越さないよう、defaultから読み取る
+        with read_from_primary():
+            page = self.paginate_queryset(self.get_queryset())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        tags=['posts'],
+        summary='Export all posts',
+        operation_id='posts_export',
+        parameters=[ExportQuerySerializer],
+        responses={(200, content_type): OpenApiTypes.STR for content_type in FORMATS.values()},
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        投稿の全件をID順にストリーミングで出力
+
+        ページネーションを使わず、サーバーサイドカーソルで読み出した行を逐次返す
+
+        :param request: リクエスト
+        :return: NDJSONまたはCSVのストリーミングレスポンス
+        """
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return export_response('posts', params.validated_data['output'])
+
 
 @extend_schema_view(
-    list=extend_schema(tags=['comments'], summary='List comments'),
-    retrieve=extend_schema(tags=['comments'], summary='Get comment detail'),
+    list=extend_schema(
+        tags=['comments'], summary='List comments', parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]
+    ),
+    retrieve=extend_schema(
+        tags=['comments'], summary='Get comment detail', parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]
+    ),
     create=extend_schema(tags=['comments'], summary='Create comment'),
     destroy=extend_schema(tags=['comments'], summary='Delete comment'),
 )
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(BulkActionMixin, SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     コメントのViewSet
 
     コメントのCRUD操作を提供する
     """
 
-    queryset = Comment.objects.select_related('author', 'post')
+    queryset = Comment.objects.all()
     permission_classes = [IsAuthenticated]
     pagination_class = StandardPagination
     http_method_names = ['get', 'post', 'delete']
     lookup_field = 'id'
+    sparse_fieldset_actions = ('list', 'retrieve', 'sync')
+
+    def get_queryset(self):
+        """
+        出力する関連だけを読み込んだQuerySetを返す
+
+        作者は `?fields=` で除かれない限り、投稿は `?expand=post` 指定時のみ読み込む
+
+        :return: コメントのQuerySet
+        """
+        queryset = super().get_queryset()
+        if self.action not in ['list', 'retrieve', 'sync']:
+            return queryset
+        if self.is_field_selected('author'):
+            queryset = queryset.select_related('author')
+        if self.is_field_expanded('post'):
+            queryset = queryset.select_related('post')
+        return queryset
 
     def get_serializer_class(self):
         """
@@ -93,13 +361,168 @@ class CommentViewSet(viewsets.ModelViewSet):
             return CommentCreateSerializer
         return CommentSerializer
 
+    def get_conditional_state(self):
+        """
+        条件付きGET用にコメント一覧の状態を集計
+
+        コメント詳細には検証値を付けない
+
+        :return: (状態を表す値, 最終更新日時)
+        """
+        if self.action != 'list':
+            return None
+        return comment_list_state(self.filter_queryset(Comment.objects.all()))
+
     def perform_create(self, serializer):
         """
         コメント作成時に作者を設定
 
+        投稿のコメント数の更新と同じトランザクションで保存する
+
         :param serializer: シリアライザー
         """
-        serializer.save(author=self.request.user)
+        with transaction.atomic():
+            serializer.save(author=self.request.user)
+
+    def perform_destroy(self, instance: Comment):
+        """
+        コメントを削除
+
+        投稿のコメント数の更新と同じトランザクションで削除する
+
+        :param instance: 削除するコメント
+        """
+        with transaction.atomic():
+            instance.delete()
+
+    @extend_schema(
+        tags=['comments'],
+        summary='Bulk create comments',
+        request=CommentCreateSerializer(many=True),
+        responses=BulkResultSerializer,
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request: Request) -> Response:
+        """
+        コメントを一括作成
+
+        要素ごとにCommentBulkCreateSerializerで検証し、検証に通った要素だけを
+        1つのトランザクションでまとめて作成する。投稿の存在は1回のクエリで確認する
+
+        :param request: リクエスト
+        :return: 要素ごとの結果
+        """
+        items = self.get_bulk_items(request)
+        # 投稿IDはシリアライザーと同じ規則で変換してから集める（不正なIDはシリアライザーがエラーにする）
+        post_pks, _ = self.get_bulk_pks(items, 'post')
+        results = []
+        comments = []
+        indexes = []
+
+        with transaction.atomic():
+            post_ids = Post.objects.filter(pk__in=set(post_pks.values())).values_list('pk', flat=True)
+            context = {'post_ids': set(post_ids)}
+            for index, item in enumerate(items):
+                serializer = CommentBulkCreateSerializer(data=item, context=context)
+                if not serializer.is_valid():
+                    results.append(self.bulk_result(index, None, 'error', serializer.errors))
+                    continue
+                data = serializer.validated_data
+                comments.append(Comment(post_id=data['post'], author=request.user, content=data['content']))
+                indexes.append(index)
+
+            comments = bulk.create_comments(comments)
+        results += [self.bulk_result(index, comment.pk, 'created') for index, comment in zip(indexes, comments)]
+        return self.bulk_response(results)
+
+    @extend_schema(
+        tags=['comments'],
+        summary='Bulk delete comments',
+        operation_id='comments_bulk_destroy',
+        request=BulkDeleteSerializer,
+        responses=BulkResultSerializer,
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_destroy(self, request: Request) -> Response:
+        """
+        コメントを一括削除
+
+        :param request: リクエスト
+        :return: 要素ごとの結果
+        """
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            deleted = set(bulk.delete_comments(ids))
+        return self.bulk_response(self.bulk_delete_results(ids, deleted))
+
+    @extend_schema(
+        tags=['comments'],
+        summary='Sync comments changed since a sync token',
+        operation_id='comments_sync',
+        parameters=[SyncQuerySerializer, FIELDS_PARAMETER, EXPAND_PARAMETER],
+        responses=CommentSyncSerializer,
+    )
+    @action(detail=False, methods=['get'], pagination_class=SyncPagination)
+    def sync(self, request: Request) -> Response:
+        """
+        前回の同期以降に作成・更新されたコメントと、削除されたコメントのIDを返す
+
+        :param request: リクエスト
+        :return: 差分同期のページ
+        """
+        # レプリケーションの遅れた行を同期トークンが追い越さないよう、defaultから読み取る
+        with read_from_primary():
+            page = self.paginate_queryset(self.get_queryset())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        tags=['comments'],
+        summary='Export all comments',
+        operation_id='comments_export',
+        parameters=[ExportQuerySerializer],
+        responses={(200, content_type): OpenApiTypes.STR for content_type in FORMATS.values()},
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        コメントの全件をID順にストリーミングで出力
+
+        ページネーションを使わず、サーバーサイドカーソルで読み出した行を逐次返す
+
+        :param request: リクエスト
+        :return: NDJSONまたはCSVのストリーミングレスポンス
+        """
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return export_response('comments', params.validated_data['output'])
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['search'], summary='Search posts and comments', parameters=[SearchQuerySerializer]),
+)
+class SearchViewSet(viewsets.GenericViewSet):
+    """
+    検索のViewSet
+
+    すべての投稿とコメントを全文検索する
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = UncountedPagination
+    serializer_class = SearchResultSerializer
+
+    # listのdocstringはOpenAPIのdescriptionとして使われるため、
+    # ViewSetのdocstringが使われるようここでは定義しない
+    def list(self, request: Request) -> Response:
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = search(params.validated_data['q'], published_only=False)
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 @extend_schema_view(
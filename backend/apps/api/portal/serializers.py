@@ -5,10 +5,12 @@ Portal API Serializers
 """
 from rest_framework import serializers
 
+from apps.core import search
 from apps.core.models import Comment, Post, User
+from apps.core.serializers import FastReadSerializerMixin
 
 
-class PublicUserSerializer(serializers.ModelSerializer):
+class PublicUserSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """公開用ユーザーシリアライザー"""
 
     class Meta:
@@ -16,7 +18,7 @@ class PublicUserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username']
 
 
-class PublicCommentSerializer(serializers.ModelSerializer):
+class PublicCommentSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """公開用コメントシリアライザー"""
 
     author = PublicUserSerializer(read_only=True)
@@ -26,11 +28,10 @@ class PublicCommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'author', 'content', 'created_at']
 
 
-class PublicPostListSerializer(serializers.ModelSerializer):
+class PublicPostListSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """公開用投稿一覧シリアライザー"""
 
     author = PublicUserSerializer(read_only=True)
-    comment_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -42,21 +43,22 @@ class PublicPostListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
 
-    def get_comment_count(self, obj: Post) -> int:
-        """
-        コメント数を取得
-
-        :param obj: Postインスタンス
-        :return: コメント数
-        """
-        return obj.comments.count()
 
-
-class PublicPostDetailSerializer(serializers.ModelSerializer):
+class PublicPostDetailSerializer(FastReadSerializerMixin, serializers.ModelSerializer):
     """公開用投稿詳細シリアライザー"""
 
     author = PublicUserSerializer(read_only=True)
-    comments = PublicCommentSerializer(many=True, read_only=True)
+    comments = PublicCommentSerializer(
+        many=True,
+        read_only=True,
+        source='embedded_comments',
+        help_text='Newest comments of the post. Older comments are fetched from comments_next.',
+    )
+    comments_next = serializers.URLField(
+        read_only=True,
+        allow_null=True,
+        help_text='URL of the next page of comments, or null when all comments are embedded.',
+    )
 
     class Meta:
         model = Post
@@ -66,5 +68,41 @@ class PublicPostDetailSerializer(serializers.ModelSerializer):
             'content',
             'author',
             'comments',
+            'comments_next',
             'created_at',
         ]
+
+
+class PublicSearchQuerySerializer(serializers.Serializer):
+    """公開用検索条件シリアライザー"""
+
+    q = serializers.CharField(
+        max_length=200,
+        help_text='Search terms separated by spaces. Each term must be at least 3 characters.',
+    )
+
+    def validate_q(self, value: str) -> str:
+        """
+        検索語を検証
+
+        trigramインデックスは3文字未満の語に一致しないため、短い語を拒否する
+
+        :param value: 検索語
+        :return: 検証済みの検索語
+        """
+        if any(len(term) < search.MIN_QUERY_LENGTH for term in value.split()):
+            raise serializers.ValidationError(
+                f'Each search term must be at least {search.MIN_QUERY_LENGTH} characters.'
+            )
+        return value
+
+
+class PublicSearchResultSerializer(serializers.Serializer):
+    """公開用検索結果シリアライザー"""
+
+    type = serializers.ChoiceField(choices=search.RESULT_TYPES)
+    id = serializers.IntegerField()
+    post_id = serializers.IntegerField()
+    title = serializers.CharField(help_text='Post title as HTML, with matches wrapped in <mark>.')
+    snippet = serializers.CharField(help_text='Matching excerpt as HTML, with matches wrapped in <mark>.')
+    rank = serializers.FloatField(help_text='Relevance score (higher is more relevant).')
@@ -1,13 +1,35 @@
 """
 Portal API URLs
 
-公開用APIのルーティングを定義する
+公開用APIのルーティングを定義する。
+公開投稿の一覧・詳細は非同期のビューで受け、非同期で処理しないリクエストはルーターのビューに渡す
 """
+from django.urls import re_path
 from rest_framework.routers import DefaultRouter
 
-from .views import PublicPostViewSet
+from .views import PublicPostViewSet, PublicSearchViewSet
 
 router = DefaultRouter()
 router.register('posts', PublicPostViewSet, basename='public-post')
+router.register('search', PublicSearchViewSet, basename='public-search')
 
-urlpatterns = router.urls
+# ルーターが生成した同期のビュー（URL名をキーとする）
+sync_views = {pattern.name: pattern.callback for pattern in router.urls}
+
+urlpatterns = [
+    re_path(
+        r'^posts/$',
+        PublicPostViewSet.as_async_view(
+            {'get': 'list'}, sync_views['public-post-list'], basename='public-post', detail=False
+        ),
+        name='public-post-list',
+    ),
+    re_path(
+        r'^posts/(?P<id>[^/.]+)/$',
+        PublicPostViewSet.as_async_view(
+            {'get': 'retrieve'}, sync_views['public-post-detail'], basename='public-post', detail=True
+        ),
+        name='public-post-detail',
+    ),
+    *router.urls,
+]
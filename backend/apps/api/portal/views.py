@@ -5,19 +5,47 @@ Portal API ViewSets
 """
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
 
-from apps.core.models import Post
-from apps.core.pagination import StandardPagination
+from apps.core.conditional import (
+    ConditionalGetMixin,
+    apost_detail_state,
+    apost_list_state,
+    post_detail_state,
+    post_list_state,
+)
+from apps.core.mixins import AsyncReadMixin, CachedResponseMixin, EmbeddedCommentsMixin, SparseFieldsetMixin
+from apps.core.models import Comment, Post
+from apps.core.pagination import KeysetPagination, StandardPagination, UncountedPagination
+from apps.core.search import search
+from apps.core.serializers import FIELDS_PARAMETER
 
-from .serializers import PublicPostDetailSerializer, PublicPostListSerializer
+from .serializers import (
+    PublicCommentSerializer,
+    PublicPostDetailSerializer,
+    PublicPostListSerializer,
+    PublicSearchQuerySerializer,
+    PublicSearchResultSerializer,
+)
 
 
 @extend_schema_view(
-    list=extend_schema(tags=['public-posts'], summary='List published posts'),
-    retrieve=extend_schema(tags=['public-posts'], summary='Get published post detail'),
+    list=extend_schema(tags=['public-posts'], summary='List published posts', parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(
+        tags=['public-posts'], summary='Get published post detail', parameters=[FIELDS_PARAMETER]
+    ),
 )
-class PublicPostViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicPostViewSet(
+    CachedResponseMixin,
+    EmbeddedCommentsMixin,
+    SparseFieldsetMixin,
+    ConditionalGetMixin,
+    AsyncReadMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
     公開投稿のViewSet
 
@@ -27,14 +55,37 @@ class PublicPostViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     pagination_class = StandardPagination
     lookup_field = 'id'
+    response_cache_prefix = 'portal:posts'
+    sparse_fieldset_actions = ('list', 'retrieve', 'comments')
 
     def get_queryset(self):
         """
         公開済み投稿のみを返す
 
+        コメント本体は読み込まない（一覧のコメント数はPost.comment_countを使い、
+        詳細の先頭のコメントはEmbeddedCommentsMixinが取得する）。
+        `?fields=` で出力しない関連は読み込まない。
+
         :return: 公開済み投稿のQuerySet
         """
-        return Post.objects.filter(is_published=True).select_related('author').prefetch_related('comments')
+        queryset = Post.objects.filter(is_published=True)
+        if self.action in ['list', 'retrieve'] and self.is_field_selected('author'):
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def get_comment_queryset(self, path: str):
+        """
+        出力に必要な関連を読み込んだコメントのQuerySetを返す
+
+        作者込みで読み込み、コメントごとのユーザー取得を発生させない
+
+        :param path: 出力でのコメントのパス（詳細では `comments.`、コメント一覧では空文字列）
+        :return: コメントのQuerySet
+        """
+        comments = Comment.objects.all()
+        if self.is_field_selected(f'{path}author'):
+            comments = comments.select_related('author')
+        return comments
 
     def get_serializer_class(self):
         """
@@ -44,4 +95,96 @@ class PublicPostViewSet(viewsets.ReadOnlyModelViewSet):
         """
         if self.action == 'retrieve':
             return PublicPostDetailSerializer
+        if self.action == 'comments':
+            return PublicCommentSerializer
         return PublicPostListSerializer
+
+    def get_conditional_state(self):
+        """
+        条件付きGET用に公開投稿の状態を集計
+
+        :return: (状態を表す値, 最終更新日時)
+        """
+        if self.action == 'retrieve':
+            return post_detail_state(Post.objects.filter(is_published=True), self.kwargs[self.lookup_field])
+        return post_list_state()
+
+    async def aget_conditional_state(self):
+        """
+        条件付きGET用に公開投稿の状態を非同期に集計
+
+        :return: (状態を表す値, 最終更新日時)
+        """
+        if self.action == 'retrieve':
+            return await apost_detail_state(Post.objects.filter(is_published=True), self.kwargs[self.lookup_field])
+        return await apost_list_state()
+
+    @extend_schema(
+        tags=['public-posts'],
+        summary='List comments of a published post',
+        operation_id='posts_comments_list',
+        parameters=[FIELDS_PARAMETER],
+        responses=PublicCommentSerializer(many=True),
+    )
+    @action(detail=True, methods=['get'], pagination_class=KeysetPagination)
+    def comments(self, request: Request, id=None) -> Response:
+        """
+        公開済み投稿のコメントを新しい順にカーソル方式で返す
+
+        投稿詳細に埋め込まれた先頭のコメントの続きは、詳細の `comments_next` から取得する
+
+        :param request: リクエスト
+        :param id: 投稿ID
+        :return: コメントのページ
+        """
+        post = self.get_object()
+        page = self.paginate_queryset(self.get_comment_queryset('').filter(post=post))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_response_cache_tags(self, data) -> list[str]:
+        """
+        レスポンスに含まれる投稿・ユーザーのタグを返す
+
+        `?fields=` で投稿・作者のIDが除かれ、依存先を特定できない場合はキャッシュしない
+
+        :param data: レスポンスデータ
+        :return: タグ名のリスト（キャッシュできない場合はNone）
+        """
+        if self.action == 'list':
+            posts = data['results']
+        else:
+            posts = [{'id': self.kwargs[self.lookup_field], **data}]
+        tags = set()
+        for post in posts:
+            authors = [post.get('author'), *[comment.get('author') for comment in post.get('comments', [])]]
+            if 'id' not in post or any(author is not None and 'id' not in author for author in authors):
+                return None
+            tags.add(f'post:{post["id"]}')
+            tags.update(f'user:{author["id"]}' for author in authors if author is not None)
+        return sorted(tags)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['public-search'], summary='Search published posts and comments', parameters=[PublicSearchQuerySerializer]),
+)
+class PublicSearchViewSet(viewsets.GenericViewSet):
+    """
+    公開検索のViewSet
+
+    公開済み投稿とそのコメントを全文検索する
+    """
+
+    permission_classes = [AllowAny]
+    pagination_class = UncountedPagination
+    serializer_class = PublicSearchResultSerializer
+
+    # listのdocstringはOpenAPIのdescriptionとして使われるため、
+    # ViewSetのdocstringが使われるようここでは定義しない
+    def list(self, request: Request) -> Response:
+        params = PublicSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        results = search(params.validated_data['q'], published_only=True)
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -17,10 +17,11 @@ class UserAdmin(BaseUserAdmin):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'is_published', 'created_at')
+    list_display = ('title', 'author', 'is_published', 'comment_count', 'created_at')
     list_filter = ('is_published', 'created_at')
     search_fields = ('title', 'content')
     ordering = ('-created_at',)
+    readonly_fields = ('comment_count',)
 
 
 @admin.register(Comment)
@@ -0,0 +1,120 @@
+"""
+認証クラス
+
+JWTのユーザーIDからrequest.userを組み立てる際に、ユーザーの最小限のスナップショットを
+キャッシュしてデータベースへの問い合わせを省く。
+スナップショットのキーにはユーザーごとのタグ（`auth-user:<id>`）のバージョンを含め、
+ユーザーの保存・削除時にタグのバージョンを上げて無効化する（apps.core.signals）。
+タグのバージョンはキャッシュに保存されるため、無効化が他のプロセスに伝わるのは共有のキャッシュの場合のみで、
+プロセスごとのキャッシュでは `AUTH_USER_CACHE_TIMEOUT` 秒の期限切れまで残る。
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import get_tag_version
+from .models import User
+
+SNAPSHOT_KEY_PREFIX = 'auth-user'
+# スナップショットに含めるフィールド（それ以外は遅延読み込みになる）
+SNAPSHOT_FIELDS = ('id', 'email', 'username', 'bio', 'date_joined', 'is_active', 'is_staff', 'is_superuser')
+
+
+def auth_user_tag(user_id) -> str:
+    """
+    ユーザーのスナップショットを無効化するタグを返す
+
+    :param user_id: ユーザーID
+    :return: タグ名
+    """
+    return f'{SNAPSHOT_KEY_PREFIX}:{user_id}'
+
+
+def build_snapshot(user: User) -> dict:
+    """
+    ユーザーのスナップショットを作成
+
+    パスワードのハッシュそのものは保存せず、トークンの失効判定に使うダイジェストのみ保存する
+
+    :param user: ユーザー
+    :return: スナップショット
+    """
+    return {
+        'values': {name: getattr(user, name) for name in SNAPSHOT_FIELDS},
+        'password_digest': get_md5_hash_password(user.password),
+    }
+
+
+def user_from_snapshot(snapshot: dict) -> User:
+    """
+    スナップショットからユーザーを組み立てる
+
+    SNAPSHOT_FIELDS以外のフィールドは遅延読み込みとなり、参照時にデータベースから取得される
+
+    :param snapshot: スナップショット
+    :return: ユーザー
+    """
+    values = snapshot['values']
+    # from_dbはモデルのフィールド順の値を受け取る
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [values[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ユーザーのスナップショットをキャッシュするJWT認証
+
+    キャッシュにヒットした場合はデータベースに問い合わせずにrequest.userを組み立てる。
+    無効なユーザー・パスワード変更後のトークンの扱いはJWTAuthenticationと同じ。
+    QuerySet.updateなどシグナルを送らない書き込みと、プロセスごとのキャッシュでの他のプロセスの書き込みは、
+    最長で `AUTH_USER_CACHE_TIMEOUT` 秒反映されない
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        """
+        トークンのユーザーIDからユーザーを取得
+
+        :param validated_token: 検証済みのトークン
+        :return: ユーザー
+        :raises InvalidToken: トークンにユーザーIDが含まれない場合
+        :raises AuthenticationFailed: ユーザーが存在しない・無効・パスワード変更済みの場合
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        # データベースより先にバージョンを読み、取得中の更新で古い内容が残らないようにする
+        key = f'{SNAPSHOT_KEY_PREFIX}:{user_id}:{get_tag_version(auth_user_tag(user_id))}'
+        snapshot = cache.get(key)
+        if snapshot is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            snapshot = build_snapshot(user)
+            cache.set(key, snapshot, settings.AUTH_USER_CACHE_TIMEOUT)
+        else:
+            user = user_from_snapshot(snapshot)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != snapshot['password_digest']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """CachedJWTAuthenticationのスキーマ定義（JWTAuthenticationと同じ `jwtAuth`）"""
+
+    target_class = 'apps.core.authentication.CachedJWTAuthentication'
@@ -0,0 +1,196 @@
+"""
+SQLiteのデータベースバックエンド
+
+Django標準のSQLiteバックエンドに、スレッド間で共有する接続プール（apps.core.pool）を加える。
+接続を閉じるとプールに返し、次の接続ではプールから取り出すため、
+接続の作成と初期化（関数の登録・PRAGMA）は接続ごとに1回だけ行う。
+インメモリーのデータベース（テスト用データベースなど）はプールを使わない。
+
+`is_usable` は実際にクエリを実行して確認するため、`CONN_HEALTH_CHECKS` も有効になる。
+
+同時の読み書きで `database is locked` にならないよう、以下の設定を適用する。
+
+- 接続の作成時に `SQLITE_PRAGMAS` を実行する（WAL・synchronous・mmap・キャッシュ・busy_timeout）
+- `SQLITE_IMMEDIATE_TRANSACTIONS` がTrueの場合、トランザクションを `BEGIN IMMEDIATE` で始め、
+  読み取りの後の書き込みでロックを昇格できずに失敗するのを防ぐ
+- トランザクションの外の文（`BEGIN IMMEDIATE` を含む）がbusy_timeoutを超えて失敗した場合、
+  `SQLITE_BUSY_RETRIES` 回まで間隔を倍にしながら再実行する。トランザクション内の文は再実行しない
+"""
+import time
+
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+from apps.core.pool import PoolTimeout, get_pool
+
+Database = base.Database
+
+
+def is_busy_error(exc: Exception) -> bool:
+    """
+    ロックの待ち時間を超えたことによるエラーかどうか
+
+    :param exc: 例外
+    :return: `database is locked`・`database table is locked` の場合True
+    """
+    return isinstance(exc, Database.OperationalError) and 'is locked' in str(exc)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    """
+    ロックで失敗したトランザクションの外の文を再実行するカーソル
+
+    失敗した文はSQLiteがロールバックするため、トランザクションの外であれば再実行しても結果は変わらない
+    """
+
+    def execute(self, query, params=None):
+        return self.retry_on_busy(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        # 再実行でも同じパラメーターを使えるようにする
+        return self.retry_on_busy(super().executemany, query, list(param_list))
+
+    def retry_on_busy(self, execute, query, params):
+        """
+        ロックで失敗した文を再実行
+
+        :param execute: 親クラスのexecute・executemany
+        :param query: SQL
+        :param params: パラメーター
+        :return: カーソル
+        :raises Database.OperationalError: 再実行の回数を超えた場合・トランザクション内で失敗した場合
+        """
+        delay = settings.SQLITE_BUSY_RETRY_DELAY
+        for attempt in range(settings.SQLITE_BUSY_RETRIES + 1):
+            try:
+                return execute(query, params)
+            except Database.OperationalError as exc:
+                if attempt == settings.SQLITE_BUSY_RETRIES or not is_busy_error(exc) or self.connection.in_transaction:
+                    raise
+            time.sleep(delay * 2**attempt)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    接続プールを使うSQLiteのDatabaseWrapper
+
+    `DATABASE_POOL_SIZE` が0の場合はDjango標準の接続管理と同じに動作する
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 現在の接続を取り出したプール
+        self.pool = None
+
+    def get_new_connection(self, conn_params):
+        """
+        プールから接続を取り出す（プールを使わない場合は新しく作る）
+
+        :param conn_params: 接続パラメーター
+        :return: 接続
+        :raises Database.OperationalError: プールの接続が空かない場合
+        """
+        pool = None if self.is_in_memory_db() else get_pool(self.alias)
+        self.pool = pool
+        if pool is None:
+            return self.create_connection(conn_params)
+        try:
+            return pool.checkout(lambda: self.create_connection(conn_params), self.check_usable, self.close_raw)
+        except PoolTimeout as exc:
+            raise Database.OperationalError(str(exc)) from exc
+
+    def create_connection(self, conn_params):
+        """
+        新しい接続を作成し、`SQLITE_PRAGMAS` を実行
+
+        :param conn_params: 接続パラメーター
+        :return: 接続
+        """
+        conn = super().get_new_connection(conn_params)
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            # journal_modeはデータベースファイルに保存され、変更には他の接続がないことが必要なため、異なる場合のみ変更する
+            if name == 'journal_mode' and conn.execute('PRAGMA journal_mode').fetchone()[0].upper() == value.upper():
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def create_cursor(self, name=None):
+        """
+        ロックで失敗した文を再実行するカーソルを返す
+
+        :param name: カーソル名（SQLiteでは使わない）
+        :return: カーソル
+        """
+        return self.connection.cursor(factory=SQLiteCursorWrapper)
+
+    def _start_transaction_under_autocommit(self):
+        """
+        トランザクションを開始
+
+        `SQLITE_IMMEDIATE_TRANSACTIONS` がTrueの場合は開始時に書き込みのロックを取る
+        """
+        self.cursor().execute('BEGIN IMMEDIATE' if settings.SQLITE_IMMEDIATE_TRANSACTIONS else 'BEGIN')
+
+    def _close(self):
+        """
+        接続をプールに返す
+
+        トランザクションの途中で閉じられた接続はDatabaseWrapperが参照し続けるため、プールに返さず閉じる
+        """
+        pool, self.pool = self.pool, None
+        if pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                pool.discard(self.connection, self.close_raw)
+            else:
+                pool.release(self.connection, self.reset_raw, self.close_raw)
+
+    def is_usable(self):
+        """
+        接続が使えるかどうか
+
+        :return: クエリを実行できる場合True
+        """
+        return self.connection is not None and self.check_usable(self.connection)
+
+    @staticmethod
+    def check_usable(conn) -> bool:
+        """
+        接続でクエリを実行できるかどうか
+
+        :param conn: sqlite3の接続
+        :return: 実行できる場合True
+        """
+        try:
+            conn.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    @staticmethod
+    def reset_raw(conn) -> bool:
+        """
+        プールに返す接続の未完了のトランザクションをロールバック
+
+        :param conn: sqlite3の接続
+        :return: 再利用できる場合True
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Database.Error:
+            return False
+        return True
+
+    @staticmethod
+    def close_raw(conn) -> None:
+        """
+        接続を閉じる（失敗は無視する）
+
+        :param conn: sqlite3の接続
+        """
+        try:
+            conn.close()
+        except Database.Error:
+            pass
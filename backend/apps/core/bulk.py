@@ -0,0 +1,148 @@
+"""
+一括書き込み
+
+投稿・コメントをbulk_create・bulk_update・QuerySet.delete()でまとめて書き込む。
+bulk_create・bulk_updateはシグナルを送らず、削除では行ごとのレシーバーを止めるため、
+コメント数の更新・削除の記録・キャッシュの無効化はここでまとめて反映する（apps.core.signalsと同じ結果になる）。
+各関数はトランザクション内で呼び出す。
+"""
+from collections import Counter
+
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .cache import bump_tags
+from .models import Comment, Post
+from .pagination import count_cache_tag
+from .signals import bulk_writes
+from .sync import record_tombstones
+
+# 1リクエストで扱える最大要素数
+MAX_ITEMS = 500
+BATCH_SIZE = 500
+# 要素ごとの結果
+RESULT_STATUSES = ['created', 'updated', 'deleted', 'error']
+# CASE式のパラメータ数がSQLiteの上限を超えないよう、コメント数の更新を分割する
+COUNT_UPDATE_BATCH_SIZE = 200
+
+
+def _change_comment_counts(deltas: Counter) -> None:
+    """
+    複数の投稿のコメント数をまとめて増減
+
+    :param deltas: 投稿IDをキーとした増減数
+    """
+    items = sorted((post_id, delta) for post_id, delta in deltas.items() if delta)
+    for start in range(0, len(items), COUNT_UPDATE_BATCH_SIZE):
+        batch = dict(items[start : start + COUNT_UPDATE_BATCH_SIZE])
+        delta = Case(
+            *[When(pk=post_id, then=Value(delta)) for post_id, delta in batch.items()],
+            output_field=IntegerField(),
+        )
+        # ずれたカウンターが負にならないようにする（ずれはreconcile_comment_countsで修正する）
+        Post.objects.filter(pk__in=batch).update(comment_count=Greatest(F('comment_count') + delta, Value(0)))
+
+
+def create_posts(posts: list[Post]) -> list[Post]:
+    """
+    投稿をまとめて作成
+
+    :param posts: 保存前の投稿
+    :return: IDが設定された投稿
+    """
+    if not posts:
+        return []
+    posts = Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+    tags = [count_cache_tag(Post)]
+    if any(post.is_published for post in posts):
+        tags.append('posts')
+    bump_tags(*tags)
+    return posts
+
+
+def update_posts(posts: list[Post], fields: list[str], was_published: dict[int, bool]) -> None:
+    """
+    投稿をまとめて更新
+
+    bulk_updateはauto_nowを反映しないため、updated_atをここで設定する
+
+    :param posts: 変更済みの投稿
+    :param fields: 更新するフィールド名
+    :param was_published: 投稿IDをキーとした更新前の公開状態
+    """
+    if not posts:
+        return
+    now = timezone.now()
+    for post in posts:
+        post.updated_at = now
+    Post.objects.bulk_update(posts, [*fields, 'updated_at'], batch_size=BATCH_SIZE)
+
+    tags = {count_cache_tag(Post)}
+    for post in posts:
+        if was_published[post.pk] != post.is_published:
+            tags.update(['posts', f'post:{post.pk}'])
+        elif post.is_published:
+            tags.add(f'post:{post.pk}')
+    bump_tags(*sorted(tags))
+
+
+def delete_posts(post_ids: list[int]) -> list[int]:
+    """
+    投稿をコメントごとまとめて削除
+
+    カスケード削除されるコメントも削除を記録する
+
+    :param post_ids: 投稿ID
+    :return: 削除した投稿ID
+    """
+    rows = list(Post.objects.filter(pk__in=post_ids).values_list('pk', 'is_published'))
+    deleted_ids = [pk for pk, _ in rows]
+    comment_ids = list(Comment.objects.filter(post_id__in=deleted_ids).values_list('pk', flat=True))
+    with bulk_writes():
+        Post.objects.filter(pk__in=deleted_ids).delete()
+    record_tombstones(Post, deleted_ids)
+    record_tombstones(Comment, comment_ids)
+
+    tags = {count_cache_tag(Post), count_cache_tag(Comment)}
+    for pk, is_published in rows:
+        if is_published:
+            tags.update(['posts', f'post:{pk}'])
+    bump_tags(*sorted(tags))
+    return deleted_ids
+
+
+def create_comments(comments: list[Comment]) -> list[Comment]:
+    """
+    コメントをまとめて作成し、投稿のコメント数を増やす
+
+    :param comments: 保存前のコメント
+    :return: IDが設定されたコメント
+    """
+    if not comments:
+        return []
+    comments = Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+    deltas = Counter(comment.post_id for comment in comments)
+    _change_comment_counts(deltas)
+    bump_tags(count_cache_tag(Comment), *[f'post:{post_id}' for post_id in sorted(deltas)])
+    return comments
+
+
+def delete_comments(comment_ids: list[int]) -> list[int]:
+    """
+    コメントをまとめて削除し、投稿のコメント数を減らす
+
+    :param comment_ids: コメントID
+    :return: 削除したコメントID
+    """
+    rows = list(Comment.objects.filter(pk__in=comment_ids).values_list('pk', 'post_id'))
+    deleted_ids = [pk for pk, _ in rows]
+    with bulk_writes():
+        Comment.objects.filter(pk__in=deleted_ids).delete()
+    record_tombstones(Comment, deleted_ids)
+    deltas = Counter()
+    for _, post_id in rows:
+        deltas[post_id] -= 1
+    _change_comment_counts(deltas)
+    bump_tags(count_cache_tag(Comment), *[f'post:{post_id}' for post_id in sorted(deltas)])
+    return deleted_ids
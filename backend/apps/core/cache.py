@@ -0,0 +1,104 @@
+"""
+キャッシュユーティリティ
+
+タグごとのバージョン番号を使ってキャッシュエントリを無効化する。
+キャッシュキーや保存値にタグのバージョンを含めておき、
+書き込み時にタグのバージョンを上げることで該当エントリだけを無効化する。
+タグのバージョンは書き込みのコミット後に上げ、コミット前の内容が新しいバージョンで
+キャッシュされないようにする。
+`a` で始まる関数は非同期のビューから呼び出す版。
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+TAG_KEY_PREFIX = 'tag-version'
+
+
+def _tag_key(tag: str) -> str:
+    """
+    タグのバージョンを保持するキャッシュキーを返す
+
+    :param tag: タグ名
+    :return: キャッシュキー
+    """
+    return f'{TAG_KEY_PREFIX}:{tag}'
+
+
+def _initial_version() -> int:
+    """
+    タグの初期バージョンを返す
+
+    キャッシュから追い出されたタグが再登録されても過去のバージョンと衝突しないよう、
+    現在時刻を初期値にする
+
+    :return: バージョン番号
+    """
+    return time.time_ns()
+
+
+def get_tag_version(tag: str) -> int:
+    """
+    タグの現在のバージョンを取得
+
+    :param tag: タグ名
+    :return: バージョン番号
+    """
+    return cache.get_or_set(_tag_key(tag), _initial_version, timeout=None)
+
+
+def get_tag_versions(tags: list[str]) -> dict[str, int]:
+    """
+    複数タグの現在のバージョンをまとめて取得
+
+    :param tags: タグ名のリスト
+    :return: タグ名をキーとしたバージョン番号の辞書
+    """
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+async def aget_tag_versions(tags: list[str]) -> dict[str, int]:
+    """
+    複数タグの現在のバージョンをまとめて取得（非同期版）
+
+    Django 4.2のキャッシュのaget_manyはキーごとにスレッドを切り替えるため、
+    get_tag_versionsを1回のsync_to_asyncで呼び出す
+
+    :param tags: タグ名のリスト
+    :return: タグ名をキーとしたバージョン番号の辞書
+    """
+    return await sync_to_async(get_tag_versions)(tags)
+
+
+def _bump_now(tags: tuple[str, ...]) -> None:
+    """
+    タグのバージョンをすぐに上げる
+
+    :param tags: タグ名
+    """
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def bump_tags(*tags: str) -> None:
+    """
+    タグのバージョンを上げて関連するキャッシュを無効化
+
+    トランザクション内で呼び出された場合はコミット後に上げる（ロールバックされた場合は上げない）。
+    コミット前に上げると、並行する読み取りがコミット前の内容を新しいバージョンでキャッシュしてしまう
+
+    :param tags: タグ名
+    """
+    transaction.on_commit(lambda: _bump_now(tags))
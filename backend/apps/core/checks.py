@@ -0,0 +1,39 @@
+"""
+システムチェック
+
+設定の組み合わせのうち、起動はできるが複数のプロセスで正しく動作しないものを警告する
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# プロセスごとに値を持ち、他のプロセスと共有されないキャッシュのバックエンド
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs) -> list[Warning]:
+    """
+    レプリカを使う場合に、キャッシュがプロセス間で共有されているか確認
+
+    書き込んだユーザーの読み取りの固定（apps.core.routers）はキャッシュに保存するため、
+    プロセスごとのキャッシュでは別のプロセスに届いたリクエストがレプリカの古い内容を読む
+
+    :param app_configs: 検査対象のアプリ
+    :param kwargs: キーワード引数
+    :return: 警告のリスト
+    """
+    if not settings.DATABASE_REPLICAS:
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f'DATABASE_REPLICAS is set but the default cache ({backend}) is not shared between processes.',
+            hint='Use a shared cache such as Redis or Memcached so read-your-writes pins reach every worker.',
+            id='core.W001',
+        )
+    ]
@@ -0,0 +1,333 @@
+"""
+条件付きGET
+
+ETagの検証値を求め、If-None-Matchに一致するリクエストへ304を返す。
+レスポンス本体をシリアライズせずに検証値を求められるよう、以下だけを使う。
+
+- 投稿一覧: 件数キャッシュのタグ（投稿・コメントの書き込みで更新）と `users` タグのバージョン、
+  投稿・コメントの最終更新日時と最後の削除の日時（インデックスの末尾を読むだけの1回のクエリ）
+- 投稿詳細: 投稿の行と最新のコメントの日時、`post:<id>`・`users` タグのバージョン
+- コメント一覧: 絞り込んだコメントの件数と最終更新日時、`users` タグのバージョン
+
+タグのバージョンはキャッシュに保存されるため、複数のプロセスで配信する場合は共有のキャッシュが必要になる。
+投稿一覧はシグナルを送らない書き込みや他のプロセスの書き込みもDBの日時で検出する
+（QuerySet.update()では更新日時も更新する）。ただし公開APIのレスポンスキャッシュ
+（apps.core.mixins.CachedResponseMixin）は保存したETagを返すため、タグを更新しない書き込みは
+`RESPONSE_CACHE_TIMEOUT` 秒まで反映されない。
+コメントの削除・編集やユーザー名の変更は最終更新日時に表れないため、Last-Modifiedは付けず、
+If-Modified-Sinceだけのリクエストには常に200を返す。
+`users` タグは公開されるユーザー名の変更で更新し、埋め込んだ作者の変更もETagに反映する。
+`a` で始まる関数・メソッドは非同期のビュー向け。
+"""
+import hashlib
+from calendar import timegm
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import aget_tag_versions, get_tag_versions
+from .models import Comment, Post, Tombstone
+from .pagination import count_cache_tag
+
+# 公開されるユーザー名が変更された際に更新されるタグ
+USERS_TAG = 'users'
+# 投稿一覧の内容が依存するタグ（一覧のコメント数・埋め込んだ作者を含む）
+POST_LIST_TAGS = [count_cache_tag(Post), count_cache_tag(Comment), USERS_TAG]
+# 投稿一覧の内容が依存するモデル（最終更新日時と最後の削除の日時を状態に含める）
+POST_LIST_MODELS = [Post, Comment]
+
+
+def _versions_state(versions: dict[str, int]) -> tuple:
+    """
+    タグのバージョンを状態を表す値に変換
+
+    :param versions: タグ名をキーとしたバージョン番号の辞書
+    :return: タグ名順のバージョン番号
+    """
+    return tuple(versions[tag] for tag in sorted(versions))
+
+
+def last_writes_querysets(models: list) -> list[QuerySet]:
+    """
+    モデルごとの最終更新日時と最後の削除の日時を取得するQuerySetを返す
+
+    いずれも (updated_at, id)・(model, deleted_at) のインデックスの末尾を読むため、行数によらず一定のコストになる
+
+    :param models: updated_atを持ち、削除がTombstoneに記録されるモデルのリスト
+    :return: モデルの順に最終更新日時、最後の削除の日時を1行返すQuerySetのリスト
+    """
+    querysets = []
+    for model in models:
+        querysets.append(model.objects.order_by('-updated_at').values('updated_at')[:1])
+        querysets.append(
+            Tombstone.objects.filter(model=model._meta.label_lower).order_by('-deleted_at').values('deleted_at')[:1]
+        )
+    return querysets
+
+
+def last_writes_state(models: list) -> tuple:
+    """
+    モデルごとの最終更新日時と最後の削除の日時を1回のクエリで取得
+
+    レスポンスの内容と同じ時点の状態になるよう、一覧と同じ読み取り用のDBから取得する
+
+    :param models: updated_atを持ち、削除がTombstoneに記録されるモデルのリスト
+    :return: モデルの順に (最終更新日時, 最後の削除の日時) を並べた値
+    """
+    sqls = []
+    params = []
+    for queryset in last_writes_querysets(models):
+        sql, sql_params = queryset.query.sql_with_params()
+        sqls.append(f'({sql})')
+        params.extend(sql_params)
+    with connections[router.db_for_read(models[0])].cursor() as cursor:
+        cursor.execute(f'SELECT {", ".join(sqls)}', params)
+        return cursor.fetchone()
+
+
+def post_list_state() -> tuple[tuple, None]:
+    """
+    投稿一覧の状態を返す
+
+    投稿・コメントのいずれかの書き込みかユーザー名の変更で変わる。
+    絞り込み・ページはETagに含めるリクエストのパスで区別する
+
+    :return: (状態を表す値, None)
+    """
+    versions = get_tag_versions(POST_LIST_TAGS)
+    return (*_versions_state(versions), *last_writes_state(POST_LIST_MODELS)), None
+
+
+async def apost_list_state() -> tuple[tuple, None]:
+    """
+    投稿一覧の状態を返す（非同期版）
+
+    :return: (状態を表す値, None)
+    """
+    versions = await aget_tag_versions(POST_LIST_TAGS)
+    return (*_versions_state(versions), *await sync_to_async(last_writes_state)(POST_LIST_MODELS)), None
+
+
+def post_detail_state(posts: QuerySet, pk) -> tuple[tuple, None] | None:
+    """
+    投稿詳細の状態を集計
+
+    コメント数はPost.comment_count、最新のコメント日時はインデックスの先頭から求め、
+    コメントの件数によらず一定のコストで集計する。
+    コメントの編集は `post:<id>`、作者のユーザー名の変更は `users` タグのバージョンで反映する
+
+    :param posts: 投稿のQuerySet
+    :param pk: 投稿ID
+    :return: (状態を表す値, None)。投稿が存在しない場合はNone
+    """
+    try:
+        row = posts.filter(pk=pk).values_list('updated_at', 'comment_count').first()
+    except (TypeError, ValueError, ValidationError):
+        # 不正なIDはretrieve側で404になる
+        return None
+    if row is None:
+        return None
+    updated_at, comment_count = row
+    last_comment = (
+        Comment.objects.filter(post_id=pk).order_by('-created_at', '-id').values_list('created_at', flat=True).first()
+    )
+    versions = get_tag_versions([f'post:{pk}', USERS_TAG])
+    state = (updated_at, comment_count, last_comment, *_versions_state(versions))
+    return state, None
+
+
+async def apost_detail_state(posts: QuerySet, pk) -> tuple[tuple, None] | None:
+    """
+    投稿詳細の状態を集計（非同期版）
+
+    :param posts: 投稿のQuerySet
+    :param pk: 投稿ID
+    :return: (状態を表す値, None)。投稿が存在しない場合はNone
+    """
+    try:
+        row = await posts.filter(pk=pk).values_list('updated_at', 'comment_count').afirst()
+    except (TypeError, ValueError, ValidationError):
+        # 不正なIDはretrieve側で404になる
+        return None
+    if row is None:
+        return None
+    updated_at, comment_count = row
+    last_comment = await (
+        Comment.objects.filter(post_id=pk).order_by('-created_at', '-id').values_list('created_at', flat=True).afirst()
+    )
+    versions = await aget_tag_versions([f'post:{pk}', USERS_TAG])
+    state = (updated_at, comment_count, last_comment, *_versions_state(versions))
+    return state, None
+
+
+def comment_list_state(comments: QuerySet) -> tuple[tuple, None]:
+    """
+    コメント一覧の状態を集計
+
+    コメントの編集はupdated_at、削除は件数、作者のユーザー名の変更は `users` タグのバージョンで反映する
+
+    :param comments: コメントのQuerySet
+    :return: (状態を表す値, None)
+    """
+    stats = comments.order_by().aggregate(count=Count('id'), last=Max('updated_at'))
+    versions = get_tag_versions([USERS_TAG])
+    return (stats['count'], stats['last'], *_versions_state(versions)), None
+
+
+def not_modified_response(request: Request, etag: str | None, last_modified: str | None) -> HttpResponseNotModified | None:
+    """
+    条件付きリクエストが検証値に一致する場合に304レスポンスを返す
+
+    If-None-Matchが指定されている場合はIf-Modified-Sinceより優先される
+
+    :param request: リクエスト
+    :param etag: ETagヘッダーの値
+    :param last_modified: Last-Modifiedヘッダーの値
+    :return: 304レスポンス。一致しない場合はNone
+    """
+    if etag is None and last_modified is None:
+        return None
+    timestamp = parse_http_date(last_modified) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        return None
+    if etag is not None:
+        response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = last_modified
+    return response
+
+
+def build_validators(request: Request, result: tuple[tuple, datetime | None] | None) -> tuple[str | None, str | None]:
+    """
+    状態からETagとLast-Modifiedの値を算出
+
+    状態とリクエストのパス・Acceptヘッダーから強いETagを生成する
+
+    :param request: リクエスト
+    :param result: (状態を表す値, 最終更新日時)。検証値を付けない場合はNone
+    :return: (ETag, Last-Modified)
+    """
+    if result is None:
+        return None, None
+    state, last_modified = result
+    raw = f'{request.get_full_path()}:{request.META.get("HTTP_ACCEPT", "")}:{state!r}'
+    etag = f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+    if last_modified is not None:
+        last_modified = http_date(timegm(last_modified.utctimetuple()))
+    return etag, last_modified
+
+
+def add_validators(response, etag: str | None, last_modified: str | None):
+    """
+    成功したレスポンスに検証値のヘッダーを付ける
+
+    :param response: レスポンス
+    :param etag: ETagヘッダーの値
+    :param last_modified: Last-Modifiedヘッダーの値
+    :return: レスポンス
+    """
+    if response.status_code == 200:
+        if etag is not None:
+            response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = last_modified
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    list・retrieveに条件付きGETを提供するMixin
+
+    ViewSetは `get_conditional_state` で状態を表す値と最終更新日時を返す。
+    状態とリクエストのパス・Acceptヘッダーから強いETagを生成する。
+    非同期のビュー（apps.core.mixins.AsyncReadMixin）では `aget_conditional_state` を使う。
+    """
+
+    def get_conditional_state(self) -> tuple[tuple, datetime | None] | None:
+        """
+        現在のアクションが返すデータの状態を返す
+
+        :return: (状態を表す値, 最終更新日時)。検証値を付けない場合はNone
+        """
+        raise NotImplementedError
+
+    def get_validators(self, request: Request) -> tuple[str | None, str | None]:
+        """
+        ETagとLast-Modifiedの値を算出
+
+        :param request: リクエスト
+        :return: (ETag, Last-Modified)
+        """
+        return build_validators(request, self.get_conditional_state())
+
+    # list・retrieveのdocstringはOpenAPIのdescriptionとして使われるため、
+    # ViewSetのdocstringが使われるようここでは定義しない
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_conditional_response(self, handler, request: Request, *args, **kwargs):
+        """
+        検証値が一致すれば304を返し、それ以外はハンドラーのレスポンスに検証値を付ける
+
+        :param handler: レスポンスを生成するハンドラー
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        etag, last_modified = self.get_validators(request)
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        return add_validators(handler(request, *args, **kwargs), etag, last_modified)
+
+    async def aget_conditional_state(self) -> tuple[tuple, datetime | None] | None:
+        """
+        現在のアクションが返すデータの状態を非同期に返す
+
+        :return: (状態を表す値, 最終更新日時)。検証値を付けない場合はNone
+        """
+        raise NotImplementedError
+
+    async def alist(self, request: Request, *args, **kwargs) -> Response:
+        """
+        listの非同期版に条件付きGETを適用
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        return await self.aget_conditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        retrieveの非同期版に条件付きGETを適用
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        return await self.aget_conditional_response(super().aretrieve, request, *args, **kwargs)
+
+    async def aget_conditional_response(self, handler, request: Request, *args, **kwargs):
+        """
+        検証値が一致すれば304を返し、それ以外は非同期のハンドラーのレスポンスに検証値を付ける
+
+        :param handler: レスポンスを生成する非同期のハンドラー
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        etag, last_modified = build_validators(request, await self.aget_conditional_state())
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        return add_validators(await handler(request, *args, **kwargs), etag, last_modified)
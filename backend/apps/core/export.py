@@ -0,0 +1,169 @@
+"""
+データエクスポート
+
+投稿・コメントの全件をNDJSONまたはCSVとして逐次出力する。
+行はQuerySet.iterator()で一定件数ずつ取得し（PostgreSQLではサーバーサイドカーソル）、
+一定サイズごとに出力するため、テーブルの大きさによらずメモリ使用量は一定になる。
+"""
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Comment, Post
+
+# エクスポート対象ごとのモデルと出力カラム（カラム名: 参照先）
+EXPORTS = {
+    'posts': (
+        Post,
+        {
+            'id': 'id',
+            'title': 'title',
+            'content': 'content',
+            'author_id': 'author_id',
+            'author_username': 'author__username',
+            'is_published': 'is_published',
+            'comment_count': 'comment_count',
+            'created_at': 'created_at',
+            'updated_at': 'updated_at',
+        },
+    ),
+    'comments': (
+        Comment,
+        {
+            'id': 'id',
+            'post_id': 'post_id',
+            'author_id': 'author_id',
+            'author_username': 'author__username',
+            'content': 'content',
+            'created_at': 'created_at',
+        },
+    ),
+}
+
+# 出力形式ごとのContent-Type
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# DBから1回に取得する行数
+CHUNK_SIZE = 2000
+# 1回に出力する文字数の目安
+BUFFER_SIZE = 64 * 1024
+
+
+def _format_value(value):
+    """
+    日時をISO 8601形式の文字列に変換
+
+    :param value: 値
+    :return: 出力する値
+    """
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_rows(name: str) -> Iterator[dict]:
+    """
+    エクスポート対象の行をID順に逐次取得
+
+    :param name: エクスポート対象（postsまたはcomments）
+    :return: 行の辞書のイテレーター
+    """
+    model, columns = EXPORTS[name]
+    expressions = {column: F(path) for column, path in columns.items() if column != path}
+    fields = [column for column, path in columns.items() if column == path]
+    queryset = model.objects.order_by('id').values(*fields, **expressions)
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield {column: _format_value(row[column]) for column in columns}
+
+
+class _Echo:
+    """csv.writerの出力をそのまま返す疑似ファイル"""
+
+    def write(self, value: str) -> str:
+        """
+        書き込まれた値を返す
+
+        :param value: 書き込まれた値
+        :return: 書き込まれた値
+        """
+        return value
+
+
+def iter_ndjson(name: str) -> Iterator[str]:
+    """
+    1行1オブジェクトのJSONとして出力
+
+    :param name: エクスポート対象
+    :return: 出力する行のイテレーター
+    """
+    for row in iter_rows(name):
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def iter_csv(name: str) -> Iterator[str]:
+    """
+    ヘッダー付きのCSVとして出力
+
+    :param name: エクスポート対象
+    :return: 出力する行のイテレーター
+    """
+    _, columns = EXPORTS[name]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(columns))
+    for row in iter_rows(name):
+        yield writer.writerow(row.values())
+
+
+def buffered(lines: Iterable[str], size: int = BUFFER_SIZE) -> Iterator[str]:
+    """
+    行をまとめて出力し、書き込み回数を減らす
+
+    :param lines: 出力する行
+    :param size: まとめる文字数の目安
+    :return: まとめた文字列のイテレーター
+    """
+    chunk = []
+    length = 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_export(name: str, output: str) -> Iterator[str]:
+    """
+    エクスポート内容を逐次生成
+
+    :param name: エクスポート対象（postsまたはcomments）
+    :param output: 出力形式（ndjsonまたはcsv）
+    :return: 出力する文字列のイテレーター
+    """
+    lines = iter_csv(name) if output == 'csv' else iter_ndjson(name)
+    return buffered(lines)
+
+
+def export_response(name: str, output: str) -> StreamingHttpResponse:
+    """
+    エクスポート内容をダウンロードさせるレスポンスを返す
+
+    :param name: エクスポート対象（postsまたはcomments）
+    :param output: 出力形式（ndjsonまたはcsv）
+    :return: ストリーミングレスポンス
+    """
+    filename = f'{name}-{timezone.now():%Y%m%d%H%M%S}.{output}'
+    return StreamingHttpResponse(
+        stream_export(name, output),
+        content_type=f'{FORMATS[output]}; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,525 @@
+"""
+APIベンチマークコマンド
+
+合成データを投入したデータベースに対してdashboard・portalの全ルートを実行し、
+レイテンシー・クエリ数・メモリ使用量を計測する
+"""
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import import_module
+from io import StringIO
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.models import Comment, Post, User
+
+URLCONFS = ['apps.api.dashboard.urls', 'apps.api.portal.urls']
+
+# 一括操作のシナリオで送る要素数
+BULK_SIZE = 100
+# 全文検索のシナリオで使う語（seed_dataの語彙に含まれる）
+SEARCH_TERM = 'インデックス'
+# 計測誤差として無視する差（レイテンシーはミリ秒、メモリはKB）
+LATENCY_NOISE_MS = 1.0
+MEMORY_NOISE_KB = 64.0
+LATENCY_METRICS = ['p50_ms', 'p95_ms', 'p99_ms']
+
+
+class Scenario:
+    """
+    ベンチマークの1シナリオ
+
+    `args`・`params`・`body` には値、またはフィクスチャの辞書を受け取って値を返す関数を指定する
+
+    :param name: シナリオ名（結果のキー）
+    :param route: URL名
+    :param method: HTTPメソッド
+    :param args: URLの位置引数
+    :param params: クエリパラメータ
+    :param body: リクエスト本体
+    :param authenticated: JWTで認証するかどうか
+    :param writes: データを書き換えるかどうか（実行後にロールバックする）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        route: str,
+        method: str = 'get',
+        args=None,
+        params=None,
+        body=None,
+        authenticated: bool = True,
+        writes: bool = False,
+    ):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.args = args
+        self.params = params
+        self.body = body
+        self.authenticated = authenticated
+        self.writes = writes
+
+    def resolve(self, value, fixtures: dict):
+        """
+        フィクスチャに依存する値を解決
+
+        :param value: 値または関数
+        :param fixtures: フィクスチャ
+        :return: 値
+        """
+        return value(fixtures) if callable(value) else value
+
+    def build(self, fixtures: dict) -> tuple[str, dict | list | None]:
+        """
+        リクエストのパスと本体を組み立てる
+
+        :param fixtures: フィクスチャ
+        :return: (パス, リクエスト本体またはクエリパラメータ)
+        """
+        path = reverse(self.route, args=self.resolve(self.args, fixtures))
+        if self.method == 'get':
+            return path, self.resolve(self.params, fixtures)
+        return path, self.resolve(self.body, fixtures)
+
+
+SCENARIOS = [
+    # Dashboard
+    Scenario('post-list', 'post-list'),
+    Scenario('post-list-cursor', 'post-list', params={'pagination': 'cursor'}),
+    Scenario('post-retrieve', 'post-detail', args=lambda f: [f['post'].pk]),
+    Scenario(
+        'post-create',
+        'post-list',
+        'post',
+        body={'title': 'Benchmark', 'content': 'Benchmark post.', 'is_published': True},
+        writes=True,
+    ),
+    Scenario(
+        'post-update',
+        'post-detail',
+        'put',
+        args=lambda f: [f['post'].pk],
+        body={'title': 'Benchmark', 'content': 'Updated.', 'is_published': True},
+        writes=True,
+    ),
+    Scenario(
+        'post-partial-update',
+        'post-detail',
+        'patch',
+        args=lambda f: [f['post'].pk],
+        body={'title': 'Benchmark'},
+        writes=True,
+    ),
+    Scenario('post-destroy', 'post-detail', 'delete', args=lambda f: [f['post'].pk], writes=True),
+    Scenario(
+        'post-bulk-create',
+        'post-bulk-create',
+        'post',
+        body=[{'title': f'Benchmark {i}', 'content': 'Benchmark post.'} for i in range(BULK_SIZE)],
+        writes=True,
+    ),
+    Scenario(
+        'post-bulk-update',
+        'post-bulk-create',
+        'patch',
+        body=lambda f: [{'id': pk, 'title': 'Benchmark'} for pk in f['post_ids']],
+        writes=True,
+    ),
+    Scenario(
+        'post-bulk-destroy',
+        'post-bulk-destroy',
+        'post',
+        body=lambda f: {'ids': f['post_ids']},
+        writes=True,
+    ),
+    Scenario('post-comments', 'post-comments', args=lambda f: [f['post'].pk]),
+    Scenario('post-sync', 'post-sync'),
+    Scenario('post-export', 'post-export', params={'output': 'ndjson'}),
+    Scenario('comment-list', 'comment-list'),
+    Scenario('comment-retrieve', 'comment-detail', args=lambda f: [f['comment'].pk]),
+    Scenario(
+        'comment-create',
+        'comment-list',
+        'post',
+        body=lambda f: {'post': f['post'].pk, 'content': 'Benchmark comment.'},
+        writes=True,
+    ),
+    Scenario('comment-destroy', 'comment-detail', 'delete', args=lambda f: [f['comment'].pk], writes=True),
+    Scenario(
+        'comment-bulk-create',
+        'comment-bulk-create',
+        'post',
+        body=lambda f: [{'post': pk, 'content': 'Benchmark comment.'} for pk in f['post_ids']],
+        writes=True,
+    ),
+    Scenario(
+        'comment-bulk-destroy',
+        'comment-bulk-destroy',
+        'post',
+        body=lambda f: {'ids': f['comment_ids']},
+        writes=True,
+    ),
+    Scenario('comment-sync', 'comment-sync'),
+    Scenario('comment-export', 'comment-export', params={'output': 'ndjson'}),
+    Scenario('search-list', 'search-list', params={'q': SEARCH_TERM}),
+    Scenario('user-me', 'user-me'),
+    # Portal
+    Scenario('public-post-list', 'public-post-list', authenticated=False),
+    Scenario('public-post-list-cursor', 'public-post-list', params={'pagination': 'cursor'}, authenticated=False),
+    Scenario('public-post-retrieve', 'public-post-detail', args=lambda f: [f['post'].pk], authenticated=False),
+    Scenario('public-post-comments', 'public-post-comments', args=lambda f: [f['post'].pk], authenticated=False),
+    Scenario('public-search-list', 'public-search-list', params={'q': SEARCH_TERM}, authenticated=False),
+]
+
+
+def iter_routes():
+    """
+    dashboard・portalのルーターに登録された (URL名, HTTPメソッド) を列挙
+
+    :return: (URL名, HTTPメソッド) のイテレーター
+    """
+    for urlconf in URLCONFS:
+        router = import_module(urlconf).router
+        for prefix, viewset, basename in router.registry:
+            for route in router.get_routes(viewset):
+                for method, action in route.mapping.items():
+                    if hasattr(viewset, action) and method in viewset.http_method_names:
+                        yield route.name.format(basename=basename), method
+
+
+def percentile(quantiles: list[float], value: int) -> float:
+    """
+    statistics.quantiles(n=100) の結果から百分位数を取り出す
+
+    :param quantiles: 1〜99パーセンタイルのリスト
+    :param value: 百分位（1〜99）
+    :return: 百分位数
+    """
+    return quantiles[value - 1]
+
+
+class Command(BaseCommand):
+    """
+    APIのベンチマークを実行するコマンド
+
+    テスト用データベースを作成してseed_dataで合成データを投入し、
+    dashboard・portalの全ルートをテストクライアントで実行する。
+    各シナリオのレイテンシーの百分位数を計測した後、tracemallocとクエリの記録を
+    有効にした1回の実行でクエリ数とメモリ使用量のピークを計測する。
+    書き込みを行うシナリオはトランザクション内で実行してロールバックし、データセットを変えない。
+
+    `--output` で結果をJSONとして保存し、`--baseline` で保存済みの結果と比較して
+    `--threshold` を超える劣化があれば失敗する
+    """
+
+    help = 'Benchmark every dashboard/portal route against a seeded dataset and compare with a baseline'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--users', type=int, default=200, help='Number of synthetic users to seed')
+        parser.add_argument('--posts', type=int, default=5000, help='Number of synthetic posts to seed')
+        parser.add_argument(
+            '--comments-per-post', type=float, default=3.0, help='Average comments per published post'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic dataset')
+        parser.add_argument(
+            '--reuse-db',
+            action='store_true',
+            help='Benchmark the configured database as is instead of seeding a test database',
+        )
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per scenario')
+        parser.add_argument('--only', default='', help='Run only scenarios whose name contains this string')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--baseline', help='Compare results with a JSON file written by --output')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=20.0,
+            help='Allowed regression of latency and memory against the baseline, in percent',
+        )
+        parser.add_argument(
+            '--metric',
+            choices=LATENCY_METRICS,
+            default='p95_ms',
+            help='Latency percentile compared with the baseline',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['iterations'] < 2:
+            raise CommandError('--iterations must be at least 2')
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+
+        scenarios = [scenario for scenario in SCENARIOS if options['only'] in scenario.name]
+        if not options['only']:
+            self.check_coverage(scenarios)
+
+        setup_test_environment()
+        old_config = None
+        try:
+            if not options['reuse_db']:
+                old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+                self.seed(options)
+            results = self.run(scenarios, self.load_fixtures(), options)
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'dataset': None
+                if options['reuse_db']
+                else {
+                    'users': options['users'],
+                    'posts': options['posts'],
+                    'comments_per_post': options['comments_per_post'],
+                    'seed': options['seed'],
+                },
+                'iterations': options['iterations'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+                file.write('\n')
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if baseline is not None:
+            self.compare(report, baseline, options['threshold'], options['metric'])
+
+    def check_coverage(self, scenarios: list[Scenario]):
+        """
+        シナリオのないルートがあれば失敗する
+
+        :param scenarios: シナリオ
+        :raises CommandError: シナリオのないルートがある場合
+        """
+        covered = {(scenario.route, scenario.method) for scenario in scenarios}
+        missing = sorted(f'{method.upper()} {name}' for name, method in iter_routes() if (name, method) not in covered)
+        if missing:
+            raise CommandError(f'No benchmark scenario for: {", ".join(missing)}')
+
+    def seed(self, options: dict):
+        """
+        テスト用データベースに合成データを投入
+
+        :param options: キーワード引数
+        """
+        self.stdout.write(f'Seeding {options["users"]} users and {options["posts"]} posts...')
+        started = time.perf_counter()
+        call_command(
+            'seed_data',
+            users=options['users'],
+            posts=options['posts'],
+            comments_per_post=options['comments_per_post'],
+            seed=options['seed'],
+            stdout=StringIO(),
+        )
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+    def load_fixtures(self) -> dict:
+        """
+        シナリオで使うユーザー・投稿・コメントを選ぶ
+
+        :return: フィクスチャ
+        :raises CommandError: データがない場合
+        """
+        user = User.objects.order_by('id').first()
+        post = (
+            Post.objects.filter(is_published=True, comment_count__gt=0).order_by('-created_at', '-id').first()
+        )
+        if user is None or post is None:
+            raise CommandError('The database has no users or published posts with comments; run seed_data first')
+        post_ids = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True)[:BULK_SIZE])
+        comment_ids = list(Comment.objects.order_by('-id').values_list('id', flat=True)[:BULK_SIZE])
+        return {
+            'user': user,
+            'token': str(AccessToken.for_user(user)),
+            'post': post,
+            'comment': Comment.objects.filter(post=post).order_by('id').first(),
+            'post_ids': post_ids,
+            'comment_ids': comment_ids,
+        }
+
+    def run(self, scenarios: list[Scenario], fixtures: dict, options: dict) -> dict:
+        """
+        シナリオを順に実行して計測
+
+        :param scenarios: シナリオ
+        :param fixtures: フィクスチャ
+        :param options: キーワード引数
+        :return: シナリオ名をキーとした計測結果
+        :raises CommandError: エラーのレスポンスを返したシナリオがある場合
+        """
+        results = {}
+        errors = []
+        self.stdout.write(
+            f'{"scenario":<26}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}{"peak KB":>10}{"bytes":>11}'
+        )
+        for scenario in scenarios:
+            client = APIClient()
+            if scenario.authenticated:
+                client.credentials(HTTP_AUTHORIZATION=f'Bearer {fixtures["token"]}')
+            path, data = scenario.build(fixtures)
+
+            def send():
+                return self.send(client, scenario, path, data)
+
+            for _ in range(options['warmup']):
+                send()
+            samples = []
+            for _ in range(options['iterations']):
+                started = time.perf_counter()
+                send()
+                samples.append((time.perf_counter() - started) * 1000)
+
+            # tracemallocとクエリの記録は処理を遅くするため、レイテンシーとは別に計測する
+            tracemalloc.start()
+            try:
+                with CaptureQueriesContext(connection) as queries:
+                    status, size = send()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            quantiles = statistics.quantiles(samples, n=100, method='inclusive')
+            result = {
+                'route': scenario.route,
+                'method': scenario.method.upper(),
+                'status': status,
+                'p50_ms': round(percentile(quantiles, 50), 3),
+                'p95_ms': round(percentile(quantiles, 95), 3),
+                'p99_ms': round(percentile(quantiles, 99), 3),
+                'mean_ms': round(statistics.fmean(samples), 3),
+                'queries': len(queries),
+                'peak_memory_kb': round(peak / 1024, 1),
+                'response_bytes': size,
+            }
+            results[scenario.name] = result
+            line = (
+                f'{scenario.name:<26}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}'
+                f'{result["queries"]:>9}{result["peak_memory_kb"]:>10.1f}{size:>11}'
+            )
+            if status >= 400:
+                errors.append(f'{scenario.name} ({status})')
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if errors:
+            raise CommandError(f'Scenarios returned errors: {", ".join(errors)}')
+        return results
+
+    def send(self, client: APIClient, scenario: Scenario, path: str, data) -> tuple[int, int]:
+        """
+        リクエストを送信し、レスポンス本体を最後まで読み出す
+
+        :param client: テストクライアント
+        :param scenario: シナリオ
+        :param path: パス
+        :param data: リクエスト本体またはクエリパラメータ
+        :return: (ステータスコード, レスポンスのバイト数)
+        """
+        if not scenario.writes:
+            return self.consume(getattr(client, scenario.method)(path, data, format='json'))
+        with transaction.atomic():
+            response = getattr(client, scenario.method)(path, data, format='json')
+            transaction.set_rollback(True)
+        return self.consume(response)
+
+    def consume(self, response) -> tuple[int, int]:
+        """
+        レスポンス本体を読み出す（ストリーミングレスポンスは全体を生成する）
+
+        :param response: レスポンス
+        :return: (ステータスコード, レスポンスのバイト数)
+        """
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        response.close()
+        return response.status_code, size
+
+    def compare(self, report: dict, baseline: dict, threshold: float, metric: str):
+        """
+        保存済みの結果と比較し、閾値を超える劣化があれば失敗する
+
+        レイテンシーとメモリは閾値（%）と計測誤差の両方を超えた場合、
+        クエリ数は1件でも増えた場合に劣化とみなす
+
+        :param report: 今回の結果
+        :param baseline: 保存済みの結果
+        :param threshold: 許容する劣化（%）
+        :param metric: 比較するレイテンシーの百分位数
+        :raises CommandError: 劣化がある場合
+        """
+        if report['meta'].get('dataset') != baseline.get('meta', {}).get('dataset'):
+            self.stdout.write(self.style.WARNING('Baseline was recorded with a different dataset'))
+
+        ratio = 1 + threshold / 100
+        regressions = []
+        for name, result in report['results'].items():
+            base = baseline.get('results', {}).get(name)
+            if base is None:
+                self.stdout.write(f'NEW {name}')
+                continue
+            problems = []
+            if result[metric] > base[metric] * ratio and result[metric] - base[metric] > LATENCY_NOISE_MS:
+                problems.append(f'{metric} {base[metric]:.2f} -> {result[metric]:.2f}')
+            if result['queries'] > base['queries']:
+                problems.append(f'queries {base["queries"]} -> {result["queries"]}')
+            if (
+                result['peak_memory_kb'] > base['peak_memory_kb'] * ratio
+                and result['peak_memory_kb'] - base['peak_memory_kb'] > MEMORY_NOISE_KB
+            ):
+                problems.append(f'peak_memory_kb {base["peak_memory_kb"]:.1f} -> {result["peak_memory_kb"]:.1f}')
+            if problems:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(f'NG {name}: {"; ".join(problems)}'))
+            else:
+                change = (result[metric] / base[metric] - 1) * 100 if base[metric] else 0.0
+                self.stdout.write(f'OK {name} ({metric} {change:+.1f}%)')
+
+        if regressions:
+            raise CommandError(f'{len(regressions)} scenarios regressed beyond {threshold:g}%')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,354 @@
+"""
+ASGIベンチマークコマンド
+
+合成データを投入したデータベースに対してASGIアプリケーションへ同時にリクエストを送り、
+公開投稿の一覧・詳細を同期のViewSetと非同期のビューで処理した場合のスループット・レイテンシーを比較する
+"""
+import asyncio
+import hashlib
+import json
+import platform
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+from io import StringIO
+
+import django
+from django.core.asgi import get_asgi_application
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from apps.core.models import Post
+
+from .benchmark_api import percentile
+
+MODES = {'sync': False, 'async': True}
+# スレッド数を記録する間隔（秒）
+THREAD_SAMPLE_INTERVAL = 0.005
+
+
+class QueryLatency:
+    """
+    クエリごとに待ち時間を挟むexecute_wrapper
+
+    ネットワーク越しのデータベースの応答待ちを模擬する。
+    待ちはクエリを実行するスレッドを止めるため、同期・非同期のどちらのビューでもスレッドを占有する
+
+    :param seconds: 1クエリあたりの待ち時間（秒）
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        """
+        接続にexecute_wrapperを追加（connection_createdのレシーバー）
+
+        :param sender: データベースのバックエンド
+        :param connection: 接続
+        """
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+async def fetch(app, path: str, delay: float = 0) -> tuple[int, str]:
+    """
+    ASGIアプリケーションにGETリクエストを送り、レスポンスを最後まで受け取る
+
+    :param app: ASGIアプリケーション
+    :param path: パス（クエリ文字列を含む）
+    :param delay: レスポンスのメッセージ1つを受け取るのにかかる時間（秒）
+    :return: (ステータスコード, レスポンス本体のSHA-1)
+    """
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': [(b'host', b'testserver'), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    disconnected = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    status = None
+    digest = hashlib.sha1()
+
+    async def send(message):
+        nonlocal status
+        if delay:
+            await asyncio.sleep(delay)
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            digest.update(message.get('body', b''))
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return status, digest.hexdigest()
+
+
+class Command(BaseCommand):
+    """
+    公開投稿の一覧・詳細を同期・非同期で処理した場合を比較するコマンド
+
+    テスト用データベースを作成してseed_dataで合成データを投入し、`config.asgi` と同じ
+    ASGIアプリケーションをプロセス内で呼び出す。`--clients` 個のクライアントが同時に
+    `--requests` 回ずつリクエストを送り、`ASYNC_READ_VIEWS` をFalse（sync）・True（async）に
+    切り替えて、スループット・レイテンシーの百分位数・スレッド数のピークを計測する。
+    計測の前に両方の処理のレスポンス本体が一致することを確認する。
+
+    `--client-delay` はレスポンスを受け取るクライアントの遅さ、`--query-latency` はクエリごとの
+    データベースの応答待ちを模擬する。レスポンスキャッシュは既定で無効にし、毎回データベースから組み立てる
+    """
+
+    help = 'Compare the sync and async portal post views under concurrent ASGI clients'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--users', type=int, default=200, help='Number of synthetic users to seed')
+        parser.add_argument('--posts', type=int, default=5000, help='Number of synthetic posts to seed')
+        parser.add_argument(
+            '--comments-per-post', type=float, default=3.0, help='Average comments per published post'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic dataset')
+        parser.add_argument(
+            '--reuse-db',
+            action='store_true',
+            help='Benchmark the configured database as is instead of seeding a test database',
+        )
+        parser.add_argument('--clients', type=int, default=50, help='Number of simultaneous clients')
+        parser.add_argument('--requests', type=int, default=10, help='Requests sent by each client')
+        parser.add_argument(
+            '--client-delay',
+            type=float,
+            default=0,
+            help='Milliseconds each client takes to receive every response message',
+        )
+        parser.add_argument(
+            '--query-latency', type=float, default=0, help='Milliseconds of simulated database latency per query'
+        )
+        parser.add_argument(
+            '--response-cache',
+            action='store_true',
+            help='Keep the response cache enabled (responses are served from the cache after the first request)',
+        )
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['clients'] < 1 or options['requests'] < 1:
+            raise CommandError('--clients and --requests must be at least 1')
+
+        setup_test_environment()
+        old_config = None
+        latency = QueryLatency(options['query_latency'] / 1000)
+        try:
+            if not options['reuse_db']:
+                old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+                self.seed(options)
+            paths = self.load_paths()
+            if latency.seconds:
+                connection_created.connect(latency.install)
+                if connection.connection is not None:
+                    latency.install(connection=connection)
+            cache_settings = {} if options['response_cache'] else {'RESPONSE_CACHE_TIMEOUT': 0}
+            with override_settings(**cache_settings):
+                results = asyncio.run(self.run(paths, options))
+        finally:
+            connection_created.disconnect(latency.install)
+            if latency in connection.execute_wrappers:
+                connection.execute_wrappers.remove(latency)
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            report = {
+                'meta': {
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                    'dataset': None
+                    if options['reuse_db']
+                    else {
+                        'users': options['users'],
+                        'posts': options['posts'],
+                        'comments_per_post': options['comments_per_post'],
+                        'seed': options['seed'],
+                    },
+                    'clients': options['clients'],
+                    'requests': options['requests'],
+                    'client_delay_ms': options['client_delay'],
+                    'query_latency_ms': options['query_latency'],
+                    'response_cache': options['response_cache'],
+                    'database': connection.vendor,
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                },
+                'results': results,
+            }
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+                file.write('\n')
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    def seed(self, options: dict):
+        """
+        テスト用データベースに合成データを投入
+
+        :param options: キーワード引数
+        """
+        self.stdout.write(f'Seeding {options["users"]} users and {options["posts"]} posts...')
+        started = time.perf_counter()
+        call_command(
+            'seed_data',
+            users=options['users'],
+            posts=options['posts'],
+            comments_per_post=options['comments_per_post'],
+            seed=options['seed'],
+            stdout=StringIO(),
+        )
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+    def load_paths(self) -> list[str]:
+        """
+        クライアントが順に送るパスを組み立てる
+
+        :return: パス（クエリ文字列を含む）
+        :raises CommandError: 公開投稿がない場合
+        """
+        post = Post.objects.filter(is_published=True, comment_count__gt=0).order_by('-created_at', '-id').first()
+        if post is None:
+            raise CommandError('The database has no published posts with comments; run seed_data first')
+        posts = reverse('public-post-list')
+        return [
+            posts,
+            f'{posts}?page=2',
+            f'{posts}?pagination=cursor',
+            reverse('public-post-detail', args=[post.pk]),
+        ]
+
+    async def run(self, paths: list[str], options: dict) -> dict:
+        """
+        同期・非同期の順に計測
+
+        :param paths: パス
+        :param options: キーワード引数
+        :return: 処理（sync・async）をキーとした計測結果
+        :raises CommandError: レスポンスが一致しない・エラーを返した場合
+        """
+        app = get_asgi_application()
+        bodies = {}
+        for mode, enabled in MODES.items():
+            with override_settings(ASYNC_READ_VIEWS=enabled):
+                bodies[mode] = [await fetch(app, path, 0) for path in paths]
+        for path, sync, async_ in zip(paths, bodies['sync'], bodies['async']):
+            if sync[0] >= 400 or sync != async_:
+                raise CommandError(f'Responses differ or failed for {path}: sync {sync[0]}, async {async_[0]}')
+
+        results = {}
+        self.stdout.write(
+            f'{"mode":<8}{"req/s":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"threads":>9}{"errors":>8}'
+        )
+        for mode, enabled in MODES.items():
+            with override_settings(ASYNC_READ_VIEWS=enabled):
+                result = await self.measure(app, paths, options)
+            results[mode] = result
+            line = (
+                f'{mode:<8}{result["requests_per_second"]:>10.1f}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+                f'{result["p99_ms"]:>9.2f}{result["peak_threads"]:>9}{result["errors"]:>8}'
+            )
+            self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+
+        if any(result['errors'] for result in results.values()):
+            raise CommandError('Some requests returned errors')
+        return results
+
+    async def measure(self, app, paths: list[str], options: dict) -> dict:
+        """
+        クライアントを同時に動かして計測
+
+        :param app: ASGIアプリケーション
+        :param paths: パス
+        :param options: キーワード引数
+        :return: 計測結果
+        """
+        delay = options['client_delay'] / 1000
+        samples = []
+        statuses = []
+
+        async def client(index: int):
+            for number in range(options['requests']):
+                path = paths[(index + number) % len(paths)]
+                started = time.perf_counter()
+                status, _ = await fetch(app, path, delay)
+                samples.append((time.perf_counter() - started) * 1000)
+                statuses.append(status)
+
+        peak_threads = threading.active_count()
+        stopped = asyncio.Event()
+
+        async def sample_threads():
+            nonlocal peak_threads
+            while not stopped.is_set():
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(THREAD_SAMPLE_INTERVAL)
+
+        sampler = asyncio.create_task(sample_threads())
+        started = time.perf_counter()
+        await asyncio.gather(*(client(index) for index in range(options['clients'])))
+        elapsed = time.perf_counter() - started
+        stopped.set()
+        await sampler
+
+        quantiles = statistics.quantiles(samples, n=100, method='inclusive') if len(samples) > 1 else samples * 99
+        return {
+            'requests': len(samples),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'p50_ms': round(percentile(quantiles, 50), 3),
+            'p95_ms': round(percentile(quantiles, 95), 3),
+            'p99_ms': round(percentile(quantiles, 99), 3),
+            'mean_ms': round(statistics.fmean(samples), 3),
+            'peak_threads': peak_threads,
+            'errors': sum(status >= 400 for status in statuses),
+        }
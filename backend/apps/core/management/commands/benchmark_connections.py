@@ -0,0 +1,278 @@
+"""
+データベース接続ベンチマークコマンド
+
+合成データを投入したファイルのSQLiteデータベースに対してWSGI・ASGIのハンドラーへ同時にリクエストを送り、
+リクエストごとの接続・持続的な接続・接続プールで、接続の作成回数とスループット・レイテンシーを比較する
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from apps.core.models import Post
+from apps.core.pool import close_pools, pool_stats
+
+from .benchmark_api import percentile
+from .benchmark_asgi import fetch
+
+SERVERS = ['wsgi', 'asgi']
+# 接続の作成・取り出しの所要時間を計測する回数
+ACQUIRE_ITERATIONS = 200
+
+
+class Command(BaseCommand):
+    """
+    接続の管理方法ごとにリクエストの処理を比較するコマンド
+
+    テスト用データベースを一時ファイルに作成してseed_dataで合成データを投入し（インメモリーの
+    データベースは接続を閉じられないため使わない）、以下の3つの方法で公開投稿の一覧・詳細を処理する。
+
+    - connect: リクエストごとに接続を作成して閉じる（`CONN_MAX_AGE=0`・プールなし）
+    - persistent: スレッドごとに接続を持ち続ける（`CONN_MAX_AGE=None`・プールなし）
+    - pool: リクエストの終了時に接続をプールへ返す（`CONN_MAX_AGE=0`・`DATABASE_POOL_SIZE=--pool-size`）
+
+    WSGIは `--clients` 個のスレッド、ASGIは `--clients` 個の同時のクライアントで `--requests` 回ずつ送り、
+    作成した接続の数・スループット・レイテンシーの百分位数・プールの待ちとタイムアウトの件数を出力する。
+    レスポンスキャッシュは無効にし、毎回データベースから組み立てる
+    """
+
+    help = 'Compare per-request connections, persistent connections and the connection pool under WSGI and ASGI'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--users', type=int, default=200, help='Number of synthetic users to seed')
+        parser.add_argument('--posts', type=int, default=5000, help='Number of synthetic posts to seed')
+        parser.add_argument(
+            '--comments-per-post', type=float, default=3.0, help='Average comments per published post'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic dataset')
+        parser.add_argument('--clients', type=int, default=10, help='Number of simultaneous clients')
+        parser.add_argument('--requests', type=int, default=50, help='Requests sent by each client')
+        parser.add_argument('--pool-size', type=int, default=10, help='DATABASE_POOL_SIZE of the pool mode')
+        parser.add_argument('--server', choices=SERVERS, help='Benchmark only this handler (default: both)')
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['clients'] < 1 or options['requests'] < 1 or options['pool_size'] < 1:
+            raise CommandError('--clients, --requests and --pool-size must be at least 1')
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_connections supports SQLite databases only')
+
+        modes = {
+            'connect': {'DATABASE_POOL_SIZE': 0, 'CONN_MAX_AGE': 0},
+            'persistent': {'DATABASE_POOL_SIZE': 0, 'CONN_MAX_AGE': None},
+            'pool': {'DATABASE_POOL_SIZE': options['pool_size'], 'CONN_MAX_AGE': 0},
+        }
+        servers = [options['server']] if options['server'] else SERVERS
+
+        directory = tempfile.TemporaryDirectory()
+        test_settings = connection.settings_dict['TEST']
+        old_name = test_settings['NAME']
+        test_settings['NAME'] = os.path.join(directory.name, 'benchmark.sqlite3')
+        old_max_age = connection.settings_dict['CONN_MAX_AGE']
+        setup_test_environment()
+        old_config = None
+        try:
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+            self.seed(options)
+            paths = self.load_paths()
+            with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+                self.report_acquire(modes['pool']['DATABASE_POOL_SIZE'])
+                self.stdout.write(
+                    f'{"server":<7}{"mode":<12}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"connects":>10}'
+                    f'{"waits":>7}{"timeouts":>10}{"errors":>8}'
+                )
+                errors = 0
+                for server in servers:
+                    for mode, values in modes.items():
+                        result = self.measure(server, paths, values, options)
+                        errors += result['errors']
+                        line = (
+                            f'{server:<7}{mode:<12}{result["requests_per_second"]:>9.1f}{result["p50_ms"]:>9.2f}'
+                            f'{result["p95_ms"]:>9.2f}{result["connects"]:>10}{result["waits"]:>7}'
+                            f'{result["timeouts"]:>10}{result["errors"]:>8}'
+                        )
+                        self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+        finally:
+            close_pools()
+            connection.settings_dict['CONN_MAX_AGE'] = old_max_age
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            test_settings['NAME'] = old_name
+            directory.cleanup()
+
+        if errors:
+            raise CommandError(f'{errors} requests returned errors')
+
+    def seed(self, options: dict):
+        """
+        テスト用データベースに合成データを投入
+
+        :param options: キーワード引数
+        """
+        self.stdout.write(f'Seeding {options["users"]} users and {options["posts"]} posts...')
+        started = time.perf_counter()
+        call_command(
+            'seed_data',
+            users=options['users'],
+            posts=options['posts'],
+            comments_per_post=options['comments_per_post'],
+            seed=options['seed'],
+            stdout=StringIO(),
+        )
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+    def load_paths(self) -> list[str]:
+        """
+        クライアントが順に送るパスを組み立てる
+
+        :return: パス（クエリ文字列を含む）
+        :raises CommandError: 公開投稿がない場合
+        """
+        post = Post.objects.filter(is_published=True).order_by('-created_at', '-id').first()
+        if post is None:
+            raise CommandError('The database has no published posts; run seed_data first')
+        return [reverse('public-post-list'), reverse('public-post-detail', args=[post.pk])]
+
+    def report_acquire(self, pool_size: int):
+        """
+        接続の作成とプールからの取り出しの所要時間を出力
+
+        :param pool_size: プールの接続数の上限
+        """
+        timings = {}
+        for label, size in [('new connection', 0), ('pool checkout', pool_size)]:
+            with override_settings(DATABASE_POOL_SIZE=size):
+                connection.close()
+                connection.ensure_connection()
+                connection.close()
+                started = time.perf_counter()
+                for _ in range(ACQUIRE_ITERATIONS):
+                    connection.ensure_connection()
+                    connection.close()
+                timings[label] = (time.perf_counter() - started) / ACQUIRE_ITERATIONS * 1_000_000
+        self.stdout.write(
+            'Connection acquire + release: '
+            + ', '.join(f'{label} {micros:.0f} µs' for label, micros in timings.items())
+        )
+
+    def measure(self, server: str, paths: list[str], values: dict, options: dict) -> dict:
+        """
+        1つの接続の管理方法でリクエストを送って計測
+
+        :param server: ハンドラー（wsgi・asgi）
+        :param paths: パス
+        :param values: DATABASE_POOL_SIZEとCONN_MAX_AGEの値
+        :param options: キーワード引数
+        :return: 計測結果
+        """
+        connects = 0
+
+        def count_connect(**kwargs):
+            nonlocal connects
+            connects += 1
+
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = values['CONN_MAX_AGE']
+        with override_settings(DATABASE_POOL_SIZE=values['DATABASE_POOL_SIZE']):
+            connection_created.connect(count_connect)
+            try:
+                started = time.perf_counter()
+                if server == 'wsgi':
+                    samples = self.run_wsgi(paths, options)
+                else:
+                    samples = asyncio.run(self.run_asgi(paths, options))
+                elapsed = time.perf_counter() - started
+            finally:
+                connection_created.disconnect(count_connect)
+            stats = pool_stats().get(connection.alias)
+            close_pools()
+
+        latencies = [latency for latency, _ in samples]
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+        return {
+            'requests_per_second': len(samples) / elapsed,
+            'p50_ms': percentile(quantiles, 50),
+            'p95_ms': percentile(quantiles, 95),
+            # プールを使う場合、connection_createdは取り出しごとに送られるため、プールが作成した数を使う
+            'connects': stats['connects'] if stats else connects,
+            'waits': stats['waits'] if stats else 0,
+            'timeouts': stats['timeouts'] if stats else 0,
+            'errors': sum(status >= 400 for _, status in samples),
+        }
+
+    def run_wsgi(self, paths: list[str], options: dict) -> list[tuple[float, int]]:
+        """
+        WSGIハンドラーに `--clients` 個のスレッドからリクエストを送る
+
+        :param paths: パス
+        :param options: キーワード引数
+        :return: (レイテンシー（ミリ秒）, ステータスコード) のリスト
+        """
+        handler = WSGIHandler()
+        factory = RequestFactory()
+
+        def client(index: int) -> list[tuple[float, int]]:
+            samples = []
+            for number in range(options['requests']):
+                environ = factory.get(paths[(index + number) % len(paths)], HTTP_ACCEPT='application/json').environ
+                started = time.perf_counter()
+                statuses = []
+                response = handler(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+                b''.join(response)
+                response.close()
+                samples.append(((time.perf_counter() - started) * 1000, statuses[0]))
+            return samples
+
+        with ThreadPoolExecutor(max_workers=options['clients']) as executor:
+            results = executor.map(client, range(options['clients']))
+            return [sample for samples in results for sample in samples]
+
+    async def run_asgi(self, paths: list[str], options: dict) -> list[tuple[float, int]]:
+        """
+        ASGIアプリケーションに `--clients` 個の同時のクライアントからリクエストを送る
+
+        :param paths: パス
+        :param options: キーワード引数
+        :return: (レイテンシー（ミリ秒）, ステータスコード) のリスト
+        """
+        app = get_asgi_application()
+        samples = []
+
+        async def client(index: int):
+            for number in range(options['requests']):
+                started = time.perf_counter()
+                status, _ = await fetch(app, paths[(index + number) % len(paths)])
+                samples.append(((time.perf_counter() - started) * 1000, status))
+
+        await asyncio.gather(*(client(index) for index in range(options['clients'])))
+        return samples
@@ -0,0 +1,185 @@
+"""
+JSONレンダラー・パーサーのベンチマークコマンド
+
+投稿一覧のページなどAPIと同じ形のデータを、DRF標準のJSONRenderer・JSONParserと
+指定したレンダラー・パーサーで変換し、所要時間と結果の一致を比較する
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.dashboard.serializers import PostListSerializer
+from apps.core.models import Post, User
+
+from .seed_data import WORDS
+
+
+class Command(BaseCommand):
+    """
+    JSONレンダラー・パーサーのベンチマークを実行するコマンド
+
+    データベースを使わずにメモリ上のモデルから投稿一覧のページを組み立て、
+    レンダリング・解析の所要時間の中央値を標準の実装と比較する。
+    出力のバイト列・解析結果が標準の実装と一致しない場合は失敗する
+    """
+
+    help = 'Compare the configured JSON renderer/parser with the DRF defaults'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--items', type=int, default=1000, help='Number of items per payload')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per payload')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed runs per payload')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the payloads')
+        parser.add_argument(
+            '--renderer',
+            default='apps.core.renderers.FastJSONRenderer',
+            help='Dotted path of the renderer compared with rest_framework.renderers.JSONRenderer',
+        )
+        parser.add_argument(
+            '--parser',
+            default='apps.core.parsers.FastJSONParser',
+            help='Dotted path of the parser compared with rest_framework.parsers.JSONParser',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['items'] < 1 or options['iterations'] < 1:
+            raise CommandError('--items and --iterations must be at least 1')
+
+        rng = random.Random(options['seed'])
+        renderers = (JSONRenderer(), import_string(options['renderer'])())
+        parsers = (JSONParser(), import_string(options['parser'])())
+        mismatches = []
+
+        self.stdout.write(
+            f'{"payload":<16}{"bytes":>11}{"default ms":>12}{"candidate ms":>14}{"speedup":>9}  identical'
+        )
+        for name, data in self.build_payloads(rng, options['items']).items():
+            outputs = [renderer.render(data) for renderer in renderers]
+            timings = [
+                self.measure(lambda renderer=renderer: renderer.render(data), options) for renderer in renderers
+            ]
+            identical = outputs[0] == outputs[1]
+            self.write_row(f'render {name}', len(outputs[0]), timings, identical)
+            if not identical:
+                mismatches.append(f'render {name}')
+
+            results = [parser.parse(BytesIO(outputs[0])) for parser in parsers]
+            timings = [
+                self.measure(lambda parser=parser: parser.parse(BytesIO(outputs[0])), options) for parser in parsers
+            ]
+            identical = results[0] == results[1]
+            self.write_row(f'parse {name}', len(outputs[0]), timings, identical)
+            if not identical:
+                mismatches.append(f'parse {name}')
+
+        if mismatches:
+            raise CommandError(f'Output differs from the DRF defaults: {", ".join(mismatches)}')
+
+    def build_payloads(self, rng: random.Random, items: int) -> dict:
+        """
+        ベンチマークに使うデータを組み立てる
+
+        :param rng: 乱数生成器
+        :param items: 要素数
+        :return: 名前をキーとしたデータ
+        """
+        now = timezone.now()
+        users = [
+            User(
+                id=number,
+                email=f'load{number}@example.com',
+                username=f'load{number}',
+                bio=' '.join(rng.choices(WORDS, k=rng.randint(3, 12))),
+                date_joined=now - timedelta(days=rng.randint(0, 365)),
+            )
+            for number in range(1, 51)
+        ]
+        posts = []
+        for number in range(items, 0, -1):
+            created_at = now - timedelta(seconds=rng.randint(0, 365 * 86400), microseconds=rng.randint(0, 999999))
+            posts.append(
+                Post(
+                    id=number,
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(3, 8))),
+                    author=rng.choice(users),
+                    is_published=rng.random() < 0.8,
+                    comment_count=rng.randint(0, 50),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+        page = {
+            'count': items * 10,
+            'count_approximate': False,
+            'next': 'http://testserver/api/v0/dashboard/posts/?page=2',
+            'previous': None,
+            'results': PostListSerializer(posts, many=True).data,
+        }
+        # シリアライザーを通さない値（レンダラーのdefaultで変換する型）
+        values = [
+            {
+                'id': uuid.UUID(int=rng.getrandbits(128)),
+                'label': gettext_lazy('Published'),
+                'amount': Decimal(rng.randint(0, 10**6)) / 100,
+                'created_at': timezone.localtime(post.created_at),
+                'date': post.created_at.date(),
+                'elapsed': now - post.created_at,
+            }
+            for post in posts
+        ]
+        return {'post-page': page, 'raw-values': values}
+
+    def measure(self, func, options: dict) -> float:
+        """
+        関数の所要時間の中央値を計測
+
+        :param func: 計測する関数
+        :param options: キーワード引数
+        :return: 所要時間の中央値（ミリ秒）
+        """
+        for _ in range(options['warmup']):
+            func()
+        durations = []
+        for _ in range(options['iterations']):
+            started = time.perf_counter()
+            func()
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations)
+
+    def write_row(self, name: str, size: int, timings: list[float], identical: bool):
+        """
+        計測結果を1行表示
+
+        :param name: 計測対象の名前
+        :param size: JSONのバイト数
+        :param timings: (標準の実装, 比較対象) の所要時間の中央値（ミリ秒）
+        :param identical: 結果が一致したかどうか
+        """
+        default, candidate = timings
+        line = (
+            f'{name:<16}{size:>11}{default:>12.2f}{candidate:>14.2f}'
+            f'{default / max(candidate, 1e-9):>8.1f}x  {"yes" if identical else "NO"}'
+        )
+        self.stdout.write(line if identical else self.style.ERROR(line))
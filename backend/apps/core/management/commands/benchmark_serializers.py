@@ -0,0 +1,166 @@
+"""
+読み取り用シリアライザーのベンチマークコマンド
+
+dashboard・portalの一覧・詳細のシリアライザーを、FastReadSerializerMixinの処理と
+標準のSerializer.to_representationで実行し、スループットと出力の一致を比較する
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.dashboard.serializers import CommentSerializer, PostDetailSerializer, PostListSerializer
+from apps.api.portal.serializers import (
+    PublicCommentSerializer,
+    PublicPostDetailSerializer,
+    PublicPostListSerializer,
+)
+from apps.core.models import Comment, Post, User
+from apps.core.serializers import parse_field_paths
+
+from .seed_data import WORDS
+
+# 詳細のシナリオで投稿に埋め込むコメントの件数
+DETAIL_COMMENTS = 20
+
+
+class Command(BaseCommand):
+    """
+    読み取り用シリアライザーのベンチマークを実行するコマンド
+
+    データベースを使わずにメモリ上のモデルを組み立て、シナリオごとに
+    シリアライズの所要時間の中央値と1秒あたりの行数を計測する。
+    出力のJSONが標準のシリアライザーと一致しない場合は失敗する
+    """
+
+    help = 'Compare the fast-path read serializers with the DRF to_representation'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--items', type=int, default=1000, help='Number of rows per scenario')
+        parser.add_argument('--iterations', type=int, default=30, help='Timed runs per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed runs per scenario')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the rows')
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['items'] < 1 or options['iterations'] < 1:
+            raise CommandError('--items and --iterations must be at least 1')
+
+        posts, comments = self.build_rows(random.Random(options['seed']), options['items'])
+        details = posts[: max(1, options['items'] // DETAIL_COMMENTS)]
+        list_fields = {'fields': parse_field_paths('id,title,author.username,created_at')}
+        expand_post = {'expand': parse_field_paths('post')}
+        scenarios = {
+            'post-list': (len(posts), lambda: PostListSerializer(posts, many=True).data),
+            'post-list-fields': (len(posts), lambda: PostListSerializer(posts, many=True, context=list_fields).data),
+            'post-detail': (len(details), lambda: [PostDetailSerializer(post).data for post in details]),
+            'comment-list': (len(comments), lambda: CommentSerializer(comments, many=True, context=expand_post).data),
+            'public-post-list': (len(posts), lambda: PublicPostListSerializer(posts, many=True).data),
+            'public-post-detail': (len(details), lambda: [PublicPostDetailSerializer(post).data for post in details]),
+            'public-comment-list': (len(comments), lambda: PublicCommentSerializer(comments, many=True).data),
+        }
+
+        renderer = JSONRenderer()
+        mismatches = []
+        self.stdout.write(
+            f'{"scenario":<22}{"rows":>7}{"default ms":>12}{"fast ms":>10}{"rows/s":>11}{"speedup":>9}  identical'
+        )
+        for name, (rows, serialize) in scenarios.items():
+            with override_settings(FAST_READ_SERIALIZERS=False):
+                expected = renderer.render(serialize())
+                default = self.measure(serialize, options)
+            identical = renderer.render(serialize()) == expected
+            fast = self.measure(serialize, options)
+            line = (
+                f'{name:<22}{rows:>7}{default:>12.2f}{fast:>10.2f}{rows / fast * 1000:>11,.0f}'
+                f'{default / max(fast, 1e-9):>8.1f}x  {"yes" if identical else "NO"}'
+            )
+            self.stdout.write(line if identical else self.style.ERROR(line))
+            if not identical:
+                mismatches.append(name)
+
+        if mismatches:
+            raise CommandError(f'Output differs from the DRF serializers: {", ".join(mismatches)}')
+
+    def build_rows(self, rng: random.Random, items: int) -> tuple[list[Post], list[Comment]]:
+        """
+        ベンチマークに使う投稿とコメントをメモリ上に組み立てる
+
+        投稿にはselect_relatedと同じく作者を、詳細と同じく先頭のコメントを設定する
+
+        :param rng: 乱数生成器
+        :param items: 投稿・コメントの件数
+        :return: (投稿のリスト, コメントのリスト)
+        """
+        now = timezone.now()
+        users = [
+            User(
+                id=number,
+                email=f'load{number}@example.com',
+                username=f'load{number}',
+                bio=' '.join(rng.choices(WORDS, k=rng.randint(3, 12))),
+                date_joined=now - timedelta(days=rng.randint(0, 365)),
+            )
+            for number in range(1, 51)
+        ]
+        posts = []
+        for number in range(items, 0, -1):
+            created_at = now - timedelta(seconds=rng.randint(0, 365 * 86400), microseconds=rng.randint(0, 999999))
+            posts.append(
+                Post(
+                    id=number,
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(3, 8))),
+                    content=' '.join(rng.choices(WORDS, k=rng.randint(20, 80))),
+                    author=rng.choice(users),
+                    is_published=rng.random() < 0.8,
+                    comment_count=DETAIL_COMMENTS,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(hours=rng.randint(0, 48)),
+                )
+            )
+        comments = [
+            Comment(
+                id=number,
+                post=posts[number % len(posts)],
+                author=rng.choice(users),
+                content=' '.join(rng.choices(WORDS, k=rng.randint(4, 40))),
+                created_at=now - timedelta(seconds=rng.randint(0, 86400)),
+            )
+            for number in range(1, items + 1)
+        ]
+        for post in posts:
+            post.embedded_comments = rng.sample(comments, min(DETAIL_COMMENTS, len(comments)))
+            post.comments_next = None if rng.random() < 0.5 else f'http://testserver/api/v0/posts/{post.pk}/comments/'
+        return posts, comments
+
+    def measure(self, func, options: dict) -> float:
+        """
+        関数の所要時間の中央値を計測
+
+        :param func: 計測する関数
+        :param options: キーワード引数
+        :return: 所要時間の中央値（ミリ秒）
+        """
+        for _ in range(options['warmup']):
+            func()
+        durations = []
+        for _ in range(options['iterations']):
+            started = time.perf_counter()
+            func()
+            durations.append((time.perf_counter() - started) * 1000)
+        return statistics.median(durations)
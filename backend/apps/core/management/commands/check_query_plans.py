@@ -0,0 +1,171 @@
+"""
+クエリプラン検査コマンド
+
+APIの各ViewSetが発行するクエリのEXPLAIN QUERY PLANを検査する
+"""
+import re
+from datetime import datetime, timezone
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Prefetch, QuerySet
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.conditional import POST_LIST_MODELS, last_writes_querysets
+from apps.core.mixins import EmbeddedCommentsMixin
+from apps.core.models import Tombstone
+from apps.core.pagination import keyset_filter
+from apps.core.search import has_search_index, missing_search_triggers
+from apps.core.sync import SyncPagination, sync_filter
+
+URLCONFS = ['apps.api.dashboard.urls', 'apps.api.portal.urls']
+
+# インデックスを使わないテーブル全体の走査
+FULL_SCAN = re.compile(r'\bSCAN (\w+)$')
+# ORDER BY・GROUP BYのための一時B-tree
+TEMP_BTREE = re.compile(r'USE TEMP B-TREE')
+
+
+class Command(BaseCommand):
+    """
+    クエリプランを検査するコマンド
+
+    dashboard・portalの各ViewSetのlist・retrieve・syncのQuerySet（カーソル方式の絞り込みと
+    prefetchのクエリを含む）をSQLiteでEXPLAINし、
+    全件走査または一時B-treeによるソートが含まれる場合は失敗する。
+    全文検索の同期用トリガーが欠けている場合も失敗する
+    """
+
+    help = 'EXPLAIN every API viewset queryset and fail on full table scans, temp B-tree sorts or missing search triggers'
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_query_plans supports the SQLite backend only')
+
+        failures = []
+        if has_search_index():
+            for name in missing_search_triggers():
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'NG missing trigger {name} (run rebuild_search_index)'))
+
+        for label, queryset in self.iter_querysets():
+            plan = queryset.explain()
+            problems = [
+                line
+                for line in plan.splitlines()
+                if FULL_SCAN.search(line) or TEMP_BTREE.search(line)
+            ]
+            if problems:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f'NG {label}'))
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+            else:
+                self.stdout.write(f'OK {label}')
+
+        if failures:
+            raise CommandError(f'{len(failures)} checks failed (full scans, temp B-tree sorts or missing search triggers)')
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
+
+    def iter_querysets(self):
+        """
+        検査対象のQuerySetを列挙
+
+        :return: (ラベル, QuerySet) のイテレーター
+        """
+        factory = APIRequestFactory()
+        cursor_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+        for queryset in last_writes_querysets(POST_LIST_MODELS):
+            yield f'post list validator ({queryset.model._meta.db_table})', queryset
+
+        for urlconf in URLCONFS:
+            router = import_module(urlconf).router
+            for prefix, viewset, basename in router.registry:
+                if not issubclass(viewset, GenericAPIView):
+                    continue
+                # QuerySetを持たないViewSet（全文検索など）は対象外
+                if viewset.queryset is None and viewset.get_queryset is GenericAPIView.get_queryset:
+                    continue
+                for action in ('list', 'retrieve'):
+                    if not hasattr(viewset, action):
+                        continue
+                    view = viewset(action=action, kwargs={}, format_kwarg=None)
+                    view.request = Request(factory.get('/'))
+                    queryset = view.filter_queryset(view.get_queryset())
+                    label = f'{urlconf}:{basename}-{action}'
+
+                    if action == 'list':
+                        page_size = view.paginator.page_size if view.paginator else 100
+                        yield label, queryset[:page_size]
+                        for reverse in (False, True):
+                            direction = 'previous' if reverse else 'next'
+                            keyset = keyset_filter(queryset, cursor_at, 1, reverse=reverse)
+                            yield f'{label} (cursor {direction})', keyset[:page_size]
+                    else:
+                        # get_objectが使うQuerySet.get()と同様に並び順を外す
+                        yield label, queryset.filter(pk=1).order_by()
+                        yield from self.iter_prefetches(label, queryset)
+                        if isinstance(view, EmbeddedCommentsMixin):
+                            yield from self.iter_comment_querysets(label, view, cursor_at)
+                if hasattr(viewset, 'sync'):
+                    yield from self.iter_sync_querysets(f'{urlconf}:{basename}-sync', viewset, factory, cursor_at)
+
+    def iter_prefetches(self, label: str, queryset: QuerySet):
+        """
+        prefetch_relatedで発行されるクエリを列挙
+
+        :param label: 親QuerySetのラベル
+        :param queryset: 親QuerySet
+        :return: (ラベル, QuerySet) のイテレーター
+        """
+        for lookup in queryset._prefetch_related_lookups:
+            if not isinstance(lookup, Prefetch) or lookup.queryset is None:
+                continue
+            relation = queryset.model._meta.get_field(lookup.prefetch_through)
+            yield (
+                f'{label} (prefetch {lookup.prefetch_through})',
+                lookup.queryset.filter(**{f'{relation.field.name}__in': [1]}),
+            )
+
+    def iter_comment_querysets(self, label: str, view: EmbeddedCommentsMixin, cursor_at: datetime):
+        """
+        投稿詳細に埋め込むコメントと、投稿ごとのコメント一覧のクエリを列挙
+
+        :param label: 投稿詳細のラベル
+        :param view: 投稿のViewSet
+        :param cursor_at: カーソルの基準日時
+        :return: (ラベル, QuerySet) のイテレーター
+        """
+        yield f'{label} (embedded comments)', view.get_embedded_comments_queryset(1)
+        comments = view.get_comment_queryset('').filter(post_id=1)
+        yield f'{label} (comments)', comments.order_by('-created_at', '-id')[:100]
+        yield f'{label} (comments cursor next)', keyset_filter(comments, cursor_at, 1)[:100]
+
+    def iter_sync_querysets(self, label: str, viewset, factory: APIRequestFactory, cursor_at: datetime):
+        """
+        差分同期で発行されるクエリを列挙
+
+        :param label: 差分同期のラベル
+        :param viewset: 差分同期を提供するViewSet
+        :param factory: リクエストファクトリー
+        :param cursor_at: 同期トークンの基準日時
+        :return: (ラベル, QuerySet) のイテレーター
+        """
+        view = viewset(action='sync', kwargs={}, format_kwarg=None)
+        view.request = Request(factory.get('/'))
+        queryset = view.get_queryset()
+        page_size = SyncPagination.page_size
+        yield label, queryset.order_by('updated_at', 'id')[:page_size]
+        yield f'{label} (sync token)', sync_filter(queryset, cursor_at, 1)[:page_size]
+        tombstones = Tombstone.objects.filter(model=queryset.model._meta.label_lower, deleted_at__lte=cursor_at)
+        yield f'{label} (tombstones)', sync_filter(tombstones, cursor_at, 1, field='deleted_at')[:page_size]
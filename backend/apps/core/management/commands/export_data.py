@@ -0,0 +1,56 @@
+"""
+データエクスポートコマンド
+
+投稿・コメントの全件をNDJSONまたはCSVで出力する
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.export import EXPORTS, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    """
+    投稿・コメントをエクスポートするコマンド
+
+    行を逐次読み出して書き出すため、テーブルの大きさによらずメモリ使用量は一定
+    """
+
+    help = 'Stream every post or comment as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('target', choices=list(EXPORTS), help='What to export')
+        parser.add_argument(
+            '--format',
+            dest='output',
+            choices=list(FORMATS),
+            default='ndjson',
+            help='Output format',
+        )
+        parser.add_argument(
+            '--output',
+            dest='path',
+            help='File to write to (default: stdout)',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        chunks = stream_export(options['target'], options['output'])
+        if not options['path']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['path'], 'w', encoding='utf-8', newline='') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f'Exported {options["target"]} to {options["path"]}'))
@@ -0,0 +1,41 @@
+"""
+失効トークン整理コマンド
+
+失効したリフレッシュトークンの記録（RevokedToken）のうち有効期限を過ぎたものを削除する
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.tokens import purge_revoked_tokens
+
+
+class Command(BaseCommand):
+    """
+    有効期限を過ぎた失効トークンの記録を削除するコマンド
+
+    有効期限を過ぎたトークンは署名の検証で拒否されるため、削除した記録が参照されることはない。
+    ロックを長く保持しないよう、記録をバッチごとに削除する
+    """
+
+    help = 'Delete revoked refresh-token records whose tokens have expired'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per statement')
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        deleted = purge_revoked_tokens(timezone.now(), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} revoked tokens'))
@@ -0,0 +1,50 @@
+"""
+削除記録整理コマンド
+
+差分同期の削除記録（Tombstone）のうち保存期間を過ぎたものを削除する
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    """
+    保存期間を過ぎた削除記録を削除するコマンド
+
+    保存期間より古い同期トークンは410で拒否されるため、削除した記録が参照されることはない
+    """
+
+    help = 'Delete delta-sync tombstones older than the retention period'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+            help='Keep tombstones newer than this many days (defaults to SYNC_TOMBSTONE_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['days'] < settings.SYNC_TOMBSTONE_RETENTION_DAYS:
+            raise CommandError('--days must not be shorter than SYNC_TOMBSTONE_RETENTION_DAYS')
+
+        with transaction.atomic():
+            deleted = purge_tombstones(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones'))
@@ -0,0 +1,51 @@
+"""
+検索インデックス再構築コマンド
+
+全文検索インデックスを投稿・コメントから作り直す
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.search import ensure_search_triggers, rebuild_search_index, uses_fts
+
+
+class Command(BaseCommand):
+    """
+    検索インデックスを再構築するコマンド
+
+    通常はトリガーで同期されるため、DBの復元後などインデックスがずれた場合に使う。
+    同期用トリガーが失われている場合は作り直してから再構築する
+    """
+
+    help = 'Rebuild the full-text search index from posts and comments'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows to index per statement',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if not uses_fts():
+            raise CommandError('rebuild_search_index supports the SQLite backend only')
+
+        # 再構築中の検索が空の結果を返さないよう、1トランザクションで入れ替える
+        with transaction.atomic():
+            created = ensure_search_triggers()
+            total = rebuild_search_index(options['batch_size'])
+        for name in created:
+            self.stdout.write(self.style.WARNING(f'Recreated missing trigger {name}'))
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} rows'))
@@ -0,0 +1,92 @@
+"""
+コメント数整合コマンド
+
+Post.comment_countを実際のコメント数と突き合わせて修正する
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.core.cache import bump_tags
+from apps.core.models import Comment, Post
+from apps.core.pagination import count_cache_tag
+
+
+class Command(BaseCommand):
+    """
+    コメント数を整合させるコマンド
+
+    投稿をID順にバッチ単位で走査し、ずれているcomment_countのみを更新する。
+    コメント数の増減と同様に投稿の更新日時は変えず、修正した投稿のキャッシュを無効化する
+    """
+
+    help = 'Reconcile denormalized Post.comment_count with actual comment rows'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts to check per transaction',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted counters without updating them',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        checked = 0
+        fixed = 0
+        last_id = 0
+
+        while True:
+            with transaction.atomic():
+                # 更新中のカウンターと競合しないよう、バッチ内の投稿行をロックする
+                posts = list(
+                    Post.objects.select_for_update()
+                    .filter(id__gt=last_id)
+                    .order_by('id')
+                    .only('id', 'comment_count')[:batch_size]
+                )
+                if not posts:
+                    break
+                last_id = posts[-1].id
+
+                actual = dict(
+                    Comment.objects.filter(post_id__in=[post.id for post in posts])
+                    .order_by()
+                    .values('post_id')
+                    .annotate(count=Count('id'))
+                    .values_list('post_id', 'count')
+                )
+                drifted = []
+                for post in posts:
+                    count = actual.get(post.id, 0)
+                    if post.comment_count != count:
+                        post.comment_count = count
+                        drifted.append(post)
+
+                if drifted and not dry_run:
+                    Post.objects.bulk_update(drifted, ['comment_count'])
+                    bump_tags(count_cache_tag(Post), *[f'post:{post.id}' for post in drifted])
+
+            checked += len(posts)
+            fixed += len(drifted)
+            self.stdout.write(f'Checked {checked} posts, {fixed} drifted')
+
+        action = 'found' if dry_run else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'Reconciliation completed: {fixed} counters {action}'))
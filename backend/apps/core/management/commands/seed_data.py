@@ -1,21 +1,93 @@
 """
 テストデータ生成コマンド
 
-開発用のサンプルデータを生成する
+開発用のサンプルデータ、または負荷試験用の大量の合成データを生成する
 """
-from django.core.management.base import BaseCommand
+import itertools
+import math
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.cache import bump_tags
 from apps.core.models import Comment, Post, User
+from apps.core.pagination import count_cache_tag
+
+# 合成データの本文に使う語彙
+WORDS = [
+    '東京', '大阪', '天気', '予報', 'ニュース', '技術', '開発', 'リリース', '性能', '改善',
+    'データベース', 'インデックス', 'キャッシュ', '検索', 'API', 'Django', 'React', 'Python',
+    'TypeScript', 'テスト', 'レビュー', 'デプロイ', 'サーバー', 'ログ', '監視', '障害', '対応',
+    'ユーザー', '管理', '画面', '設計', '実装', '運用', '計測', '負荷', '試験', '結果', '報告',
+    'performance', 'query', 'index', 'cache', 'release', 'update', 'review', 'design',
+]
+# 作者・コメント数の偏りの強さ（Zipf分布の指数・Pareto分布の形状）
+AUTHOR_SKEW = 1.1
+COMMENT_PARETO_ALPHA = 1.5
+MAX_COMMENTS_PER_POST = 10000
+# 合成ユーザーのパスワード（ハッシュ化は1回だけ行う）
+LOAD_USER_PASSWORD = 'user123'
+
+
+@contextmanager
+def _without_auto_now(*fields):
+    """
+    auto_now・auto_now_addを一時的に無効にし、日時を指定して保存できるようにする
+
+    :param fields: 対象のDateTimeField
+    """
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
 
 
 class Command(BaseCommand):
     """
     テストデータを生成するコマンド
 
-    User、Post、Commentのサンプルデータを作成する
+    引数なしではUser、Post、Commentのサンプルデータを作成する。
+    `--users`・`--posts` を指定すると、負荷試験用の合成データをbulk_createで
+    バッチごとのトランザクションに分けて生成する
     """
 
-    help = 'Generate sample data for development'
+    help = 'Generate sample data for development, or synthetic data at scale for load testing'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--users', type=int, default=0, help='Number of synthetic users to create')
+        parser.add_argument('--posts', type=int, default=0, help='Number of synthetic posts to create')
+        parser.add_argument(
+            '--comments-per-post',
+            type=float,
+            default=3.0,
+            help='Average comments per published post (heavy-tailed distribution)',
+        )
+        parser.add_argument(
+            '--published-ratio',
+            type=float,
+            default=0.8,
+            help='Fraction of synthetic posts that are published',
+        )
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many days')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for reproducible datasets')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk_create / transaction')
 
     def handle(self, *args, **options):
         """
@@ -24,6 +96,15 @@ class Command(BaseCommand):
         :param args: 位置引数
         :param options: キーワード引数
         """
+        if options['users'] or options['posts']:
+            self.generate(options)
+        else:
+            self.create_samples()
+
+    def create_samples(self):
+        """
+        少量のサンプルデータを作成
+        """
         self.stdout.write('Creating sample data...')
 
         # Create users
@@ -117,3 +198,179 @@ class Command(BaseCommand):
                 )
 
         self.stdout.write(self.style.SUCCESS('Sample data creation completed!'))
+
+    def generate(self, options: dict):
+        """
+        負荷試験用の合成データを生成
+
+        :param options: キーワード引数
+        """
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=options['days'])
+        self.started = time.perf_counter()
+        self.rows = 0
+
+        if options['users']:
+            self.generate_users(options['users'], batch_size)
+
+        if options['posts']:
+            user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+            if not user_ids:
+                raise CommandError('No users to author posts; pass --users as well')
+            self.generate_posts(options, user_ids, batch_size)
+
+        # bulk_createはシグナルを送らないため、件数・レスポンスキャッシュをまとめて無効化する
+        bump_tags(count_cache_tag(Post), count_cache_tag(Comment), 'posts')
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Created {self.rows} rows in {elapsed:.1f}s ({self.rows / max(elapsed, 1e-9):,.0f} rows/s)'
+            )
+        )
+
+    def report(self, label: str, done: int, total: int):
+        """
+        進捗と生成速度を表示
+
+        :param label: 対象の名前
+        :param done: 生成済みの件数
+        :param total: 生成する件数
+        """
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f'{label}: {done}/{total} ({self.rows} rows, {self.rows / max(elapsed, 1e-9):,.0f} rows/s)'
+        )
+
+    def generate_users(self, count: int, batch_size: int):
+        """
+        合成ユーザーを作成
+
+        :param count: 作成する件数
+        :param batch_size: 1回のbulk_createで作成する件数
+        """
+        base = User.objects.aggregate(last=Max('id'))['last'] or 0
+        password = make_password(LOAD_USER_PASSWORD)
+        for offset in range(0, count, batch_size):
+            users = []
+            for number in range(base + offset + 1, base + min(offset + batch_size, count) + 1):
+                users.append(
+                    User(
+                        email=f'load{number}@example.com',
+                        username=f'load{number}',
+                        password=password,
+                        bio=self.sentence(3, 12),
+                        date_joined=self.random_datetime(),
+                    )
+                )
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            self.rows += len(users)
+            self.report('users', offset + len(users), count)
+
+    def generate_posts(self, options: dict, user_ids: list[int], batch_size: int):
+        """
+        合成投稿とそのコメントを作成
+
+        投稿は古い順に作成し、IDの順序と作成日時の順序を一致させる。
+        作成日時は直近ほど密になるよう分布させ、作者とコメント数には偏りを持たせる
+
+        :param options: キーワード引数
+        :param user_ids: 作者・コメント投稿者の候補
+        :param batch_size: 1回のbulk_createで作成する件数
+        """
+        total = options['posts']
+        span = (self.now - self.start).total_seconds()
+        # Zipf分布の累積重み（IDの小さいユーザーほど多く書き込む）
+        cum_weights = list(itertools.accumulate(1 / (rank**AUTHOR_SKEW) for rank in range(1, len(user_ids) + 1)))
+        # Pareto分布の平均 alpha / (alpha - 1) * scale が指定の平均になるよう調整する
+        scale = options['comments_per_post'] * (COMMENT_PARETO_ALPHA - 1) / COMMENT_PARETO_ALPHA
+        post_fields = (Post._meta.get_field('created_at'), Post._meta.get_field('updated_at'))
+        comment_fields = (Comment._meta.get_field('created_at'), Comment._meta.get_field('updated_at'))
+
+        for offset in range(0, total, batch_size):
+            size = min(batch_size, total - offset)
+            authors = self.rng.choices(user_ids, cum_weights=cum_weights, k=size)
+            posts = []
+            for index, author_id in enumerate(authors):
+                # 密度が時間に比例して増える分布の逆関数（直近ほど投稿が多い）
+                position = math.sqrt((offset + index + self.rng.random()) / total)
+                created_at = self.start + timedelta(seconds=span * position)
+                is_published = self.rng.random() < options['published_ratio']
+                comment_count = 0
+                if is_published and scale > 0:
+                    comment_count = min(
+                        int(self.rng.paretovariate(COMMENT_PARETO_ALPHA) * scale), MAX_COMMENTS_PER_POST
+                    )
+                updated_at = created_at
+                if self.rng.random() < 0.2:
+                    updated_at = self.random_datetime(created_at)
+                posts.append(
+                    Post(
+                        title=self.sentence(3, 8),
+                        content=self.paragraph(),
+                        author_id=author_id,
+                        is_published=is_published,
+                        comment_count=comment_count,
+                        created_at=created_at,
+                        updated_at=updated_at,
+                    )
+                )
+
+            with transaction.atomic():
+                with _without_auto_now(*post_fields):
+                    posts = Post.objects.bulk_create(posts)
+                comments = []
+                for post in posts:
+                    commenters = self.rng.choices(user_ids, cum_weights=cum_weights, k=post.comment_count)
+                    for author_id in commenters:
+                        created_at = self.random_datetime(post.created_at)
+                        comments.append(
+                            Comment(
+                                post_id=post.pk,
+                                author_id=author_id,
+                                content=self.sentence(4, 40),
+                                created_at=created_at,
+                                updated_at=created_at,
+                            )
+                        )
+                with _without_auto_now(*comment_fields):
+                    Comment.objects.bulk_create(comments, batch_size=batch_size)
+            self.rows += len(posts) + len(comments)
+            self.report('posts', offset + size, total)
+
+    def random_datetime(self, after: datetime | None = None) -> datetime:
+        """
+        指定日時（省略時は期間の開始）から現在までの日時を返す
+
+        直後ほど起こりやすい分布にする
+
+        :param after: 起点の日時
+        :return: 日時
+        """
+        after = after or self.start
+        span = (self.now - after).total_seconds()
+        return after + timedelta(seconds=span * self.rng.random() ** 3)
+
+    def sentence(self, minimum: int, maximum: int) -> str:
+        """
+        語彙から文を生成
+
+        :param minimum: 最小語数
+        :param maximum: 最大語数
+        :return: 文
+        """
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(minimum, maximum)))
+
+    def paragraph(self) -> str:
+        """
+        対数正規分布に従う長さの本文を生成
+
+        :return: 本文
+        """
+        sentences = max(1, int(self.rng.lognormvariate(1.5, 0.8)))
+        return '\n'.join(self.sentence(5, 20) + '。' for _ in range(sentences))
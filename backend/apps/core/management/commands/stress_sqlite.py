@@ -0,0 +1,280 @@
+"""
+SQLite同時読み書きストレステストコマンド
+
+合成データを投入したファイルのSQLiteデータベースに対して、dashboardの投稿・コメントの作成と
+portalの一覧・詳細の取得を同時に実行し、SQLiteの既定の設定と `SQLITE_*` の設定での
+スループットと `database is locked` の発生率を比較する
+"""
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import got_request_exception
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.backends.sqlite3.base import is_busy_error
+from apps.core.models import Post, User
+from apps.core.pool import close_pools
+
+from .benchmark_api import percentile
+
+# SQLiteとDjangoの既定値（ロールバックジャーナル・DEFERREDのトランザクション・再実行なし）
+STOCK_PROFILE = {
+    'SQLITE_PRAGMAS': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'mmap_size': 0, 'cache_size': -2000},
+    'SQLITE_IMMEDIATE_TRANSACTIONS': False,
+    'SQLITE_BUSY_RETRIES': 0,
+}
+
+
+class Command(BaseCommand):
+    """
+    同時の読み書きでSQLiteの設定を比較するコマンド
+
+    テスト用データベースを一時ファイルに作成してseed_dataで合成データを投入し、
+    `--writers` 個のスレッドが投稿とコメントを交互に作成（POST /dashboard/posts/・/dashboard/comments/）、
+    `--readers` 個のスレッドが公開投稿の一覧と詳細を交互に取得しながら `--duration` 秒間WSGIハンドラーに送る。
+    stock（SQLiteとDjangoの既定値）、configured（settingsの `SQLITE_*`）の順に実行し、
+    読み書きそれぞれのスループット・レイテンシー、ロックによるエラーの件数と割合を出力する。
+    レスポンスキャッシュは無効にし、読み取りも毎回データベースから行う。
+
+    stockのロックの待ち時間はPythonのsqlite3の既定値（5秒）のため、短い計測ではエラーになりにくい。
+    `--busy-timeout` で両方の待ち時間を短くすると、ロックの競合の差を再現できる
+    """
+
+    help = 'Stress concurrent dashboard writes and portal reads with stock and configured SQLite settings'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument('--users', type=int, default=50, help='Number of synthetic users to seed')
+        parser.add_argument('--posts', type=int, default=2000, help='Number of synthetic posts to seed')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic dataset')
+        parser.add_argument('--readers', type=int, default=8, help='Number of reading threads')
+        parser.add_argument('--writers', type=int, default=4, help='Number of writing threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run each profile')
+        parser.add_argument(
+            '--busy-timeout',
+            type=int,
+            help='Override PRAGMA busy_timeout (milliseconds) in both profiles to provoke lock contention',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        if options['readers'] < 0 or options['writers'] < 0 or options['readers'] + options['writers'] < 1:
+            raise CommandError('--readers and --writers must not be negative, and at least one thread is required')
+        if connection.vendor != 'sqlite':
+            raise CommandError('stress_sqlite supports SQLite databases only')
+
+        directory = tempfile.TemporaryDirectory()
+        test_settings = connection.settings_dict['TEST']
+        old_name = test_settings['NAME']
+        test_settings['NAME'] = os.path.join(directory.name, 'stress.sqlite3')
+        request_logger = logging.getLogger('django.request')
+        setup_test_environment()
+        old_config = None
+        try:
+            old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+            self.seed(options)
+            fixtures = self.load_fixtures()
+            self.stdout.write(
+                f'{"profile":<12}{"reads/s":>9}{"writes/s":>10}{"read p95":>10}{"write p95":>11}'
+                f'{"locked":>8}{"locked %":>10}{"errors":>8}'
+            )
+            # ロックのエラーは件数で報告するため、リクエストごとのトレースバックは出力しない
+            request_logger.disabled = True
+            failed = False
+            for profile, overrides in self.get_profiles(options['busy_timeout']):
+                with override_settings(RESPONSE_CACHE_TIMEOUT=0, **overrides):
+                    # PRAGMAは接続の作成時に実行するため、既存の接続を閉じて作り直す
+                    close_pools()
+                    connection.close()
+                    # journal_modeの変更は他の接続がない状態で行う
+                    connection.ensure_connection()
+                    connection.close()
+                    result = self.run(fixtures, options)
+                    close_pools()
+                    connection.close()
+                # 既定値での失敗は比較の対象のため、settingsの設定での失敗のみをエラーにする
+                failed = failed or (profile == 'configured' and result['errors'] > 0)
+                line = (
+                    f'{profile:<12}{result["reads_per_second"]:>9.1f}{result["writes_per_second"]:>10.1f}'
+                    f'{result["read_p95_ms"]:>10.1f}{result["write_p95_ms"]:>11.1f}{result["locked"]:>8}'
+                    f'{result["locked_percent"]:>10.2f}{result["errors"]:>8}'
+                )
+                self.stdout.write(self.style.ERROR(line) if result['locked'] or result['errors'] else line)
+        finally:
+            request_logger.disabled = False
+            close_pools()
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            test_settings['NAME'] = old_name
+            directory.cleanup()
+
+        if failed:
+            raise CommandError('Requests failed with the configured settings for reasons other than database locks')
+
+    def get_profiles(self, busy_timeout: int | None) -> list[tuple[str, dict]]:
+        """
+        比較する設定を返す
+
+        :param busy_timeout: 両方の設定で使うbusy_timeout（ミリ秒、Noneはそれぞれの値）
+        :return: (名前, 上書きする設定) のリスト
+        """
+        profiles = [('stock', dict(STOCK_PROFILE)), ('configured', {'SQLITE_PRAGMAS': dict(settings.SQLITE_PRAGMAS)})]
+        if busy_timeout is not None:
+            for _, overrides in profiles:
+                overrides['SQLITE_PRAGMAS'] = {**overrides['SQLITE_PRAGMAS'], 'busy_timeout': busy_timeout}
+        return profiles
+
+    def seed(self, options: dict):
+        """
+        テスト用データベースに合成データを投入
+
+        :param options: キーワード引数
+        """
+        self.stdout.write(f'Seeding {options["users"]} users and {options["posts"]} posts...')
+        started = time.perf_counter()
+        call_command('seed_data', users=options['users'], posts=options['posts'], seed=options['seed'], stdout=StringIO())
+        self.stdout.write(f'Seeded in {time.perf_counter() - started:.1f}s')
+
+    def load_fixtures(self) -> dict:
+        """
+        リクエストに使うトークン・投稿を選ぶ
+
+        :return: フィクスチャ
+        :raises CommandError: データがない場合
+        """
+        user = User.objects.order_by('id').first()
+        post_ids = list(Post.objects.filter(is_published=True).order_by('-id').values_list('id', flat=True)[:100])
+        if user is None or not post_ids:
+            raise CommandError('The database has no users or published posts; run seed_data first')
+        return {'token': str(AccessToken.for_user(user)), 'post_ids': post_ids}
+
+    def run(self, fixtures: dict, options: dict) -> dict:
+        """
+        読み取りと書き込みのスレッドを `--duration` 秒間動かして計測
+
+        :param fixtures: フィクスチャ
+        :param options: キーワード引数
+        :return: 計測結果
+        """
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        auth = f'Bearer {fixtures["token"]}'
+        post_ids = fixtures['post_ids']
+        posts_url = reverse('public-post-list')
+        locked = 0
+        lock = threading.Lock()
+
+        def count_locked(sender, request=None, **kwargs):
+            nonlocal locked
+            # 例外の処理中に送られるため、処理中の例外を参照する
+            exc = sys.exc_info()[1]
+            if exc is not None and is_busy_error(exc.__cause__ or exc):
+                with lock:
+                    locked += 1
+
+        def send(environ) -> int:
+            statuses = []
+            response = handler(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+            b''.join(response)
+            response.close()
+            return statuses[0]
+
+        def reader(index: int, deadline: float) -> list[tuple[float, int]]:
+            samples = []
+            number = 0
+            while time.perf_counter() < deadline:
+                if number % 2:
+                    path = reverse('public-post-detail', args=[post_ids[(index + number) % len(post_ids)]])
+                else:
+                    path = posts_url
+                started = time.perf_counter()
+                status = send(factory.get(path, HTTP_ACCEPT='application/json').environ)
+                samples.append(((time.perf_counter() - started) * 1000, status))
+                number += 1
+            return samples
+
+        def writer(index: int, deadline: float) -> list[tuple[float, int]]:
+            samples = []
+            number = 0
+            while time.perf_counter() < deadline:
+                if number % 2:
+                    path = reverse('comment-list')
+                    body = {'post': post_ids[(index + number) % len(post_ids)], 'content': 'Stress comment.'}
+                else:
+                    path = reverse('post-list')
+                    body = {'title': f'Stress {index}-{number}', 'content': 'Stress post.', 'is_published': True}
+                environ = factory.post(
+                    path, json.dumps(body), content_type='application/json', HTTP_AUTHORIZATION=auth
+                ).environ
+                started = time.perf_counter()
+                status = send(environ)
+                samples.append(((time.perf_counter() - started) * 1000, status))
+                number += 1
+            return samples
+
+        got_request_exception.connect(count_locked)
+        try:
+            deadline = time.perf_counter() + options['duration']
+            with ThreadPoolExecutor(max_workers=options['readers'] + options['writers']) as executor:
+                reads = [executor.submit(reader, index, deadline) for index in range(options['readers'])]
+                writes = [executor.submit(writer, index, deadline) for index in range(options['writers'])]
+                read_samples = [sample for future in reads for sample in future.result()]
+                write_samples = [sample for future in writes for sample in future.result()]
+        finally:
+            got_request_exception.disconnect(count_locked)
+
+        total = len(read_samples) + len(write_samples)
+        failures = sum(status >= 400 for _, status in read_samples + write_samples)
+        return {
+            'reads_per_second': len(read_samples) / options['duration'],
+            'writes_per_second': len(write_samples) / options['duration'],
+            'read_p95_ms': self.p95(read_samples),
+            'write_p95_ms': self.p95(write_samples),
+            'locked': locked,
+            'locked_percent': locked / total * 100 if total else 0.0,
+            'errors': failures - locked,
+        }
+
+    def p95(self, samples: list[tuple[float, int]]) -> float:
+        """
+        レイテンシーの95パーセンタイルを返す
+
+        :param samples: (レイテンシー（ミリ秒）, ステータスコード) のリスト
+        :return: 95パーセンタイル（ミリ秒、サンプルがない場合は0）
+        """
+        latencies = [latency for latency, _ in samples]
+        if len(latencies) < 2:
+            return latencies[0] if latencies else 0.0
+        return percentile(statistics.quantiles(latencies, n=100, method='inclusive'), 95)
@@ -0,0 +1,73 @@
+"""
+レプリカ複製コマンド
+
+ローカルでの確認用に、defaultのSQLiteデータベースを `DATABASE_REPLICAS` のSQLiteファイルへ複製する
+"""
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """
+    SQLiteのレプリカをdefaultから複製するコマンド
+
+    SQLiteのオンラインバックアップでdefaultの内容をレプリカのファイルへ丸ごと写す。
+    `--interval` を指定すると一定間隔で複製を繰り返し、遅れのあるレプリケーションを模擬する
+    """
+
+    help = 'Copy the default SQLite database into the SQLite files of DATABASE_REPLICAS'
+
+    def add_arguments(self, parser):
+        """
+        コマンドライン引数を追加
+
+        :param parser: ArgumentParser
+        """
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Repeat the copy every N seconds until interrupted (0 copies once)',
+        )
+
+    def handle(self, *args, **options):
+        """
+        コマンドを実行
+
+        :param args: 位置引数
+        :param options: キーワード引数
+        """
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('DATABASE_REPLICAS is empty')
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'sync_replicas supports SQLite databases only ({alias})')
+
+        while True:
+            started = time.perf_counter()
+            for alias in replicas:
+                self.copy(alias)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(self.style.SUCCESS(f'Copied default to {", ".join(replicas)} in {elapsed:.0f} ms'))
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
+
+    def copy(self, alias: str):
+        """
+        defaultの内容をレプリカへ複製
+
+        :param alias: レプリカのエイリアス
+        """
+        source = sqlite3.connect(connections.settings[DEFAULT_DB_ALIAS]['NAME'])
+        target = sqlite3.connect(connections.settings[alias]['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
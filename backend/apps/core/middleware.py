@@ -0,0 +1,252 @@
+"""
+ミドルウェア
+
+リクエストごとのSQLクエリの件数と所要時間を計測し、
+Server-Timingヘッダーと構造化ログで報告する。
+安全なメソッドのリクエストの読み取りをレプリカに振り分ける。
+いずれもASGIの非同期のビューでスレッドを経由しないよう、同期・非同期の両方で動作する
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import choose_replica, note_write, route_reads
+
+logger = logging.getLogger(__name__)
+
+# ログに含めるSQLの最大文字数
+MAX_SQL_LENGTH = 300
+
+
+class QueryStats:
+    """
+    connection.execute_wrapperとして登録し、実行されたクエリを集計する
+
+    クエリの形（パラメータを含まないSQL）ごとの実行回数を数え、
+    同じ形のクエリの繰り返し（N+1）を検出できるようにする
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        クエリを実行して計測
+
+        :param execute: 実行する関数
+        :param sql: SQL
+        :param params: パラメータ
+        :param many: executemanyかどうか
+        :param context: 実行時のコンテキスト
+        :return: executeの戻り値
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[sql] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        閾値以上繰り返された形のクエリを返す
+
+        :param threshold: 回数の閾値
+        :return: (SQL, 回数) のリスト（回数の多い順）
+        """
+        return [(sql, count) for sql, count in self.shapes.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    リクエストごとのクエリの件数・所要時間を計測するミドルウェア
+
+    すべてのデータベース接続にexecute_wrapperを登録して計測し、
+    `Server-Timing: db;dur=...;desc="N queries", app;dur=...` を付けて
+    1リクエスト1行のJSONをログに出力する。
+    同じ形のクエリが `QUERY_REPEAT_THRESHOLD` 回以上実行された場合はN+1の疑いとして警告する。
+    ストリーミングレスポンスは本体の生成前までに実行されたクエリのみを対象とする。
+    非同期の場合、非同期ORMのクエリはリクエストごとのスレッドで実行されるため、そのスレッドの接続に登録する
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', 5)
+        self.server_timing = getattr(settings, 'QUERY_SERVER_TIMING', True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.instrument(stack, stats)
+            response = self.get_response(request)
+        return self.report(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self.instrument)(stack, stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, stats, time.perf_counter() - started)
+
+    def instrument(self, stack: ExitStack, stats: QueryStats):
+        """
+        現在のスレッドのすべてのデータベース接続にexecute_wrapperを登録
+
+        :param stack: 登録を解除するExitStack
+        :param stats: クエリの集計
+        """
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+
+    def report(self, request, response, stats: QueryStats, duration: float):
+        """
+        計測結果をヘッダーとログで報告
+
+        :param request: リクエスト
+        :param response: レスポンス
+        :param stats: クエリの集計
+        :param duration: リクエスト全体の所要時間（秒）
+        :return: レスポンス
+        """
+        repeated = stats.repeated(self.repeat_threshold)
+        if self.server_timing:
+            self.add_server_timing(response, stats, duration)
+        self.log(request, response, stats, duration, repeated)
+        return response
+
+    def add_server_timing(self, response, stats: QueryStats, duration: float):
+        """
+        Server-Timingヘッダーを追加
+
+        :param response: レスポンス
+        :param stats: クエリの集計
+        :param duration: リクエスト全体の所要時間（秒）
+        """
+        metrics = [
+            f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+            f'app;dur={duration * 1000:.1f}',
+        ]
+        if response.has_header('Server-Timing'):
+            metrics.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(metrics)
+
+    def log(self, request, response, stats: QueryStats, duration: float, repeated: list[tuple[str, int]]):
+        """
+        計測結果を構造化ログとして出力
+
+        :param request: リクエスト
+        :param response: レスポンス
+        :param stats: クエリの集計
+        :param duration: リクエスト全体の所要時間（秒）
+        :param repeated: 繰り返されたクエリ
+        """
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.duration * 1000, 2),
+            'duration_ms': round(duration * 1000, 2),
+            'repeated_queries': [
+                {'sql': sql[:MAX_SQL_LENGTH], 'count': count} for sql, count in repeated
+            ],
+        }
+        if response.streaming:
+            record['streaming'] = True
+        level = logging.WARNING if repeated else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(record, ensure_ascii=False), extra={'query_stats': record})
+
+
+class ReplicaRoutingMiddleware:
+    """
+    リクエストの読み取り先を設定するミドルウェア
+
+    安全なメソッドのリクエストでは選んだレプリカから読み取り（apps.core.routers.ReplicaRouter）、
+    それ以外のリクエストではすべてdefaultを使う。APIが読み取るモデルへ書き込んで成功（2xx）した
+    リクエストの後は、書き込んだユーザーの読み取りを `REPLICA_PIN_SECONDS` 秒defaultに固定する。
+    `DATABASE_REPLICAS` が空の場合は何もしない。
+    ストリーミングレスポンスの本体はミドルウェアを抜けた後に生成されるため、defaultから読み取る
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        with route_reads(request, choose_replica() if safe else None) as routing:
+            response = self.get_response(request)
+        if self.should_note_write(routing, response):
+            self.note_write(request)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        with route_reads(request, choose_replica() if safe else None) as routing:
+            response = await self.get_response(request)
+        if self.should_note_write(routing, response):
+            # 遅延評価のユーザーはセッションを読み込むため同期のスレッドで評価する
+            await sync_to_async(self.note_write)(request)
+        return response
+
+    @staticmethod
+    def should_note_write(routing, response) -> bool:
+        """
+        書き込みを記録するかどうか
+
+        失敗したリクエストやログインなど、APIが読み取るモデルへ書き込まないリクエストでは
+        ユーザーを固定せず、レスポンスキャッシュの有効期間も短くしない
+
+        :param routing: リクエストの読み取り先
+        :param response: レスポンス
+        :return: APIが読み取るモデルへ書き込んで成功した場合True
+        """
+        return routing.wrote and 200 <= response.status_code < 300
+
+    def note_write(self, request):
+        """
+        書き込んだユーザーの読み取りをdefaultに固定する
+
+        :param request: リクエスト
+        """
+        # DRFの認証で設定されたユーザーを固定する
+        note_write(getattr(request, 'user', None))
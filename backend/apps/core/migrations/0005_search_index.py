@@ -0,0 +1,89 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:05
+
+from django.db import migrations
+
+# 投稿は rowid = id * 2、コメントは rowid = id * 2 + 1 として登録する
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        title, content, post_id UNINDEXED, tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER search_index_posts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO search_index (rowid, title, content, post_id)
+        VALUES (new.id * 2, new.title, new.content, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_posts_update AFTER UPDATE OF title, content ON posts BEGIN
+        UPDATE search_index SET title = new.title, content = new.content WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_posts_delete AFTER DELETE ON posts BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_comments_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO search_index (rowid, title, content, post_id)
+        VALUES (new.id * 2 + 1, '', new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_comments_update AFTER UPDATE OF content, post_id ON comments BEGIN
+        UPDATE search_index SET content = new.content, post_id = new.post_id WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_comments_delete AFTER DELETE ON comments BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    """
+    INSERT INTO search_index (rowid, title, content, post_id)
+    SELECT id * 2, title, content, id FROM posts
+    """,
+    """
+    INSERT INTO search_index (rowid, title, content, post_id)
+    SELECT id * 2 + 1, '', content, post_id FROM comments
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS search_index_posts_insert',
+    'DROP TRIGGER IF EXISTS search_index_posts_update',
+    'DROP TRIGGER IF EXISTS search_index_posts_delete',
+    'DROP TRIGGER IF EXISTS search_index_comments_insert',
+    'DROP TRIGGER IF EXISTS search_index_comments_update',
+    'DROP TRIGGER IF EXISTS search_index_comments_delete',
+    'DROP TABLE IF EXISTS search_index',
+]
+
+
+def create_search_index(apps, schema_editor):
+    """SQLiteの場合にFTS5の検索インデックスと同期用トリガーを作成する"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    """検索インデックスと同期用トリガーを削除する"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_comment_author_alter_comment_post_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
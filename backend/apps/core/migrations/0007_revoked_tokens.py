@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'revoked_tokens',
+                'indexes': [models.Index(fields=['expires_at'], name='revoked_tokens_expires_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.27 on 2026-10-18 15:20
+
+from django.db import migrations
+
+# 0006でcomments.updated_atを追加した際、SQLiteではcommentsテーブルが作り直され、
+# 0005で作成したコメントの同期用トリガーが失われていたため作り直す
+CREATE_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS search_index_comments_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO search_index (rowid, title, content, post_id)
+        VALUES (new.id * 2 + 1, '', new.content, new.post_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_index_comments_update AFTER UPDATE OF content, post_id ON comments BEGIN
+        UPDATE search_index SET content = new.content, post_id = new.post_id WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_index_comments_delete AFTER DELETE ON comments BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    # トリガーがない間に書き込まれたコメントを含め、コメントの行を登録し直す
+    'DELETE FROM search_index WHERE rowid % 2 = 1',
+    """
+    INSERT INTO search_index (rowid, title, content, post_id)
+    SELECT id * 2 + 1, '', content, post_id FROM comments
+    """,
+]
+
+
+def restore_comment_search_triggers(apps, schema_editor):
+    """SQLiteの場合にコメントの同期用トリガーを作り直し、検索インデックスに登録し直す"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_revoked_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_comment_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,572 @@
+"""
+ViewSet用Mixin
+
+複数のAPIで共有するビューの振る舞いを定義する。
+`a` で始まるメソッドはAsyncReadMixinの非同期のビューで使う
+"""
+import hashlib
+from collections.abc import Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.fields import IntegerField, empty
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .bulk import MAX_ITEMS
+from .cache import aget_tag_versions, get_tag_versions
+from .conditional import not_modified_response
+from .pagination import KeysetPagination, encode_cursor
+from .routers import arecently_written, reads_from_replica, recently_written
+from .serializers import EXPAND_PARAM, FIELDS_PARAM, parse_field_paths
+
+# キャッシュしたレスポンスと一緒に保存するヘッダー
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+class CachedResponseMixin:
+    """
+    list・retrieveのレスポンスをキャッシュするMixin
+
+    ホスト・パス・クエリパラメータをキーにレスポンスデータをキャッシュする。
+    各エントリには `get_response_cache_tags` が返すタグのバージョンを記録し、
+    読み出し時にいずれかのタグが更新されていればキャッシュミスとして扱う。
+    記録するバージョンはクエリ前に取得したもので、クエリ中にコミットされた書き込みでも無効化される。
+    依存するタグはレスポンスを生成するまで分からないため、初回はタグ名だけを記録し、2回目から保存する。
+    ETag・Last-Modifiedもあわせて保存し、キャッシュヒット時も条件付きGETに応答する。
+    直近の書き込みがレプリカに届く前の内容を長く保持しないよう、書き込みから
+    `REPLICA_PIN_SECONDS` 秒以内にレプリカから生成したレスポンスはその秒数だけキャッシュする。
+
+    :param response_cache_prefix: キャッシュキーのプレフィックス
+    :param response_cache_collection_tag: 一覧の構成が変わった際に更新されるタグ
+    """
+
+    response_cache_prefix = 'response'
+    response_cache_collection_tag = 'posts'
+
+    def get_response_cache_key(self, request: Request) -> str:
+        """
+        リクエストに対応するキャッシュキーを返す
+
+        :param request: リクエスト
+        :return: キャッシュキー
+        """
+        query = sorted(request.query_params.lists())
+        raw = f'{request.get_host()}:{request.path}:{query!r}'
+        return f'{self.response_cache_prefix}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+    def get_response_cache_tags(self, data) -> list[str]:
+        """
+        レスポンスデータが依存するタグを返す
+
+        :param data: レスポンスデータ
+        :return: タグ名のリスト（キャッシュできない場合はNone）
+        """
+        raise NotImplementedError
+
+    def get_expected_cache_tags(self, entry: dict | None) -> list[str]:
+        """
+        クエリ前にバージョンを取得するタグを返す
+
+        一覧の構成のタグと、キャッシュに残るエントリ（無効化されたものを含む）が依存していたタグを返す
+
+        :param entry: キャッシュしたエントリ
+        :return: タグ名のリスト
+        """
+        tags = {self.response_cache_collection_tag} if self.action == 'list' else set()
+        if entry is not None:
+            tags.update(entry['tags'])
+        return sorted(tags)
+
+    # list・retrieveのdocstringはOpenAPIのdescriptionとして使われるため、
+    # ViewSetのdocstringが使われるようここでは定義しない
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request: Request, *args, **kwargs) -> Response:
+        """
+        キャッシュを参照し、なければハンドラーを実行してキャッシュする
+
+        :param handler: レスポンスを生成するハンドラー
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        # 読み込み中の書き込みを取りこぼさないよう、タグのバージョンはクエリ前に取得する
+        versions = get_tag_versions(self.get_expected_cache_tags(entry))
+        if entry is not None and versions.items() >= entry['tags'].items():
+            return self.get_cache_hit_response(request, entry)
+
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        if reads_from_replica() and recently_written():
+            timeout = min(timeout, settings.REPLICA_PIN_SECONDS)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        tag_names = self.get_response_cache_tags(response.data)
+        if tag_names is not None:
+            cache.set(key, self.build_cache_entry(response, tag_names, versions), timeout)
+        return response
+
+    async def alist(self, request: Request, *args, **kwargs) -> Response:
+        """
+        listの非同期版にレスポンスキャッシュを適用
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        return await self.aget_cached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        retrieveの非同期版にレスポンスキャッシュを適用
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        return await self.aget_cached_response(super().aretrieve, request, *args, **kwargs)
+
+    async def aget_cached_response(self, handler, request: Request, *args, **kwargs) -> Response:
+        """
+        キャッシュを参照し、なければ非同期のハンドラーを実行してキャッシュする（get_cached_responseの非同期版）
+
+        :param handler: レスポンスを生成する非同期のハンドラー
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        key = self.get_response_cache_key(request)
+        entry = await cache.aget(key)
+        versions = await aget_tag_versions(self.get_expected_cache_tags(entry))
+        if entry is not None and versions.items() >= entry['tags'].items():
+            return self.get_cache_hit_response(request, entry)
+
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        if reads_from_replica() and await arecently_written():
+            timeout = min(timeout, settings.REPLICA_PIN_SECONDS)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        tag_names = self.get_response_cache_tags(response.data)
+        if tag_names is not None:
+            await cache.aset(key, self.build_cache_entry(response, tag_names, versions), timeout)
+        return response
+
+    def get_cache_hit_response(self, request: Request, entry: dict):
+        """
+        キャッシュしたエントリからレスポンスを返す
+
+        :param request: リクエスト
+        :param entry: キャッシュしたエントリ
+        :return: 条件付きリクエストが一致する場合は304、それ以外はキャッシュしたデータのレスポンス
+        """
+        headers = entry['headers']
+        response = not_modified_response(request, headers.get('ETag'), headers.get('Last-Modified'))
+        if response is not None:
+            return response
+        return Response(entry['data'], headers=headers)
+
+    def build_cache_entry(self, response: Response, tag_names: Iterable[str], versions: dict[str, int]) -> dict:
+        """
+        キャッシュするエントリを生成
+
+        クエリ前にバージョンを取得していないタグがある場合は、レスポンスがどのバージョンの内容か
+        判定できないため、タグ名だけを記録する（次のリクエストはそのタグをクエリ前に取得して保存する）
+
+        :param response: レスポンス
+        :param tag_names: 依存するタグ名
+        :param versions: クエリ前に取得したタグのバージョン
+        :return: エントリ
+        """
+        tag_names = {*tag_names, *self.get_expected_cache_tags(None)}
+        if not tag_names <= versions.keys():
+            return {'data': None, 'tags': dict.fromkeys(tag_names), 'headers': {}}
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        return {'data': response.data, 'tags': {tag: versions[tag] for tag in tag_names}, 'headers': headers}
+
+
+class BulkActionMixin:
+    """
+    一括操作の入力と結果の形式を揃えるMixin
+
+    リクエスト本体は要素の配列で、結果は要素ごとに `index`・`id`・`status`・`errors` を返す
+
+    :param bulk_max_items: 1リクエストで扱える最大要素数
+    """
+
+    bulk_max_items = MAX_ITEMS
+
+    def get_bulk_items(self, request: Request) -> list:
+        """
+        リクエスト本体の要素の配列を取得
+
+        :param request: リクエスト
+        :return: 要素のリスト
+        :raises ValidationError: 配列でない、空、または要素数が上限を超える場合
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        if not items:
+            raise ValidationError({'non_field_errors': ['This list may not be empty.']})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                {'non_field_errors': [f'Ensure this list has no more than {self.bulk_max_items} items.']}
+            )
+        return items
+
+    def get_bulk_pks(self, items: list, field: str = 'id') -> tuple[dict[int, int], dict[int, dict]]:
+        """
+        各要素のIDをIntegerFieldで検証
+
+        シリアライザーと同じ規則で変換するため、数値の文字列は整数にし、真偽値は拒否する
+
+        :param items: 要素のリスト
+        :param field: IDのフィールド名
+        :return: 位置ごとのID、位置ごとのバリデーションエラー
+        """
+        id_field = IntegerField()
+        pks = {}
+        errors = {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors[index] = {
+                    'non_field_errors': [f'Invalid data. Expected a dictionary, but got {type(item).__name__}.']
+                }
+                continue
+            try:
+                pks[index] = id_field.run_validation(item.get(field, empty))
+            except ValidationError as exc:
+                errors[index] = {field: exc.detail}
+        return pks, errors
+
+    def bulk_response(self, results: list[dict]) -> Response:
+        """
+        要素ごとの結果をリクエストの順に並べたレスポンスを返す
+
+        :param results: 要素ごとの結果
+        :return: レスポンス
+        """
+        return Response({'results': sorted(results, key=lambda result: result['index'])})
+
+    def bulk_delete_results(self, ids: list[int], deleted: set[int]) -> list[dict]:
+        """
+        一括削除の要素ごとの結果を生成
+
+        :param ids: 削除を指定されたID
+        :param deleted: 削除されたID
+        :return: 要素ごとの結果
+        """
+        return [
+            self.bulk_result(index, pk, 'deleted')
+            if pk in deleted
+            else self.bulk_result(index, pk, 'error', {'id': ['Not found.']})
+            for index, pk in enumerate(ids)
+        ]
+
+    @staticmethod
+    def bulk_result(index: int, pk: int | None, status: str, errors: dict | None = None) -> dict:
+        """
+        要素ごとの結果を生成
+
+        :param index: リクエスト内の位置
+        :param pk: 対象のID
+        :param status: 結果
+        :param errors: バリデーションエラー
+        :return: 結果
+        """
+        return {'index': index, 'id': pk, 'status': status, 'errors': errors}
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=`・`?expand=` の指定をシリアライザーに渡すMixin
+
+    指定はapps.core.serializers.SparseFieldsetMixinを使うシリアライザーが解釈する。
+    get_querysetでは `is_field_selected`・`is_field_expanded` を使い、
+    出力しないフィールドのためのselect_related・prefetch_relatedを省く
+
+    :param sparse_fieldset_actions: 指定を受け付けるアクション
+    """
+
+    sparse_fieldset_actions = ('list', 'retrieve')
+
+    def get_field_selection(self) -> tuple[dict | None, dict]:
+        """
+        クエリパラメータからフィールドの指定を取得
+
+        :return: (出力するフィールドの木構造（Noneは指定なし）, 展開する関連の木構造)
+        """
+        if not hasattr(self, '_field_selection'):
+            fields, expand = None, {}
+            if self.action in self.sparse_fieldset_actions:
+                params = self.request.query_params
+                if FIELDS_PARAM in params:
+                    fields = parse_field_paths(params[FIELDS_PARAM])
+                if EXPAND_PARAM in params:
+                    expand = parse_field_paths(params[EXPAND_PARAM])
+            self._field_selection = fields, expand
+        return self._field_selection
+
+    def is_field_selected(self, path: str) -> bool:
+        """
+        フィールドが出力されるかどうか
+
+        :param path: ドット区切りのフィールドのパス
+        :return: 出力される場合True
+        """
+        node, _ = self.get_field_selection()
+        for name in path.split('.'):
+            if not node:
+                return True
+            if name not in node:
+                return False
+            node = node[name]
+        return True
+
+    def is_field_expanded(self, path: str) -> bool:
+        """
+        関連がネストしたオブジェクトとして出力されるかどうか
+
+        :param path: ドット区切りのフィールドのパス
+        :return: 展開して出力される場合True
+        """
+        _, node = self.get_field_selection()
+        for name in path.split('.'):
+            if name not in node:
+                return False
+            node = node[name]
+        return self.is_field_selected(path)
+
+    def get_serializer_context(self) -> dict:
+        """
+        フィールドの指定をシリアライザーのcontextに追加
+
+        :return: context
+        """
+        context = super().get_serializer_context()
+        context[FIELDS_PARAM], context[EXPAND_PARAM] = self.get_field_selection()
+        return context
+
+
+class EmbeddedCommentsMixin:
+    """
+    投稿詳細にコメントの先頭ページだけを埋め込むMixin
+
+    retrieveではコメントを新しい順に `POST_DETAIL_COMMENTS` 件より1件多く取得し、
+    `embedded_comments` に先頭の件数分を、`comments_next` に続きがある場合の
+    コメント一覧（`comments` アクション）のURLを設定する。
+    コメントが何件あっても投稿詳細で読み込む行数は一定になる。
+
+    ViewSetは `get_comment_queryset` でコメントのQuerySetを返す（SparseFieldsetMixinと併用する）。
+    非同期のビューでは `aget_object` でコメントを非同期ORMで取得する
+    """
+
+    def get_comment_queryset(self, path: str) -> QuerySet:
+        """
+        出力に必要な関連を読み込んだコメントのQuerySetを返す
+
+        :param path: 出力でのコメントのパス（詳細では `comments.`、コメント一覧では空文字列）
+        :return: コメントのQuerySet
+        """
+        raise NotImplementedError
+
+    def get_embedded_comments_queryset(self, post_id: int) -> QuerySet:
+        """
+        投稿詳細に埋め込むコメントのQuerySetを返す
+
+        :param post_id: 投稿ID
+        :return: 埋め込む件数より1件多いコメントのQuerySet
+        """
+        comments = self.get_comment_queryset('comments.').filter(post_id=post_id)
+        return comments.order_by('-created_at', '-id')[: settings.POST_DETAIL_COMMENTS + 1]
+
+    def embeds_comments(self) -> bool:
+        """
+        投稿にコメントを埋め込むかどうか
+
+        :return: retrieveでコメントまたは続きのURLを出力する場合True
+        """
+        if self.action != 'retrieve':
+            return False
+        return self.is_field_selected('comments') or self.is_field_selected('comments_next')
+
+    def get_object(self):
+        """
+        投稿を取得し、retrieveでは埋め込むコメントと続きのURLを設定
+
+        :return: 投稿
+        """
+        post = super().get_object()
+        if self.embeds_comments():
+            self.set_embedded_comments(post, list(self.get_embedded_comments_queryset(post.pk)))
+        return post
+
+    async def aget_object(self):
+        """
+        投稿を非同期に取得し、retrieveでは埋め込むコメントと続きのURLを設定
+
+        :return: 投稿
+        """
+        post = await super().aget_object()
+        if self.embeds_comments():
+            comments = self.get_embedded_comments_queryset(post.pk)
+            self.set_embedded_comments(post, [row async for row in comments.aiterator()])
+        return post
+
+    def set_embedded_comments(self, post, rows: list):
+        """
+        埋め込むコメントと続きのURLを投稿に設定
+
+        :param post: 投稿
+        :param rows: 埋め込む件数より1件多く取得したコメント
+        """
+        limit = settings.POST_DETAIL_COMMENTS
+        post.embedded_comments = rows[:limit]
+        post.comments_next = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            url = self.reverse_action('comments', kwargs={self.lookup_field: post.pk})
+            post.comments_next = replace_query_param(
+                url, KeysetPagination.cursor_query_param, encode_cursor(last.created_at, last.pk)
+            )
+
+
+def _rendered(response):
+    """
+    DRFのレスポンスをレンダリングし、通常のHttpResponseとして返す
+
+    非同期のハンドラーはrenderを持つレスポンスを同期のスレッドでレンダリングするため、
+    ビューの中でレンダリングしてスレッドの切り替えを省く
+
+    :param response: レスポンス
+    :return: レンダリング済みのレスポンス
+    """
+    if not isinstance(response, Response):
+        return response
+    response.render()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for name, value in response.items():
+        rendered[name] = value
+    return rendered
+
+
+class AsyncReadMixin:
+    """
+    list・retrieveを非同期ORMで処理するビューを提供するMixin
+
+    `as_async_view` が返すビューはイベントループ上で動き、ListModelMixin・RetrieveModelMixinと
+    同じ処理を非同期ORMで行う。他のMixinは `alist`・`aretrieve`・`aget_object` を上書きして
+    同期のビューと同じ振る舞いを加える。ページネーションは `apaginate_queryset` を持つクラスを使う。
+
+    以下のリクエストは同期のビューで処理するため、レスポンスは同期のビューと常に一致する。
+
+    - `ASYNC_READ_VIEWS` がFalseの場合
+    - GET以外のメソッドと、Authorizationヘッダーを含むリクエスト（認証は同期でデータベースを参照する）
+    - JSON以外のレンダラーが選ばれたリクエスト（Browsable APIなど）
+    - エラーとなるリクエスト（不正なページ・存在しないIDなど）
+    """
+
+    async def alist(self, request: Request, *args, **kwargs) -> Response:
+        """
+        一覧を非同期に取得（ListModelMixin.listの非同期版）
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([row async for row in queryset.aiterator()], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        詳細を非同期に取得（RetrieveModelMixin.retrieveの非同期版）
+
+        :param request: リクエスト
+        :return: レスポンス
+        """
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        """
+        対象の行を非同期に取得（GenericAPIView.get_objectの非同期版）
+
+        :return: モデルインスタンス
+        :raises Http404: 行が存在しない・IDが不正な場合
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    @classmethod
+    def handles_async(cls, request) -> bool:
+        """
+        リクエストを非同期のビューで処理するかどうか
+
+        :param request: リクエスト
+        :return: 非同期で処理する場合True
+        """
+        return settings.ASYNC_READ_VIEWS and request.method == 'GET' and 'HTTP_AUTHORIZATION' not in request.META
+
+    @classmethod
+    def as_async_view(cls, actions: dict[str, str], fallback, **initkwargs):
+        """
+        非同期のビュー関数を返す（ViewSetMixin.as_viewの非同期版）
+
+        :param actions: HTTPメソッドとアクションの対応（`{'get': 'list'}` など）
+        :param fallback: 非同期で処理しないリクエストを処理する同期のビュー
+        :param initkwargs: ViewSetの初期化引数
+        :return: 非同期のビュー関数
+        """
+        actions = dict(actions)
+        if 'get' in actions and 'head' not in actions:
+            actions['head'] = actions['get']
+
+        async def view(request, *args, **kwargs):
+            if not cls.handles_async(request):
+                return await sync_to_async(fallback)(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            self.args = args
+            self.kwargs = kwargs
+            self.request = self.initialize_request(request, *args, **kwargs)
+            self.headers = self.default_response_headers
+            try:
+                # 認証情報を含まないため、認証・権限の確認はデータベースを参照しない
+                self.initial(self.request, *args, **kwargs)
+                if not isinstance(self.request.accepted_renderer, JSONRenderer):
+                    return await sync_to_async(fallback)(request, *args, **kwargs)
+                response = await getattr(self, f'a{self.action}')(self.request, *args, **kwargs)
+            except (APIException, Http404):
+                # エラーのレスポンスは同期のビューで生成する
+                return await sync_to_async(fallback)(request, *args, **kwargs)
+            return _rendered(self.finalize_response(self.request, response, *args, **kwargs))
+
+        # 同期のビュー（csrf_exemptのAPIView）と同じくCSRFの検証を行わない
+        view.csrf_exempt = True
+        return view
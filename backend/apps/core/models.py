@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
 
 
 class User(AbstractUser):
@@ -32,20 +33,37 @@ class Post(models.Model):
     :param content: 本文
     :param author: 投稿者
     :param is_published: 公開フラグ
+    :param comment_count: コメント数（Commentの作成・削除に合わせて更新される）
     :param created_at: 作成日時
-    :param updated_at: 更新日時
+    :param updated_at: 更新日時（コメント数の増減では更新されない）
     """
 
     title = models.CharField(max_length=200)
     content = models.TextField()
-    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
+    # 単独のインデックスは作者別一覧用の複合インデックスで代替する
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts', db_index=False)
     is_published = models.BooleanField(default=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'posts'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # 管理画面・dashboardの新着順一覧
+            models.Index(fields=['-created_at', '-id'], name='posts_created_idx'),
+            # portalの公開投稿の新着順一覧（公開済みの行のみを含む部分インデックス）
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='posts_published_created_idx',
+                condition=Q(is_published=True),
+            ),
+            # 作者別の新着順一覧
+            models.Index(fields=['author', '-created_at', '-id'], name='posts_author_created_idx'),
+            # 差分同期の更新順一覧
+            models.Index(fields=['updated_at', 'id'], name='posts_updated_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -59,16 +77,83 @@ class Comment(models.Model):
     :param author: コメント投稿者
     :param content: コメント内容
     :param created_at: 作成日時
+    :param updated_at: 更新日時
     """
 
-    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
-    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
+    # 単独のインデックスは投稿別・作者別一覧用の複合インデックスで代替する
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments', db_index=False)
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments', db_index=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'comments'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # dashboardの新着順一覧
+            models.Index(fields=['-created_at', '-id'], name='comments_created_idx'),
+            # 投稿詳細のコメント一覧
+            models.Index(fields=['post', '-created_at', '-id'], name='comments_post_created_idx'),
+            # 作者別の新着順一覧
+            models.Index(fields=['author', '-created_at', '-id'], name='comments_author_created_idx'),
+            # 差分同期の更新順一覧
+            models.Index(fields=['updated_at', 'id'], name='comments_updated_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.author.username} on {self.post.title}'
+
+
+class Tombstone(models.Model):
+    """
+    削除記録モデル
+
+    差分同期で削除された行のIDを返すために、投稿・コメントの削除ごとに記録する。
+    `SYNC_TOMBSTONE_RETENTION_DAYS` より古い記録はpurge_tombstonesで削除する
+
+    :param model: 削除された行のモデル（`core.post` など）
+    :param object_id: 削除された行のID
+    :param deleted_at: 削除日時
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            # 差分同期のモデル別の削除順一覧・保存期間を過ぎた記録の削除
+            models.Index(fields=['model', 'deleted_at'], name='tombstones_model_deleted_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.model}:{self.object_id}'
+
+
+class RevokedToken(models.Model):
+    """
+    失効したリフレッシュトークンのモデル
+
+    ローテーションで使用済みになったリフレッシュトークンのjtiを記録する。
+    失効の判定はこのテーブルを正とし、キャッシュは判定を速くするためだけに使う（apps.core.tokens）。
+    有効期限を過ぎた記録はpurge_revoked_tokensで削除する
+
+    :param jti: トークンのID（jtiクレーム）
+    :param expires_at: トークンの有効期限
+    """
+
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'revoked_tokens'
+        indexes = [
+            # 有効期限を過ぎた記録の削除
+            models.Index(fields=['expires_at'], name='revoked_tokens_expires_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return self.jti
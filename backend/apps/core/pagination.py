@@ -1,19 +1,574 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+from datetime import datetime
+from functools import cached_property
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import aget_tag_versions, get_tag_version
+
+
+def count_cache_tag(model) -> str:
+    """
+    件数キャッシュの無効化タグを返す
+
+    :param model: モデルクラス
+    :return: タグ名
+    """
+    return f'count:{model._meta.db_table}'
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """
+    クエリプランナーの推定行数を取得
+
+    推定値を得られるのはPostgreSQLのみで、それ以外のバックエンドではNoneを返す
+
+    :param queryset: 対象のQuerySet
+    :return: 推定行数
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApproximatePage(Page):
+    """
+    推定件数でページネーションした際のページ
+
+    :param has_more: 次のページが存在するかどうか
+    """
+
+    def __init__(self, object_list, number, paginator, has_more: bool):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self) -> bool:
+        """
+        次のページが存在するかどうか
+
+        :return: 存在する場合True
+        """
+        return self.has_more
+
+
+class CachedCountPaginator(DjangoPaginator):
+    """
+    件数をキャッシュするPaginator
+
+    件数はQuerySetのSQLごとに `PAGINATION_COUNT_CACHE_TIMEOUT` 秒キャッシュし、
+    対象テーブルへの書き込みで無効化する。
+    `PAGINATION_APPROXIMATE_COUNT_THRESHOLD` 以上の行数が推定される場合は
+    COUNT(*) を行わず推定値を件数として扱う。
+    非同期のビューでは `apage` で件数とページの行を非同期に取得する。
+    """
+
+    @cached_property
+    def count_approximate(self) -> bool:
+        """
+        件数が推定値かどうか
+
+        :return: 推定値の場合True
+        """
+        return self._count_info[1]
+
+    @cached_property
+    def count(self) -> int:
+        """
+        件数を取得
+
+        :return: 件数
+        """
+        return self._count_info[0]
+
+    @cached_property
+    def _count_info(self) -> tuple[int, bool]:
+        """
+        キャッシュまたはDBから件数を取得
+
+        :return: (件数, 推定値フラグ)
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return super().count, False
+
+        queryset = self.object_list
+        tag = count_cache_tag(queryset.model)
+        key = self._count_cache_key(queryset, get_tag_version(tag))
+
+        info = cache.get(key)
+        if info is None:
+            info = self._compute_count(queryset)
+            cache.set(key, info, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        return info
+
+    def _count_cache_key(self, queryset: QuerySet, version: int) -> str:
+        """
+        件数のキャッシュキーを返す
+
+        :param queryset: 対象のQuerySet
+        :param version: 件数キャッシュのタグのバージョン
+        :return: キャッシュキー
+        """
+        sql, params = queryset.order_by().query.sql_with_params()
+        signature = hashlib.sha1(f'{queryset.db}:{sql}:{params!r}'.encode()).hexdigest()
+        return f'pagination:count:{count_cache_tag(queryset.model)}:{version}:{signature}'
+
+    def _compute_count(self, queryset: QuerySet) -> tuple[int, bool]:
+        """
+        件数を計算
+
+        :param queryset: 対象のQuerySet
+        :return: (件数, 推定値フラグ)
+        """
+        threshold = settings.PAGINATION_APPROXIMATE_COUNT_THRESHOLD
+        if threshold is not None:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= threshold:
+                return estimate, True
+        return queryset.count(), False
+
+    async def aload_count(self) -> None:
+        """
+        キャッシュまたはDBから件数を非同期に取得
+
+        取得した件数は `count`・`count_approximate` から参照できる
+        """
+        if '_count_info' in self.__dict__ or not isinstance(self.object_list, QuerySet):
+            return
+        queryset = self.object_list
+        tag = count_cache_tag(queryset.model)
+        versions = await aget_tag_versions([tag])
+        key = self._count_cache_key(queryset, versions[tag])
+
+        info = await cache.aget(key)
+        if info is None:
+            info = await self._acompute_count(queryset)
+            await cache.aset(key, info, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+        self.__dict__['_count_info'] = info
+
+    async def _acompute_count(self, queryset: QuerySet) -> tuple[int, bool]:
+        """
+        件数を非同期に計算
+
+        :param queryset: 対象のQuerySet
+        :return: (件数, 推定値フラグ)
+        """
+        threshold = settings.PAGINATION_APPROXIMATE_COUNT_THRESHOLD
+        if threshold is not None:
+            estimate = await sync_to_async(estimate_count)(queryset)
+            if estimate is not None and estimate >= threshold:
+                return estimate, True
+        return await queryset.acount(), False
+
+    def validate_number(self, number) -> int:
+        """
+        ページ番号を検証
+
+        推定件数の場合は実際の行数と食い違うため、上限のチェックを行わない
+
+        :param number: ページ番号
+        :return: 検証済みのページ番号
+        """
+        if not self.count_approximate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise InvalidPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        """
+        指定ページを返す
+
+        :param number: ページ番号
+        :return: Pageインスタンス
+        """
+        if not self.count_approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # 推定件数では次ページの有無を判定できないため1件多く取得する
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        return ApproximatePage(rows[: self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+    async def apage(self, number):
+        """
+        指定ページを非同期に返す
+
+        :param number: ページ番号
+        :return: 行を読み込み済みのPageインスタンス
+        """
+        await self.aload_count()
+        if not self.count_approximate:
+            page = self.page(number)
+            page.object_list = [row async for row in page.object_list.aiterator(chunk_size=self.per_page)]
+            return page
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = [row async for row in self.object_list[bottom : bottom + self.per_page + 1].aiterator()]
+        return ApproximatePage(rows[: self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+def encode_cursor(created_at: datetime, pk: int, reverse: bool = False) -> str:
+    """
+    カーソル文字列を生成
+
+    :param created_at: 基準行の作成日時
+    :param pk: 基準行のID
+    :param reverse: 前方向（新しい側）へのカーソルかどうか
+    :return: URLセーフなカーソル文字列
+    """
+    payload = {'t': created_at.isoformat(), 'i': pk}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, bool]:
+    """
+    カーソル文字列を復元
+
+    :param cursor: カーソル文字列
+    :return: (作成日時, ID, 前方向フラグ)
+    :raises NotFound: カーソルが不正な場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return datetime.fromisoformat(payload['t']), int(payload['i']), bool(payload.get('r'))
+    except (TypeError, ValueError, KeyError):
+        raise NotFound('Invalid cursor')
+
+
+def keyset_filter(queryset: QuerySet, created_at: datetime, pk: int, reverse: bool = False) -> QuerySet:
+    """
+    基準行より後（reverse時は前）の行に絞り込み、取得順に並べる
+
+    `(created_at, id) < (基準値)` を `created_at <= 基準値 AND (created_at < 基準値 OR id < 基準値)`
+    の形で表し、created_atのインデックスで範囲検索できるようにする
+
+    :param queryset: 対象のQuerySet
+    :param created_at: 基準行の作成日時
+    :param pk: 基準行のID
+    :param reverse: 前方向（新しい側）に絞り込むかどうか
+    :return: 絞り込み・並べ替え済みのQuerySet
+    """
+    if reverse:
+        return queryset.filter(
+            Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+        ).order_by('created_at', 'id')
+    return queryset.filter(
+        Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+    ).order_by('-created_at', '-id')
+
+
+class KeysetPagination(BasePagination):
+    """
+    (created_at, id) をキーとするカーソルページネーション
+
+    COUNTやOFFSETを使わず、直前のページ末尾の行を起点に次のページを取得する。
+    Post・Commentの `-created_at` 順に合わせ、同時刻の行はIDで順序を確定させる。
+
+    :param page_size: デフォルトのページサイズ
+    :param page_size_query_param: ページサイズ指定用クエリパラメータ
+    :param max_page_size: 最大ページサイズ
+    :param cursor_query_param: カーソル指定用クエリパラメータ
+    """
+
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        """
+        カーソル位置からページ分の行を取得
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        """
+        queryset = self.prepare_queryset(queryset, request)
+        # 1件多く取得して次のページの有無を判定する
+        return self.set_page(list(queryset[: self.current_page_size + 1]))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        """
+        カーソル位置からページ分の行を非同期に取得
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        """
+        queryset = self.prepare_queryset(queryset, request)[: self.current_page_size + 1]
+        return self.set_page([row async for row in queryset.aiterator(chunk_size=self.current_page_size + 1)])
+
+    def prepare_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """
+        カーソル位置から取得順に絞り込んだQuerySetを返す
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :return: 絞り込み・並べ替え済みのQuerySet
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.current_page_size = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        self.has_cursor = bool(cursor)
+        if cursor:
+            created_at, pk, self.reverse = decode_cursor(cursor)
+            return keyset_filter(queryset, created_at, pk, self.reverse)
+        self.reverse = False
+        return queryset.order_by('-created_at', '-id')
+
+    def set_page(self, rows: list) -> list:
+        """
+        1件多く取得した行からページと前後のページの有無を設定
+
+        :param rows: ページサイズより1件多く取得した行
+        :return: ページ内の行
+        """
+        page_size = self.current_page_size
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        ページサイズを取得
+
+        :param request: リクエスト
+        :return: ページサイズ
+        """
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_next_link(self) -> str | None:
+        """
+        次のページのURLを返す
+
+        :return: 次のページのURL
+        """
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self._build_link(encode_cursor(last.created_at, last.pk))
+
+    def get_previous_link(self) -> str | None:
+        """
+        前のページのURLを返す
+
+        :return: 前のページのURL
+        """
+        if not self.has_previous or not self.page:
+            return None
+        first = self.page[0]
+        return self._build_link(encode_cursor(first.created_at, first.pk, reverse=True))
+
+    def _build_link(self, cursor: str) -> str:
+        """
+        カーソルを埋め込んだURLを生成
+
+        :param cursor: カーソル文字列
+        :return: URL
+        """
+        url = remove_query_param(self.base_url, 'page')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """
+        ページネーションレスポンスを返す
+
+        :param data: ページネーション済みデータ
+        :return: ページネーション情報を含むレスポンス
+        """
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        ページネーションレスポンスのスキーマを返す
+
+        :param schema: 結果要素のスキーマ
+        :return: レスポンススキーマ
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """
+        クエリパラメータのスキーマを返す
+
+        :param view: ビュー
+        :return: パラメータ定義のリスト
+        """
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
 
 
 class StandardPagination(PageNumberPagination):
     """
     標準ページネーションクラス
 
+    通常はページ番号方式で、`?pagination=cursor` または `?cursor=` 指定時は
+    KeysetPaginationに委譲する（カーソル方式ではcountを返さない）。
+    ページ番号方式の件数はCachedCountPaginatorでキャッシュし、
+    推定値の場合は `count_approximate` で判別できる
+
     :param page_size: デフォルトのページサイズ
     :param page_size_query_param: ページサイズ指定用クエリパラメータ
     :param max_page_size: 最大ページサイズ
+    :param cursor_query_param: カーソル指定用クエリパラメータ
+    :param mode_query_param: ページネーション方式指定用クエリパラメータ
     """
 
+    django_paginator_class = CachedCountPaginator
     page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 1000
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+
+    keyset: KeysetPagination | None = None
+
+    def use_cursor(self, request: Request) -> bool:
+        """
+        カーソル方式を使うかどうか
+
+        :param request: リクエスト
+        :return: カーソル方式の場合True
+        """
+        params = request.query_params
+        return bool(params.get(self.cursor_query_param)) or params.get(self.mode_query_param) == 'cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        """
+        指定された方式でページネーションする
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        """
+        if self.use_cursor(request):
+            self.keyset = self.build_keyset()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        """
+        指定された方式で非同期にページネーションする
+
+        ページ番号方式の処理はPageNumberPagination.paginate_querysetと同じ
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        :raises NotFound: ページ番号が不正な場合
+        """
+        if self.use_cursor(request):
+            self.keyset = self.build_keyset()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        self.keyset = None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = await paginator.apage(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def build_keyset(self) -> KeysetPagination:
+        """
+        設定を引き継いだカーソル方式のページネーションを生成
+
+        :return: KeysetPagination
+        """
+        keyset = KeysetPagination()
+        keyset.page_size = self.page_size
+        keyset.page_size_query_param = self.page_size_query_param
+        keyset.max_page_size = self.max_page_size
+        keyset.cursor_query_param = self.cursor_query_param
+        return keyset
 
     def get_paginated_response(self, data: list) -> Response:
         """
@@ -22,11 +577,199 @@ class StandardPagination(PageNumberPagination):
         :param data: ページネーション済みデータ
         :return: ページネーション情報を含むレスポンス
         """
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response(
             {
                 'count': self.page.paginator.count,
+                'count_approximate': self.page.paginator.count_approximate,
                 'next': self.get_next_link(),
                 'previous': self.get_previous_link(),
                 'results': data,
             }
         )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        ページネーションレスポンスのスキーマを返す
+
+        :param schema: 結果要素のスキーマ
+        :return: レスポンススキーマ
+        """
+        response_schema = super().get_paginated_response_schema(schema)
+        # カーソル方式ではcountを返さないため必須から外す
+        response_schema['required'] = ['results']
+        response_schema['properties']['count']['description'] = 'Total number of results (page number mode only).'
+        response_schema['properties']['count_approximate'] = {
+            'type': 'boolean',
+            'description': 'Whether count is a planner estimate instead of an exact count.',
+        }
+        # プロパティの並び順をレスポンスに合わせる
+        response_schema['properties'] = {
+            key: response_schema['properties'][key]
+            for key in ['count', 'count_approximate', 'next', 'previous', 'results']
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """
+        クエリパラメータのスキーマを返す
+
+        :param view: ビュー
+        :return: パラメータ定義のリスト
+        """
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Pagination mode. "cursor" switches to keyset pagination without a total count.',
+                'schema': {'type': 'string', 'enum': ['page', 'cursor']},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value (cursor mode).',
+                'schema': {'type': 'string'},
+            },
+        ]
+        return parameters
+
+
+class UncountedPagination(BasePagination):
+    """
+    件数を数えないページ番号方式のページネーション
+
+    全文検索の結果のように件数の算出が高コストなシーケンス向けで、
+    1件多く取得して次のページの有無を判定する。
+    対象はスライスで取得範囲を指定できるオブジェクトであればよい
+
+    :param page_size: デフォルトのページサイズ
+    :param page_size_query_param: ページサイズ指定用クエリパラメータ
+    :param max_page_size: 最大ページサイズ
+    :param page_query_param: ページ番号指定用クエリパラメータ
+    """
+
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    page_query_param = 'page'
+
+    def paginate_queryset(self, queryset, request: Request, view=None) -> list:
+        """
+        指定ページの行を取得
+
+        :param queryset: スライス可能な対象
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        try:
+            self.number = _positive_int(request.query_params.get(self.page_query_param, 1), strict=True)
+        except ValueError:
+            raise NotFound('Invalid page.')
+
+        offset = (self.number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        ページサイズを取得
+
+        :param request: リクエスト
+        :return: ページサイズ
+        """
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self) -> str | None:
+        """
+        次のページのURLを返す
+
+        :return: 次のページのURL
+        """
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.page_query_param, self.number + 1)
+
+    def get_previous_link(self) -> str | None:
+        """
+        前のページのURLを返す
+
+        :return: 前のページのURL
+        """
+        if self.number == 1:
+            return None
+        if self.number == 2:
+            return remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(self.base_url, self.page_query_param, self.number - 1)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """
+        ページネーションレスポンスを返す
+
+        :param data: ページネーション済みデータ
+        :return: ページネーション情報を含むレスポンス
+        """
+        return Response(
+            {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """
+        ページネーションレスポンスのスキーマを返す
+
+        :param schema: 結果要素のスキーマ
+        :return: レスポンススキーマ
+        """
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        """
+        クエリパラメータのスキーマを返す
+
+        :param view: ビュー
+        :return: パラメータ定義のリスト
+        """
+        return [
+            {
+                'name': self.page_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'A page number within the paginated result set.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
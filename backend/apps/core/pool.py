@@ -0,0 +1,272 @@
+"""
+データベースの接続プール
+
+Djangoの接続はスレッド（ASGIではリクエスト）ごとに作られ、`CONN_MAX_AGE` の持続的な接続も
+そのスレッドでしか使い回せない。ASGIではリクエストごとにスレッドが変わるため、
+接続をスレッド間で共有するプールに返し、次のリクエストで使い回す。
+
+- 接続の数は `DATABASE_POOL_SIZE` を上限とし、埋まっている場合は `DATABASE_POOL_TIMEOUT` 秒まで返却を待つ
+- `DATABASE_POOL_MAX_LIFETIME` 秒を過ぎた接続は返却時・取り出し時に閉じて作り直す
+- `DATABASE_POOL_HEALTH_CHECKS` がTrueの場合、取り出し時に接続が使えることを確認する
+- 取り出し・待ち・タイムアウトなどの件数は `pool_stats()` で参照する
+
+プールはapps.core.backends.sqlite3のDatabaseWrapperが使う。
+"""
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+POOL_SETTINGS = {
+    'DATABASE_POOL_SIZE',
+    'DATABASE_POOL_TIMEOUT',
+    'DATABASE_POOL_MAX_LIFETIME',
+    'DATABASE_POOL_HEALTH_CHECKS',
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """プールの接続の返却を待つ時間を超えた場合の例外"""
+
+
+class ConnectionPool:
+    """
+    1つのデータベースの接続プール
+
+    接続の作成・確認・終了はバックエンドの関数で行い、プールは接続の数と貸し出しだけを管理する。
+    直近に返された接続から貸し出し、使われない接続は寿命で閉じる
+
+    :param alias: データベースのエイリアス
+    :param size: 接続数の上限
+    :param timeout: 返却を待つ時間（秒）
+    :param max_lifetime: 接続を作り直すまでの時間（秒、Noneで無期限）
+    :param health_checks: 取り出し時に接続を確認するかどうか
+    """
+
+    def __init__(self, alias: str, size: int, timeout: float, max_lifetime: float | None, health_checks: bool):
+        self.alias = alias
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_checks = health_checks
+        self.counters = Counter()
+        self.wait_seconds = 0.0
+        self.peak_in_use = 0
+        self._condition = threading.Condition()
+        # (接続, 作成時刻) を返却順に保持する
+        self._idle = deque()
+        # 貸し出し中の接続のidと作成時刻
+        self._in_use = {}
+        # 作成中を含む接続の数
+        self._open = 0
+        self._closed = False
+
+    def checkout(self, connect, is_usable, close):
+        """
+        接続を取り出す
+
+        空いている接続がなければ上限まで新しく作り、上限に達している場合は返却を待つ
+
+        :param connect: 新しい接続を返す関数
+        :param is_usable: 接続が使えるかどうかを返す関数
+        :param close: 接続を閉じる関数
+        :return: 接続
+        :raises PoolTimeout: `timeout` 秒待っても接続が空かない場合
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        with self._condition:
+            while True:
+                while self._idle:
+                    conn, created_at = self._idle.pop()
+                    if self._expired(created_at) or (self.health_checks and not is_usable(conn)):
+                        self.counters['discarded'] += 1
+                        self._open -= 1
+                        close(conn)
+                        continue
+                    return self._lend(conn, created_at, started, waited)
+                if self._open < self.size:
+                    # 接続の作成はロックの外で行うため、枠だけ先に確保する
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    self.wait_seconds += time.monotonic() - started
+                    raise PoolTimeout(
+                        f'No connection of "{self.alias}" became available within {self.timeout}s '
+                        f'(DATABASE_POOL_SIZE={self.size})'
+                    )
+                if not waited:
+                    self.counters['waits'] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+        try:
+            conn = connect()
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.counters['connects'] += 1
+            return self._lend(conn, time.monotonic(), started, waited)
+
+    def release(self, conn, reset, close) -> None:
+        """
+        接続を返す
+
+        プールが閉じられた・寿命を過ぎた・状態を戻せない接続は閉じる
+
+        :param conn: 接続
+        :param reset: 接続を貸し出し前の状態に戻し、成功したかどうかを返す関数
+        :param close: 接続を閉じる関数
+        """
+        with self._condition:
+            created_at = self._in_use.pop(id(conn), None)
+        reusable = created_at is not None and not self._closed and not self._expired(created_at) and reset(conn)
+        with self._condition:
+            self.counters['releases'] += 1
+            if reusable:
+                self._idle.append((conn, created_at))
+            else:
+                self.counters['discarded'] += 1
+                self._open -= 1
+            self._condition.notify()
+        if not reusable:
+            close(conn)
+
+    def discard(self, conn, close) -> None:
+        """
+        貸し出し中の接続をプールに戻さず閉じる
+
+        :param conn: 接続
+        :param close: 接続を閉じる関数
+        """
+        with self._condition:
+            if self._in_use.pop(id(conn), None) is not None:
+                self.counters['discarded'] += 1
+                self._open -= 1
+                self._condition.notify()
+        close(conn)
+
+    def close(self, close) -> None:
+        """
+        空いている接続を閉じ、貸し出し中の接続は返却時に閉じる
+
+        :param close: 接続を閉じる関数
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for conn, _ in idle:
+            close(conn)
+
+    def stats(self) -> dict:
+        """
+        プールの状態と累計の件数を返す
+
+        :return: 上限・貸し出し中・空き・ピークの接続数と、取り出し・作成・待ち・タイムアウト・破棄の件数
+        """
+        with self._condition:
+            return {
+                'size': self.size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.counters['checkouts'],
+                'connects': self.counters['connects'],
+                'waits': self.counters['waits'],
+                'wait_ms': round(self.wait_seconds * 1000, 3),
+                'timeouts': self.counters['timeouts'],
+                'discarded': self.counters['discarded'],
+            }
+
+    def _lend(self, conn, created_at: float, started: float, waited: bool):
+        """
+        接続を貸し出し中として記録（ロックを取得した状態で呼び出す）
+
+        :param conn: 接続
+        :param created_at: 接続の作成時刻
+        :param started: 取り出しを始めた時刻
+        :param waited: 返却を待ったかどうか
+        :return: 接続
+        """
+        self._in_use[id(conn)] = created_at
+        self.counters['checkouts'] += 1
+        if waited:
+            self.wait_seconds += time.monotonic() - started
+        self.peak_in_use = max(self.peak_in_use, len(self._in_use))
+        return conn
+
+    def _expired(self, created_at: float) -> bool:
+        """
+        接続が寿命を過ぎたかどうか
+
+        :param created_at: 接続の作成時刻
+        :return: 寿命を過ぎた場合True
+        """
+        return self.max_lifetime is not None and time.monotonic() - created_at >= self.max_lifetime
+
+
+def get_pool(alias: str) -> ConnectionPool | None:
+    """
+    データベースの接続プールを返す（初回に作成する）
+
+    :param alias: データベースのエイリアス
+    :return: 接続プール（`DATABASE_POOL_SIZE` が0の場合はNone）
+    """
+    if settings.DATABASE_POOL_SIZE <= 0:
+        return None
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(
+                    alias,
+                    settings.DATABASE_POOL_SIZE,
+                    settings.DATABASE_POOL_TIMEOUT,
+                    settings.DATABASE_POOL_MAX_LIFETIME,
+                    settings.DATABASE_POOL_HEALTH_CHECKS,
+                )
+    return pool
+
+
+def close_pools() -> None:
+    """すべての接続プールを閉じる（次の取り出しで現在の設定のプールを作り直す）"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close(lambda conn: conn.close())
+
+
+def pool_stats() -> dict[str, dict]:
+    """
+    接続プールの状態を返す
+
+    :return: エイリアスをキーとしたConnectionPool.statsの結果
+    """
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+@receiver(setting_changed)
+def reset_pools(setting: str, **kwargs) -> None:
+    """
+    プールの設定が変更された場合にプールを作り直す（override_settings用）
+
+    :param setting: 変更された設定名
+    """
+    if setting in POOL_SETTINGS:
+        close_pools()
@@ -0,0 +1,269 @@
+"""
+データベースルーター
+
+安全なメソッド（GET・HEAD・OPTIONS）のリクエストでの読み取りを `DATABASE_REPLICAS` の
+レプリカに振り分け、書き込みはdefault（プライマリー）に送る。
+レプリカはリクエストごとに1つ選び、同じリクエスト内の読み取りは同じレプリカから行う。
+
+レプリケーションの遅れで書き込んだ内容が見えなくなるのを防ぐため、以下の読み取りはdefaultに送る。
+
+- 書き込みのリクエストから `REPLICA_PIN_SECONDS` 秒以内の、同じユーザーのリクエスト
+- defaultのトランザクション内での読み取り
+- `read_from_primary()` の中での読み取り（差分同期など、遅れた行を取りこぼせない処理）
+
+書き込みの固定は、APIが読み取るモデルへ実際に書き込んだ成功（2xx）のリクエストのみ記録する。
+固定はキャッシュに保存するため、複数のプロセスで配信する場合は共有のキャッシュ（`CACHES`）が必要になる
+（プロセスごとのLocMemCacheでは、別のプロセスに届いたリクエストが固定されない）。
+
+リクエストごとの振り分けはReplicaRoutingMiddlewareが設定する。
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+PIN_KEY_PREFIX = 'replica-pin'
+# いずれかのユーザーが直近に書き込んだことを示すキー
+RECENT_WRITE_KEY = 'replica-recent-write'
+
+_routing = ContextVar('replica_routing', default=None)
+
+
+def _pin_key(user_id) -> str:
+    """
+    ユーザーの読み取りをdefaultに固定するキャッシュキーを返す
+
+    :param user_id: ユーザーID
+    :return: キャッシュキー
+    """
+    return f'{PIN_KEY_PREFIX}:{user_id}'
+
+
+class ReadRouting:
+    """
+    1リクエストの読み取り先
+
+    ユーザーの固定はDRFの認証後に判定できるよう、最初の読み取り時に遅延して確認する
+
+    :param request: リクエスト
+    :param replica: 読み取りに使うレプリカのエイリアス（Noneはdefault）
+    """
+
+    def __init__(self, request, replica: str | None):
+        self.request = request
+        self.replica = replica
+        self.primary_depth = 0
+        # APIが読み取るモデルへ書き込んだかどうか（ReplicaRouter.db_for_writeが設定する）
+        self.wrote = False
+        self._pinned = {}
+
+    def read_alias(self) -> str | None:
+        """
+        読み取りに使うデータベースのエイリアスを返す
+
+        :return: レプリカのエイリアス（defaultを使う場合はNone）
+        """
+        if self.replica is None or self.primary_depth:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        user_id = self.user_id()
+        if user_id is not None and self.is_pinned(user_id):
+            return None
+        return self.replica
+
+    def user_id(self):
+        """
+        認証済みのユーザーIDを返す
+
+        AuthenticationMiddlewareの遅延評価のユーザーは、評価済みの場合のみ参照する
+        （評価中のセッションの読み取りから再帰しないようにする）。
+        DRFの認証後は、DRFが設定したユーザーを参照する
+
+        :return: ユーザーID（未認証・未評価の場合はNone）
+        """
+        user = self.request.__dict__.get('user')
+        if isinstance(user, SimpleLazyObject):
+            user = None if user._wrapped is empty else user._wrapped
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
+
+    def is_pinned(self, user_id) -> bool:
+        """
+        ユーザーの読み取りがdefaultに固定されているかどうか
+
+        :param user_id: ユーザーID
+        :return: 固定されている場合True
+        """
+        if user_id not in self._pinned:
+            self._pinned[user_id] = cache.get(_pin_key(user_id)) is not None
+        return self._pinned[user_id]
+
+
+@contextmanager
+def route_reads(request, replica: str | None):
+    """
+    リクエストの読み取り先を設定するコンテキストマネージャー
+
+    :param request: リクエスト
+    :param replica: 読み取りに使うレプリカのエイリアス（Noneはdefault）
+    :return: リクエストの読み取り先
+    """
+    routing = ReadRouting(request, replica)
+    token = _routing.set(routing)
+    try:
+        yield routing
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    読み取りをdefaultに送るコンテキストマネージャー
+
+    レプリケーションの遅れで行を取りこぼすと結果が壊れる処理（差分同期など）で使う
+    """
+    routing = _routing.get()
+    if routing is None:
+        yield
+        return
+    routing.primary_depth += 1
+    try:
+        yield
+    finally:
+        routing.primary_depth -= 1
+
+
+def choose_replica() -> str | None:
+    """
+    リクエストの読み取りに使うレプリカを選ぶ
+
+    :return: レプリカのエイリアス（レプリカがない場合はNone）
+    """
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+def reads_from_replica() -> bool:
+    """
+    現在のリクエストの読み取りがレプリカに送られるかどうか
+
+    :return: レプリカに送られる場合True
+    """
+    routing = _routing.get()
+    return routing is not None and routing.read_alias() is not None
+
+
+def note_write(user) -> None:
+    """
+    書き込みを記録し、書き込んだユーザーの読み取りを一定時間defaultに固定する
+
+    :param user: 書き込んだユーザー（未認証の場合はユーザーを固定しない）
+    """
+    values = {RECENT_WRITE_KEY: True}
+    if user is not None and user.is_authenticated:
+        values[_pin_key(user.pk)] = True
+    cache.set_many(values, settings.REPLICA_PIN_SECONDS)
+
+
+def recently_written() -> bool:
+    """
+    `REPLICA_PIN_SECONDS` 秒以内にいずれかのユーザーが書き込んだかどうか
+
+    :return: 書き込みがあった場合True
+    """
+    return cache.get(RECENT_WRITE_KEY) is not None
+
+
+async def arecently_written() -> bool:
+    """
+    `REPLICA_PIN_SECONDS` 秒以内にいずれかのユーザーが書き込んだかどうか（非同期版）
+
+    :return: 書き込みがあった場合True
+    """
+    return await cache.aget(RECENT_WRITE_KEY) is not None
+
+
+class ReplicaRouter:
+    """
+    読み取りをレプリカに、書き込みをdefaultに送るルーター
+
+    対象はAPIが読み書きするcoreアプリのモデルのみで、
+    トークンのブラックリストなどは常にdefaultを使う。
+    レプリカにはマイグレーションを適用しない（defaultから複製する）
+
+    :param route_app_labels: レプリカから読み取るアプリ
+    :param unpinned_models: 書き込んでもユーザーの読み取りを固定しないモデル（APIが読み取らないもの）
+    """
+
+    route_app_labels = {'core'}
+    unpinned_models = {'core.revokedtoken'}
+
+    def db_for_read(self, model, **hints) -> str | None:
+        """
+        読み取りに使うデータベースを返す
+
+        :param model: モデルクラス
+        :param hints: ヒント
+        :return: エイリアス（Noneは次のルーター・defaultに任せる）
+        """
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+        routing = _routing.get()
+        return routing.read_alias() if routing is not None else None
+
+    def db_for_write(self, model, **hints) -> str:
+        """
+        書き込みに使うデータベースを返す
+
+        レプリカから読み込んだインスタンスの保存もdefaultに送る。
+        APIが読み取るモデルへの書き込みはリクエストに記録し、書き込んだユーザーの固定に使う
+
+        :param model: モデルクラス
+        :param hints: ヒント
+        :return: エイリアス
+        """
+        routing = _routing.get()
+        if (
+            routing is not None
+            and model._meta.app_label in self.route_app_labels
+            and model._meta.label_lower not in self.unpinned_models
+        ):
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        """
+        2つのインスタンスの関連付けを許可するかどうか
+
+        defaultとレプリカは同じデータを持つため、相互の関連付けを許可する
+
+        :param obj1: インスタンス
+        :param obj2: インスタンス
+        :param hints: ヒント
+        :return: 許可する場合True（Noneは判断しない）
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name=None, **hints) -> bool | None:
+        """
+        マイグレーションを適用するかどうか
+
+        :param db: エイリアス
+        :param app_label: アプリ名
+        :param model_name: モデル名
+        :param hints: ヒント
+        :return: レプリカではFalse（Noneは判断しない）
+        """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
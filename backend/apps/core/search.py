@@ -0,0 +1,330 @@
+"""
+全文検索
+
+投稿（タイトル・本文）とコメント（本文）を横断して検索する。
+SQLiteではFTS5の転置インデックス `search_index` を使い、
+それ以外のバックエンドではicontainsによる検索にフォールバックする。
+
+`search_index` はマイグレーションで作成され、posts・commentsテーブルの
+トリガーで同期される（bulk_createやQuerySet.update()による書き込みも反映される）。
+rowidは投稿が `id * 2`、コメントが `id * 2 + 1` で、種別とIDを復元できる。
+
+SQLiteでテーブルを作り直すマイグレーション（列の追加・変更など）はトリガーを消すため、
+マイグレーションの後に `ensure_search_triggers()` で不足したトリガーを作り直す（apps.core.signals）。
+"""
+import html
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+from .models import Comment, Post
+
+POST = 'post'
+COMMENT = 'comment'
+RESULT_TYPES = [POST, COMMENT]
+
+# ハイライト位置を示すマーカー（HTMLエスケープ後に<mark>タグへ置き換える）
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+ELLIPSIS = '…'
+SNIPPET_TOKENS = 32
+# bm25のカラムごとの重み（タイトル・本文）
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+# trigramトークナイザーは3文字未満の語に一致しない
+MIN_QUERY_LENGTH = 3
+
+# 検索インデックスを同期するトリガー（名前: 作成するSQL）
+SEARCH_TRIGGERS = {
+    'search_index_posts_insert': """
+        CREATE TRIGGER IF NOT EXISTS search_index_posts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO search_index (rowid, title, content, post_id)
+            VALUES (new.id * 2, new.title, new.content, new.id);
+        END
+    """,
+    'search_index_posts_update': """
+        CREATE TRIGGER IF NOT EXISTS search_index_posts_update AFTER UPDATE OF title, content ON posts BEGIN
+            UPDATE search_index SET title = new.title, content = new.content WHERE rowid = new.id * 2;
+        END
+    """,
+    'search_index_posts_delete': """
+        CREATE TRIGGER IF NOT EXISTS search_index_posts_delete AFTER DELETE ON posts BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2;
+        END
+    """,
+    'search_index_comments_insert': """
+        CREATE TRIGGER IF NOT EXISTS search_index_comments_insert AFTER INSERT ON comments BEGIN
+            INSERT INTO search_index (rowid, title, content, post_id)
+            VALUES (new.id * 2 + 1, '', new.content, new.post_id);
+        END
+    """,
+    'search_index_comments_update': """
+        CREATE TRIGGER IF NOT EXISTS search_index_comments_update AFTER UPDATE OF content, post_id ON comments BEGIN
+            UPDATE search_index SET content = new.content, post_id = new.post_id WHERE rowid = new.id * 2 + 1;
+        END
+    """,
+    'search_index_comments_delete': """
+        CREATE TRIGGER IF NOT EXISTS search_index_comments_delete AFTER DELETE ON comments BEGIN
+            DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        END
+    """,
+}
+
+
+def uses_fts() -> bool:
+    """
+    FTS5の検索インデックスを使うかどうか
+
+    :return: SQLiteの場合True
+    """
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(query: str) -> str:
+    """
+    検索語をFTS5のMATCH式に変換
+
+    空白区切りの各語をフレーズとして引用し、すべてを含む行に一致させる。
+    FTS5の演算子として解釈されないよう、ユーザー入力はそのまま式にしない。
+
+    :param query: 検索語
+    :return: MATCH式
+    """
+    terms = query.split()
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def render_highlight(text: str) -> str:
+    """
+    マーカー付きのテキストをHTMLエスケープし、マーカーを<mark>タグに置き換える
+
+    :param text: マーカー付きのテキスト
+    :return: HTML
+    """
+    return html.escape(text).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+class SearchResults:
+    """
+    検索結果
+
+    スライスされた時点でLIMIT・OFFSETを付けて検索を実行する。
+    件数の算出には一致する全行の走査が必要になるため、件数は提供しない。
+
+    :param query: 検索語
+    :param published_only: 公開済み投稿（とそのコメント）に限定するかどうか
+    """
+
+    def __init__(self, query: str, published_only: bool):
+        self.query = query
+        self.published_only = published_only
+
+    def __getitem__(self, key: slice) -> list[dict]:
+        """
+        指定範囲の検索結果を取得
+
+        :param key: 取得範囲
+        :return: 検索結果のリスト
+        """
+        offset = key.start or 0
+        limit = key.stop - offset
+        if limit <= 0 or not self.query.split():
+            return []
+        if uses_fts():
+            return self._search_fts(limit, offset)
+        return self._search_fallback(limit, offset)
+
+    def _search_fts(self, limit: int, offset: int) -> list[dict]:
+        """
+        FTS5インデックスを検索
+
+        :param limit: 取得件数
+        :param offset: 開始位置
+        :return: 検索結果のリスト
+        """
+        published = 'AND posts.is_published' if self.published_only else ''
+        sql = f"""
+            SELECT
+                search_index.rowid,
+                search_index.post_id,
+                posts.title,
+                highlight(search_index, 0, %s, %s),
+                snippet(search_index, 1, %s, %s, %s, %s),
+                bm25(search_index, %s, %s) AS rank
+            FROM search_index
+            JOIN posts ON posts.id = search_index.post_id
+            WHERE search_index MATCH %s {published}
+            ORDER BY rank
+            LIMIT %s OFFSET %s
+        """
+        params = [
+            MARK_START,
+            MARK_END,
+            MARK_START,
+            MARK_END,
+            ELLIPSIS,
+            SNIPPET_TOKENS,
+            TITLE_WEIGHT,
+            CONTENT_WEIGHT,
+            build_match_expression(self.query),
+            limit,
+            offset,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        results = []
+        for rowid, post_id, post_title, title, snippet, rank in rows:
+            is_comment = rowid % 2 == 1
+            results.append(
+                {
+                    'type': COMMENT if is_comment else POST,
+                    'id': rowid // 2,
+                    'post_id': post_id,
+                    'title': html.escape(post_title) if is_comment else render_highlight(title),
+                    'snippet': render_highlight(snippet),
+                    # bm25は一致度が高いほど小さい負の値を返すため符号を反転する
+                    'rank': -rank,
+                }
+            )
+        return results
+
+    def _search_fallback(self, limit: int, offset: int) -> list[dict]:
+        """
+        FTS5を使えないバックエンド向けの検索
+
+        投稿を新着順、コメントを新着順に並べて返す（ランキングは行わない）
+
+        :param limit: 取得件数
+        :param offset: 開始位置
+        :return: 検索結果のリスト
+        """
+        post_filter = Q()
+        comment_filter = Q()
+        for term in self.query.split():
+            post_filter &= Q(title__icontains=term) | Q(content__icontains=term)
+            comment_filter &= Q(content__icontains=term)
+        posts = Post.objects.filter(post_filter)
+        comments = Comment.objects.filter(comment_filter).select_related('post')
+        if self.published_only:
+            posts = posts.filter(is_published=True)
+            comments = comments.filter(post__is_published=True)
+
+        results = [
+            {
+                'type': POST,
+                'id': post.id,
+                'post_id': post.id,
+                'title': html.escape(post.title),
+                'snippet': html.escape(post.content[:200]),
+                'rank': 0.0,
+            }
+            for post in posts[offset : offset + limit]
+        ]
+        remaining = limit - len(results)
+        if remaining > 0:
+            comment_offset = max(offset - posts.count(), 0)
+            results += [
+                {
+                    'type': COMMENT,
+                    'id': comment.id,
+                    'post_id': comment.post_id,
+                    'title': html.escape(comment.post.title),
+                    'snippet': html.escape(comment.content[:200]),
+                    'rank': 0.0,
+                }
+                for comment in comments[comment_offset : comment_offset + remaining]
+            ]
+        return results
+
+
+def search(query: str, published_only: bool) -> SearchResults:
+    """
+    投稿とコメントを全文検索
+
+    :param query: 検索語
+    :param published_only: 公開済み投稿（とそのコメント）に限定するかどうか
+    :return: 検索結果
+    """
+    return SearchResults(query, published_only)
+
+
+def has_search_index(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    検索インデックスのテーブルがあるかどうか
+
+    :param using: データベースのエイリアス
+    :return: SQLiteで検索インデックスが作成済みの場合True
+    """
+    if connections[using].vendor != 'sqlite':
+        return False
+    return 'search_index' in connections[using].introspection.table_names()
+
+
+def missing_search_triggers(using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    存在しない同期用トリガーを取得
+
+    :param using: データベースのエイリアス
+    :return: トリガー名のリスト
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+    return [name for name in SEARCH_TRIGGERS if name not in existing]
+
+
+def ensure_search_triggers(using: str = DEFAULT_DB_ALIAS) -> list[str]:
+    """
+    存在しない同期用トリガーを作成
+
+    トリガーがない間の書き込みはインデックスに反映されていないため、
+    作成した場合は呼び出し側で `rebuild_search_index()` を実行する
+
+    :param using: データベースのエイリアス
+    :return: 作成したトリガー名のリスト
+    """
+    missing = missing_search_triggers(using)
+    with connections[using].cursor() as cursor:
+        for name in missing:
+            cursor.execute(SEARCH_TRIGGERS[name])
+    return missing
+
+
+def rebuild_search_index(batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    検索インデックスを作り直す
+
+    :param batch_size: 1回のINSERTで登録する行数
+    :param using: データベースのエイリアス
+    :return: 登録した行数
+    """
+    if connections[using].vendor != 'sqlite':
+        return 0
+    total = 0
+    with connections[using].cursor() as cursor:
+        cursor.execute('DELETE FROM search_index')
+        for table, rowid, title in (
+            ('posts', 'id * 2', 'title'),
+            ('comments', 'id * 2 + 1', "''"),
+        ):
+            post_id = 'id' if table == 'posts' else 'post_id'
+            last_id = 0
+            while True:
+                cursor.execute(
+                    f'SELECT MAX(id), COUNT(*) FROM (SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s)',
+                    [last_id, batch_size],
+                )
+                max_id, count = cursor.fetchone()
+                if not count:
+                    break
+                cursor.execute(
+                    f'INSERT INTO search_index (rowid, title, content, post_id) '
+                    f'SELECT {rowid}, {title}, content, {post_id} FROM {table} WHERE id > %s AND id <= %s',
+                    [last_id, max_id],
+                )
+                total += count
+                last_id = max_id
+    return total
@@ -0,0 +1,381 @@
+"""
+シリアライザー用Mixin
+
+複数のAPIで共有するシリアライザーの振る舞いを定義する
+"""
+from datetime import datetime
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db.models.manager import BaseManager
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import ISO_8601, SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+# 出力するフィールドを選択するクエリパラメータ
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+FIELDS_PARAMETER = OpenApiParameter(
+    FIELDS_PARAM,
+    OpenApiTypes.STR,
+    description=(
+        'Comma-separated fields to include; the others are omitted. '
+        'Use dots to select fields of nested objects (e.g. "id,title,author.username").'
+    ),
+)
+EXPAND_PARAMETER = OpenApiParameter(
+    EXPAND_PARAM,
+    OpenApiTypes.STR,
+    description='Comma-separated relations to return as nested objects instead of IDs (e.g. "post").',
+)
+
+
+def parse_field_paths(value: str) -> dict:
+    """
+    カンマ区切りのフィールドのパスを木構造に変換
+
+    `id,author.username` は `{'id': {}, 'author': {'username': {}}}` になる。
+    空の辞書は、そのフィールドの下位のフィールドをすべて出力することを表す
+
+    :param value: クエリパラメータの値
+    :return: フィールド名をキーとした木構造
+    """
+    tree = {}
+    for path in value.split(','):
+        names = [name.strip() for name in path.split('.')]
+        if not all(names):
+            continue
+        node = tree
+        for name in names:
+            node = node.setdefault(name, {})
+    return tree
+
+
+def get_field_paths(tree: dict | None, path: list[str]) -> dict | None:
+    """
+    木構造から指定したパスの部分木を取り出す
+
+    :param tree: parse_field_pathsの結果（Noneは指定なし）
+    :param path: ルートからのフィールド名のリスト
+    :return: 部分木（指定がないか、すべてのフィールドを出力する場合はNone）
+    """
+    for name in path:
+        if not tree:
+            return None
+        tree = tree.get(name)
+    return tree or None
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    `?fields=`・`?expand=` で出力するフィールドを選択するシリアライザーのMixin
+
+    シリアライザーのcontextの `fields`・`expand`（parse_field_pathsの結果）に従い、
+    選択されていないフィールドを出力から除き、`expandable_fields` のフィールドを
+    展開が指定された場合にだけネストしたオブジェクトに置き換える。
+    ネストしたシリアライザーも、ルートからのフィールド名のパスで同じ指定に従う。
+
+    :param expandable_fields: フィールド名をキーとした、展開時に使う（シリアライザークラス, 引数）
+    """
+
+    expandable_fields = {}
+
+    def get_field_path(self) -> list[str]:
+        """
+        ルートのシリアライザーからのフィールド名のパスを返す
+
+        :return: フィールド名のリスト
+        """
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return path
+
+    def get_fields(self):
+        """
+        選択されたフィールドを返す
+
+        :return: フィールド名をキーとしたフィールド
+        :raises ValidationError: 存在しないフィールドが指定された場合
+        """
+        fields = super().get_fields()
+        path = self.get_field_path()
+        selected = get_field_paths(self.context.get(FIELDS_PARAM), path)
+        expand = get_field_paths(self.context.get(EXPAND_PARAM), path) or {}
+
+        for name, nested in expand.items():
+            if name in self.expandable_fields:
+                serializer_class, kwargs = self.expandable_fields[name]
+                fields[name] = serializer_class(**kwargs)
+            elif not nested or name not in fields:
+                # 下位のパスを持つ指定（comments.postなど）はネストしたシリアライザーが処理する
+                raise ValidationError({EXPAND_PARAM: [f'Unknown relation: {".".join([*path, name])}']})
+
+        if selected is None:
+            return fields
+        unknown = sorted(set(selected) - set(fields))
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: [f'Unknown field: {".".join([*path, unknown[0]])}']})
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+# 組み立てた関数を保持する組み合わせ（シリアライザーのクラス・選択されたフィールドなど）の上限
+MAX_CACHED_READERS = 256
+_readers_cache = {}
+# 保持する関数を組み立てる、リクエストを持たない複製のcontextに付けるキー
+DETACHED_CONTEXT = 'detached_readers'
+
+# インスタンス・コンテキストに依存しないDRFのto_representation
+_PURE_REPRESENTATIONS = {
+    serializers.BooleanField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.ChoiceField.to_representation,
+    serializers.DateField.to_representation,
+    serializers.DateTimeField.to_representation,
+    serializers.FloatField.to_representation,
+    serializers.IntegerField.to_representation,
+    serializers.ReadOnlyField.to_representation,
+}
+
+
+def _freeze(tree: dict | None) -> tuple | None:
+    """
+    parse_field_pathsの木構造を辞書のキーに使える形に変換
+
+    :param tree: 木構造（Noneは指定なし）
+    :return: (フィールド名, 部分木) のタプル
+    """
+    if tree is None:
+        return None
+    return tuple(sorted((name, _freeze(nested)) for name, nested in tree.items()))
+
+
+def _identity(value):
+    """
+    値をそのまま返す
+
+    :param value: 値
+    :return: 値
+    """
+    return value
+
+
+def _compile_datetime(field: serializers.DateTimeField):
+    """
+    DateTimeField.to_representationと同じ変換を行う関数を組み立てる
+
+    ISO 8601形式で出力し、タイムゾーン付きの日時は現在のタイムゾーン（Asia/Tokyo）に変換する。
+    それ以外の書式・値はフィールドの処理に委ねる
+
+    :param field: フィールド
+    :return: 変換する関数
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if not isinstance(output_format, str) or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def represent(value):
+        if type(value) is not datetime or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return represent
+
+
+class FastReadSerializerMixin(SparseFieldsetSerializerMixin):
+    """
+    フィールドごとに組み立てた関数で出力を生成するシリアライザーのMixin
+
+    ModelSerializerはインスタンスごとにモデルを調べてフィールドを生成し、
+    to_representationは行・フィールドごとに汎用の属性の取得（get_attribute）と
+    PKOnlyObjectの判定を行う。このMixinは選択されたフィールドごとの
+    (フィールド名, 値の取得, 変換) を組み立て、以降の行ではそれを順に適用する。
+    モデルのフィールド・外部キーはattrgetterで直接読み、文字列・整数・日時の変換は
+    フィールドのto_representationと同じ処理を直接行う。それ以外のフィールドや
+    モデル以外のインスタンスはDRFの処理に委ねるため、出力は標準のシリアライザーと一致する。
+
+    組み立てた関数がリクエストに依存しない場合は、クラス・`?fields=`・`?expand=`・
+    タイムゾーンの組み合わせごとに保持し、以降のリクエストではフィールドの生成も省く。
+    フィールドの定義は変えないため、drf-spectacularのスキーマも変わらない。
+
+    `FAST_READ_SERIALIZERS = False` で標準の処理に戻す
+    """
+
+    def get_readers_key(self) -> tuple:
+        """
+        組み立てた関数を保持するキーを返す
+
+        :return: (クラス, 選択されたフィールド, 展開するフィールド, タイムゾーン)
+        """
+        path = self.get_field_path()
+        return (
+            type(self),
+            _freeze(get_field_paths(self.context.get(FIELDS_PARAM), path)),
+            _freeze(get_field_paths(self.context.get(EXPAND_PARAM), path)),
+            timezone.get_current_timezone_name(),
+        )
+
+    def get_readers(self) -> list[tuple] | None:
+        """
+        フィールドごとの (フィールド名, 値の取得, 変換) を返す
+
+        :return: 組み立てた関数のリスト（無効な場合はNone）
+        """
+        if hasattr(self, '_readers'):
+            return self._readers
+        self._readers = None
+        self._readers_pure = False
+        if not getattr(settings, 'FAST_READ_SERIALIZERS', True):
+            return None
+
+        key = self.get_readers_key()
+        readers = _readers_cache.get(key)
+        if readers is not None:
+            self._readers = readers
+            self._readers_pure = True
+            return readers
+
+        compiled = [self.compile_reader(field) for field in self._readable_fields]
+        self._readers = [reader for reader, _ in compiled]
+        self._readers_pure = all(pure for _, pure in compiled)
+        if not self._readers_pure:
+            return self._readers
+        if self.context.get(DETACHED_CONTEXT):
+            if len(_readers_cache) >= MAX_CACHED_READERS:
+                _readers_cache.pop(next(iter(_readers_cache), None), None)
+            _readers_cache[key] = self._readers
+        else:
+            # 組み立てた関数はフィールドを通じてcontext（リクエストを含む）を参照するため、
+            # 保持する関数はリクエストを持たない複製から組み立てる
+            self.get_detached_serializer().get_readers()
+        return self._readers
+
+    def get_detached_serializer(self) -> 'FastReadSerializerMixin':
+        """
+        同じフィールドを選択した、リクエストを持たない複製を返す
+
+        ネストしたシリアライザーの場合は、このシリアライザーをルートとした複製を返す
+
+        :return: シリアライザー
+        """
+        path = self.get_field_path()
+        context = {
+            FIELDS_PARAM: get_field_paths(self.context.get(FIELDS_PARAM), path),
+            EXPAND_PARAM: get_field_paths(self.context.get(EXPAND_PARAM), path),
+            DETACHED_CONTEXT: True,
+        }
+        return type(self)(context=context)
+
+    def compile_reader(self, field) -> tuple[tuple, bool]:
+        """
+        1フィールドの (フィールド名, 値の取得, 変換) を組み立てる
+
+        :param field: フィールド
+        :return: ((フィールド名, 値の取得, 変換), リクエストに依存しないかどうか)
+        """
+        model_field = None
+        if len(field.source_attrs) == 1:
+            try:
+                model_field = self.Meta.model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                pass
+        if model_field is not None and (not model_field.concrete or model_field.many_to_many):
+            model_field = None
+
+        if model_field is not None and model_field.is_relation:
+            if isinstance(field, serializers.PrimaryKeyRelatedField):
+                if field.use_pk_only_optimization() and field.pk_field is None:
+                    # 関連先を読み込まずに外部キーの値（post_idなど）を出力する
+                    return (field.field_name, attrgetter(model_field.attname), _identity), True
+                model_field = None
+            elif not isinstance(field, FastReadSerializerMixin):
+                model_field = None
+
+        if model_field is None:
+            getter = self.compile_fallback_getter(field)
+            pure = type(field).get_attribute is serializers.Field.get_attribute
+        else:
+            getter = attrgetter(model_field.name)
+            pure = True
+        represent, pure_representation = self.compile_representation(field)
+        return (field.field_name, getter, represent), pure and pure_representation
+
+    def compile_fallback_getter(self, field):
+        """
+        Field.get_attributeで値を取得する関数を組み立てる
+
+        :param field: フィールド
+        :return: 値を取得する関数（SkipFieldを送出することがある）
+        """
+
+        def get(instance):
+            attribute = field.get_attribute(instance)
+            if isinstance(attribute, PKOnlyObject) and attribute.pk is None:
+                return None
+            return attribute
+
+        return get
+
+    def compile_representation(self, field) -> tuple:
+        """
+        値を出力用に変換する関数を組み立てる
+
+        :param field: フィールド
+        :return: (変換する関数, リクエストに依存しないかどうか)
+        """
+        if isinstance(field, FastReadSerializerMixin):
+            field.get_readers()
+            return field.to_representation, field._readers_pure
+        if isinstance(field, serializers.ListSerializer) and isinstance(field.child, FastReadSerializerMixin):
+            child = field.child
+            child.get_readers()
+
+            def represent(value):
+                if isinstance(value, BaseManager):
+                    value = value.all()
+                return [child.to_representation(item) for item in value]
+
+            return represent, child._readers_pure
+        method = type(field).to_representation
+        if method is serializers.CharField.to_representation:
+            return str, True
+        if method is serializers.IntegerField.to_representation:
+            return int, True
+        if method is serializers.DateTimeField.to_representation:
+            return _compile_datetime(field), True
+        return field.to_representation, method in _PURE_REPRESENTATIONS
+
+    def to_representation(self, instance):
+        """
+        インスタンスを出力用の辞書に変換
+
+        :param instance: モデルのインスタンス
+        :return: フィールド名をキーとした辞書
+        """
+        readers = self.get_readers()
+        if readers is None or not isinstance(instance, self.Meta.model):
+            return super().to_representation(instance)
+        ret = {}
+        for name, get, represent in readers:
+            try:
+                attribute = get(instance)
+            except SkipField:
+                continue
+            except ObjectDoesNotExist:
+                attribute = None
+            ret[name] = None if attribute is None else represent(attribute)
+        return ret
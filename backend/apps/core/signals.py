@@ -0,0 +1,385 @@
+"""
+シグナルレシーバー
+
+モデルへの書き込みに合わせて投稿のコメント数を更新し、キャッシュを無効化する。
+コメント数は書き込み元のトランザクション内で更新されるため、
+コメントの保存・削除をtransaction.atomicで囲めばまとめてコミットされる。
+キャッシュのタグのバージョンはbump_tagsがコミット後に上げる。
+
+レスポンスキャッシュのタグは以下の通り。
+
+- `posts`: 公開投稿の一覧の構成（公開投稿の追加・削除・公開状態の変更）
+- `post:<id>`: 投稿の内容とそのコメント
+- `user:<id>`: 公開されるユーザー情報
+- `users`: いずれかのユーザーの公開される情報（条件付きGETの検証値、apps.core.conditional）
+- `auth-user:<id>`: JWT認証でキャッシュするユーザーのスナップショット（apps.core.authentication）
+
+投稿・コメントの削除は差分同期（apps.core.sync）のためTombstoneに記録する。
+
+一括書き込み（apps.core.bulk）は `bulk_writes()` の中で行い、
+行ごとのレシーバーを止めてコメント数の更新と無効化をまとめて反映する。
+
+マイグレーションの後に、テーブルの作り直しで消えた全文検索の同期用トリガーを作り直す。
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import SNAPSHOT_FIELDS, auth_user_tag
+from .cache import bump_tags
+from .conditional import USERS_TAG
+from .models import Comment, Post, User
+from .pagination import count_cache_tag
+from .search import ensure_search_triggers, has_search_index, rebuild_search_index
+from .sync import record_tombstones
+
+logger = logging.getLogger(__name__)
+
+_bulk_writes = ContextVar('bulk_writes', default=False)
+# 削除の起点（シグナルのorigin）に進行中の削除（PendingDeletion）を記録する属性名
+PENDING_DELETION_ATTR = '_pending_deletion'
+
+
+@contextmanager
+def bulk_writes():
+    """
+    行ごとのレシーバーを止めるコンテキストマネージャー
+
+    呼び出し側がコメント数の更新とキャッシュの無効化をまとめて行う
+    """
+    token = _bulk_writes.set(True)
+    try:
+        yield
+    finally:
+        _bulk_writes.reset(token)
+
+
+def _skip_in_bulk(receiver_func):
+    """
+    一括書き込み中は何もしないようにするデコレーター
+
+    :param receiver_func: シグナルレシーバー
+    :return: ラップしたレシーバー
+    """
+
+    @wraps(receiver_func)
+    def wrapper(*args, **kwargs):
+        if _bulk_writes.get():
+            return None
+        return receiver_func(*args, **kwargs)
+
+    return wrapper
+
+
+def _change_comment_count(post_id: int, delta: int) -> None:
+    """
+    投稿のコメント数を増減
+
+    投稿の更新日時は変えない（コメントの書き込みは投稿の編集ではない）
+
+    :param post_id: 投稿ID
+    :param delta: 増減数
+    """
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        # ずれたカウンターが負にならないようにする（ずれはreconcile_comment_countsで修正する）
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+class PendingDeletion:
+    """
+    投稿の削除（カスケード削除を含む）1回の進行状況
+
+    Djangoは削除するすべての行のpre_deleteを送った後、コメント、投稿の順に削除して
+    行ごとにpost_deleteを送る。削除される投稿のIDをpre_deleteで記録し、
+    コメントのレシーバーが投稿ごと消えるコメントを判別できるようにする。
+    削除した行のIDはここに集め、最後の投稿の削除後にまとめてTombstoneに記録する
+    """
+
+    def __init__(self):
+        self.post_ids = set()
+        self.deleted = {Post: [], Comment: []}
+
+    def flush(self) -> None:
+        """集めた削除をTombstoneに記録"""
+        for model, object_ids in self.deleted.items():
+            record_tombstones(model, object_ids)
+            object_ids.clear()
+
+
+def _pending_deletion(origin) -> PendingDeletion | None:
+    """
+    削除の起点で進行中の投稿の削除を返す
+
+    :param origin: 削除の起点（delete()を呼び出したインスタンス・QuerySet）
+    :return: 投稿を削除していない場合はNone
+    """
+    return getattr(origin, PENDING_DELETION_ATTR, None)
+
+
+def _post_is_deleting(comment: Comment, origin) -> bool:
+    """
+    コメントが投稿の削除に伴ってカスケード削除されているかどうか
+
+    :param comment: 削除されたコメント
+    :param origin: 削除の起点
+    :return: 投稿も同じ削除で消える場合True
+    """
+    pending = _pending_deletion(origin)
+    return pending is not None and comment.post_id in pending.post_ids
+
+
+@receiver(pre_delete, sender=Post)
+@_skip_in_bulk
+def remember_deleting_post(sender, instance: Post, origin=None, **kwargs) -> None:
+    """
+    削除される投稿のIDを削除の起点に記録
+
+    コメントのレシーバーはこの記録で投稿ごと消えるコメントを判別し、コメント数の更新などを省く
+
+    :param sender: モデルクラス
+    :param instance: 削除される投稿
+    :param origin: 削除の起点
+    :param kwargs: シグナル引数
+    """
+    if origin is None:
+        return
+    pending = _pending_deletion(origin)
+    if pending is None:
+        pending = PendingDeletion()
+        setattr(origin, PENDING_DELETION_ATTR, pending)
+    pending.post_ids.add(instance.pk)
+
+
+@receiver(pre_save, sender=Comment)
+@_skip_in_bulk
+def remember_comment_post(sender, instance: Comment, **kwargs) -> None:
+    """
+    保存前のコメントの投稿IDを記録
+
+    :param sender: モデルクラス
+    :param instance: 保存されるコメント
+    :param kwargs: シグナル引数
+    """
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk).values_list('post_id', flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Comment)
+@_skip_in_bulk
+def update_comment_count_on_save(sender, instance: Comment, created: bool, **kwargs) -> None:
+    """
+    コメントの作成・付け替え時に投稿のコメント数を更新
+
+    :param sender: モデルクラス
+    :param instance: 保存されたコメント
+    :param created: 新規作成かどうか
+    :param kwargs: シグナル引数
+    """
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        _change_comment_count(instance.post_id, 1)
+    elif previous_post_id is not None and previous_post_id != instance.post_id:
+        _change_comment_count(previous_post_id, -1)
+        _change_comment_count(instance.post_id, 1)
+        bump_tags(f'post:{previous_post_id}')
+
+
+@receiver(post_delete, sender=Comment)
+@_skip_in_bulk
+def update_comment_count_on_delete(sender, instance: Comment, origin=None, **kwargs) -> None:
+    """
+    コメントの削除時に投稿のコメント数を減らす
+
+    投稿やユーザーの削除に伴うカスケード削除でも呼ばれる。
+    投稿ごと削除される場合は、消える投稿のカウンターを更新しない
+
+    :param sender: モデルクラス
+    :param instance: 削除されたコメント
+    :param origin: 削除の起点
+    :param kwargs: シグナル引数
+    """
+    if _post_is_deleting(instance, origin):
+        return
+    _change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@_skip_in_bulk
+def invalidate_count_cache(sender, **kwargs) -> None:
+    """
+    投稿・コメントの書き込み時に件数キャッシュを無効化
+
+    :param sender: 書き込まれたモデルクラス
+    :param kwargs: シグナル引数
+    """
+    bump_tags(count_cache_tag(sender))
+
+
+@receiver(pre_save, sender=Post)
+@_skip_in_bulk
+def remember_post_published(sender, instance: Post, **kwargs) -> None:
+    """
+    保存前の公開状態を記録
+
+    :param sender: モデルクラス
+    :param instance: 保存される投稿
+    :param kwargs: シグナル引数
+    """
+    instance._was_published = (
+        Post.objects.filter(pk=instance.pk).values_list('is_published', flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Post)
+@_skip_in_bulk
+def invalidate_post_on_save(sender, instance: Post, created: bool, **kwargs) -> None:
+    """
+    投稿の保存時にレスポンスキャッシュを無効化
+
+    非公開のまま更新された投稿は公開APIに影響しないため無効化しない
+
+    :param sender: モデルクラス
+    :param instance: 保存された投稿
+    :param created: 新規作成かどうか
+    :param kwargs: シグナル引数
+    """
+    was_published = bool(getattr(instance, '_was_published', None))
+    if was_published != instance.is_published:
+        bump_tags('posts', f'post:{instance.pk}')
+    elif instance.is_published:
+        bump_tags(f'post:{instance.pk}')
+
+
+@receiver(post_delete, sender=Post)
+@_skip_in_bulk
+def invalidate_post_on_delete(sender, instance: Post, **kwargs) -> None:
+    """
+    投稿の削除時にレスポンスキャッシュを無効化
+
+    :param sender: モデルクラス
+    :param instance: 削除された投稿
+    :param kwargs: シグナル引数
+    """
+    if instance.is_published:
+        bump_tags('posts', f'post:{instance.pk}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@_skip_in_bulk
+def invalidate_comment_post(sender, instance: Comment, origin=None, **kwargs) -> None:
+    """
+    コメントの書き込み時に対象投稿のレスポンスキャッシュを無効化
+
+    投稿ごと削除される場合は、投稿の削除時の無効化に任せる
+
+    :param sender: モデルクラス
+    :param instance: 書き込まれたコメント
+    :param origin: 削除の起点（削除時のみ）
+    :param kwargs: シグナル引数
+    """
+    if _post_is_deleting(instance, origin):
+        return
+    bump_tags(f'post:{instance.post_id}')
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@_skip_in_bulk
+def record_tombstone(sender, instance, origin=None, **kwargs) -> None:
+    """
+    投稿・コメントの削除を差分同期のために記録
+
+    投稿やユーザーの削除に伴うカスケード削除でも呼ばれる。
+    投稿を含む削除では行ごとに記録せず、最後の投稿を削除した後にまとめて記録する
+
+    :param sender: モデルクラス
+    :param instance: 削除された投稿・コメント
+    :param origin: 削除の起点
+    :param kwargs: シグナル引数
+    """
+    pending = _pending_deletion(origin)
+    if pending is None or not pending.post_ids:
+        record_tombstones(sender, [instance.pk])
+        return
+    pending.deleted[sender].append(instance.pk)
+    if sender is Post:
+        # コメントは投稿より先に削除されるため、投稿がすべて消えた時点で記録が揃う
+        pending.post_ids.discard(instance.pk)
+        if not pending.post_ids:
+            pending.flush()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance: User, update_fields=None, **kwargs) -> None:
+    """
+    ユーザーの書き込み時にレスポンスキャッシュを無効化
+
+    公開されるユーザー名を含まない部分更新（last_loginなど）では無効化しない
+
+    :param sender: モデルクラス
+    :param instance: 書き込まれたユーザー
+    :param update_fields: 更新されたフィールド
+    :param kwargs: シグナル引数
+    """
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    bump_tags(f'user:{instance.pk}', USERS_TAG)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_user(sender, instance: User, update_fields=None, **kwargs) -> None:
+    """
+    ユーザーの書き込み時に認証用のスナップショットを無効化
+
+    無効化・パスワード変更を含め、スナップショットの内容を変える書き込みで無効化する
+    （last_loginのみの更新などでは無効化しない）
+
+    :param sender: モデルクラス
+    :param instance: 書き込まれたユーザー
+    :param update_fields: 更新されたフィールド
+    :param kwargs: シグナル引数
+    """
+    if update_fields is not None and not set(update_fields) & {*SNAPSHOT_FIELDS, 'password'}:
+        return
+    bump_tags(auth_user_tag(instance.pk))
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using: str, **kwargs) -> None:
+    """
+    マイグレーションの後に全文検索の同期用トリガーを作り直す
+
+    SQLiteでposts・commentsテーブルを作り直すマイグレーションはトリガーを消すため、
+    不足したトリガーを作成し、トリガーがない間の書き込みを含めてインデックスを作り直す
+
+    :param sender: マイグレーションを実行したアプリの設定
+    :param using: データベースのエイリアス
+    :param kwargs: シグナル引数
+    """
+    if sender.label != Post._meta.app_label or not has_search_index(using):
+        return
+    with transaction.atomic(using=using):
+        created = ensure_search_triggers(using)
+        if not created:
+            return
+        total = rebuild_search_index(using=using)
+    logger.warning('Recreated search triggers %s and reindexed %d rows', ', '.join(created), total)
@@ -0,0 +1,244 @@
+"""
+差分同期
+
+前回の同期以降に作成・更新された行と、削除された行のIDを返す。
+同期の位置は同期トークンで受け渡し、
+削除はTombstoneに記録したIDを返す（記録はapps.core.signals・apps.core.bulkが行う）。
+コメントの書き込みは投稿の更新日時を変えないため、投稿の `comment_count` の変化は
+投稿の差分には含まれない。クライアントはコメントの差分から反映する。
+"""
+import base64
+import json
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .pagination import KeysetPagination
+
+# 差分同期の対象モデル
+SYNC_MODELS = ('core.post', 'core.comment')
+TOMBSTONE_BATCH_SIZE = 500
+
+
+class SyncTokenExpired(APIException):
+    """
+    削除記録の保存期間より古い位置からの同期を要求された場合の例外
+
+    クライアントは一覧を取得し直し、同期トークンなしの同期からやり直す
+    """
+
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The sync token has expired. Reload the full list and start a new sync.'
+    default_code = 'sync_token_expired'
+
+
+def record_tombstones(model, object_ids: Iterable[int]) -> None:
+    """
+    削除した行のIDを記録
+
+    :param model: 削除した行のモデルクラス
+    :param object_ids: 削除した行のID
+    """
+    label = model._meta.label_lower
+    Tombstone.objects.bulk_create(
+        [Tombstone(model=label, object_id=pk) for pk in object_ids], batch_size=TOMBSTONE_BATCH_SIZE
+    )
+
+
+def purge_tombstones(before: datetime) -> int:
+    """
+    指定日時より前の削除記録を削除
+
+    :param before: 基準日時
+    :return: 削除した件数
+    """
+    deleted, _ = Tombstone.objects.filter(model__in=SYNC_MODELS, deleted_at__lt=before).delete()
+    return deleted
+
+
+def encode_sync_token(position: tuple[datetime, int], deleted_position: tuple[datetime, int]) -> str:
+    """
+    同期トークンを生成
+
+    :param position: 返した行の位置 (更新日時, ID)
+    :param deleted_position: 返した削除記録の位置 (削除日時, 削除記録のID)
+    :return: URLセーフな同期トークン
+    """
+    (updated_at, pk), (deleted_at, tombstone_pk) = position, deleted_position
+    payload = {'t': updated_at.isoformat(), 'i': pk, 'd': deleted_at.isoformat(), 'j': tombstone_pk}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_sync_token(token: str) -> tuple[tuple[datetime, int], tuple[datetime, int]]:
+    """
+    同期トークンを復元
+
+    :param token: 同期トークン
+    :return: ((更新日時, ID), (削除日時, 削除記録のID))
+    :raises ValidationError: 同期トークンが不正な場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        position = (datetime.fromisoformat(payload['t']), int(payload['i']))
+        deleted_position = (datetime.fromisoformat(payload['d']), int(payload.get('j', 0)))
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise ValidationError({'sync_token': ['Invalid sync token.']})
+    # 発行したトークンの日時は常にタイムゾーン付きのため、それ以外は改ざんとして扱う
+    if timezone.is_naive(position[0]) or timezone.is_naive(deleted_position[0]):
+        raise ValidationError({'sync_token': ['Invalid sync token.']})
+    return position, deleted_position
+
+
+def sync_filter(queryset: QuerySet, updated_at: datetime, pk: int, field: str = 'updated_at') -> QuerySet:
+    """
+    基準位置より後に更新された行に絞り込み、更新順に並べる
+
+    `(updated_at, id) > (基準値)` をkeyset_filterと同じ形で表し、updated_atのインデックスで範囲検索する
+
+    :param queryset: 対象のQuerySet
+    :param updated_at: 基準の更新日時
+    :param pk: 基準行のID
+    :param field: 並べ替えに使う日時のフィールド名（削除記録はdeleted_at）
+    :return: 絞り込み・並べ替え済みのQuerySet
+    """
+    return queryset.filter(
+        Q(**{f'{field}__gte': updated_at}) & (Q(**{f'{field}__gt': updated_at}) | Q(id__gt=pk))
+    ).order_by(field, 'id')
+
+
+class SyncPagination(KeysetPagination):
+    """
+    差分同期のページネーション
+
+    `?sync_token=`（前回の応答の `sync_token`）または `?updated_since=`（ISO 8601の日時）より後に
+    作成・更新された行を更新順に返し、前回の同期以降に削除された行のIDを `deleted` で返す。
+    どちらも指定しない場合は全件を更新順に返す（初回の同期）。
+    `has_more` がtrueの間は続きがあり、返された `sync_token` で続けて取得する。
+    行と削除記録はそれぞれページの件数まで返す。
+
+    同期トークンは行の位置 (updated_at, id) と削除記録の位置 (deleted_at, id) を持つ。
+    書き込みのコミットが日時の採番より遅れても取りこぼさないよう、どちらの位置も
+    `SYNC_SAFETY_WINDOW` 秒前（確定時刻）までしか進めない。確定時刻より新しい行も返すが、
+    位置はその手前に留めるため次回の同期でも再度返る。クライアントはIDで上書きし、
+    `results` を反映した後に `deleted` を反映する。
+    ページが確定時刻より新しい行に達した場合は、残りも次回の同期で返るため `has_more` をfalseにする。
+    レスポンスの形がページネーションと異なるため、スキーマはビューのextend_schemaで指定する
+
+    :param sync_token_query_param: 同期トークン指定用クエリパラメータ
+    :param updated_since_query_param: 基準日時指定用クエリパラメータ
+    """
+
+    sync_token_query_param = 'sync_token'
+    updated_since_query_param = 'updated_since'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        """
+        基準位置より後に更新された行と削除記録をページ分取得
+
+        :param queryset: 対象のQuerySet
+        :param request: リクエスト
+        :param view: ビュー
+        :return: ページ内の行
+        """
+        self.request = request
+        self.model = queryset.model
+        self.settled_at = timezone.now() - timedelta(seconds=settings.SYNC_SAFETY_WINDOW)
+        position, deleted_position = self.get_position(request)
+        if position is not None:
+            queryset = sync_filter(queryset, *position)
+        else:
+            queryset = queryset.order_by('updated_at', 'id')
+
+        page_size = self.get_page_size(request)
+        self.page, self.position, rows_more = self.paginate_positions(
+            queryset, page_size, position, lambda row: (row.updated_at, row.pk)
+        )
+        # 初回の同期ではクライアントが保持する行がないため、削除記録を返さない
+        tombstones = Tombstone.objects.filter(model=self.model._meta.label_lower, deleted_at__lte=self.settled_at)
+        if deleted_position is not None:
+            tombstones, self.deleted_position, deleted_more = self.paginate_positions(
+                sync_filter(tombstones, *deleted_position, field='deleted_at'),
+                page_size,
+                deleted_position,
+                lambda tombstone: (tombstone.deleted_at, tombstone.pk),
+            )
+            self.deleted = [tombstone.object_id for tombstone in tombstones]
+        else:
+            self.deleted_position, deleted_more = (self.settled_at, 0), False
+            self.deleted = []
+        self.has_more = rows_more or deleted_more
+        return self.page
+
+    def paginate_positions(self, queryset: QuerySet, page_size: int, position: tuple | None, get_position) -> tuple:
+        """
+        位置の順に並べたQuerySetからページ分を取得し、次の位置を求める
+
+        次の位置は確定時刻より後に進めない。ページの末尾が確定時刻を超えた場合は、
+        確定した行をすべて返したため続きはないものとする
+
+        :param queryset: 位置の順に並べたQuerySet
+        :param page_size: ページの件数
+        :param position: 基準位置（初回の同期ではNone）
+        :param get_position: 行から位置 (日時, ID) を求める関数
+        :return: (ページ内の行, 次の位置, 続きがあるかどうか)
+        """
+        settled = (self.settled_at, 0)
+        # 1件多く取得して続きの有無を判定する
+        rows = list(queryset[: page_size + 1])
+        page = rows[:page_size]
+        if len(rows) > page_size and get_position(page[-1]) <= settled:
+            return page, get_position(page[-1]), True
+        return page, max(position, settled) if position is not None else settled, False
+
+    def get_position(self, request: Request) -> tuple[tuple[datetime, int] | None, tuple[datetime, int] | None]:
+        """
+        クエリパラメータから同期の基準位置を取得
+
+        :param request: リクエスト
+        :return: ((基準の更新日時, 基準行のID), (削除記録の基準日時, 削除記録のID))。指定がない場合は (None, None)
+        :raises ValidationError: 同期トークン・日時が不正な場合
+        :raises SyncTokenExpired: 削除記録の基準日時が保存期間より古い場合
+        """
+        params = request.query_params
+        if params.get(self.sync_token_query_param):
+            position, deleted_position = decode_sync_token(params[self.sync_token_query_param])
+        elif params.get(self.updated_since_query_param):
+            since = parse_datetime(params[self.updated_since_query_param])
+            if since is None:
+                raise ValidationError({self.updated_since_query_param: ['Enter a valid ISO 8601 date/time.']})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            position, deleted_position = (since, 0), (since, 0)
+        else:
+            return None, None
+
+        if deleted_position[0] < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise SyncTokenExpired()
+        return position, deleted_position
+
+    def get_paginated_response(self, data: list) -> Response:
+        """
+        差分同期のレスポンスを返す
+
+        :param data: ページネーション済みデータ
+        :return: 更新された行・削除された行のID・次の同期トークンを含むレスポンス
+        """
+        return Response(
+            {
+                'results': data,
+                'deleted': self.deleted,
+                'sync_token': encode_sync_token(self.position, self.deleted_position),
+                'has_more': self.has_more,
+            }
+        )
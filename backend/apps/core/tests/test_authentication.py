@@ -0,0 +1,43 @@
+"""
+JWT認証のユーザーのスナップショットのテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.models import User
+
+TOKEN_URL = f'/api/{settings.API_VERSION}/token/'
+POSTS_URL = f'/api/{settings.API_VERSION}/dashboard/posts/'
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """ユーザーのスナップショットのキャッシュと無効化のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', username='user', password='password')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        response = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'password'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["access"]}')
+
+    def test_timeout_is_short(self):
+        # プロセスごとのキャッシュでは他のプロセスの無効化がこの秒数だけ遅れる
+        self.assertLessEqual(settings.AUTH_USER_CACHE_TIMEOUT, 30)
+
+    def test_snapshot_is_reused(self):
+        self.assertEqual(self.client.get(POSTS_URL).status_code, 200)
+        # シグナルを送らない書き込みはスナップショットに反映されない
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(POSTS_URL).status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.client.get(POSTS_URL).status_code, 200)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.client.get(POSTS_URL).status_code, 401)
@@ -0,0 +1,71 @@
+"""
+一括操作APIのテスト
+"""
+from django.conf import settings
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.models import Comment, Post, User
+
+POSTS_BULK_URL = f'/api/{settings.API_VERSION}/dashboard/posts/bulk/'
+COMMENTS_BULK_URL = f'/api/{settings.API_VERSION}/dashboard/comments/bulk/'
+
+
+class BulkValidationTests(TestCase):
+    """一括操作の要素ごとの検証のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+        cls.post = Post.objects.create(title='Original', content='Body', author=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_update_rejects_boolean_id(self):
+        response = self.client.patch(POSTS_BULK_URL, [{'id': True, 'title': 'Changed'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        [result] = response.json()['results']
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('id', result['errors'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'Original')
+
+    def test_bulk_update_coerces_numeric_string_id(self):
+        response = self.client.patch(POSTS_BULK_URL, [{'id': str(self.post.id), 'title': 'Changed'}], format='json')
+        [result] = response.json()['results']
+        self.assertEqual(result, {'index': 0, 'id': self.post.id, 'status': 'updated', 'errors': None})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'Changed')
+
+    def test_bulk_update_reports_missing_and_duplicate_ids(self):
+        items = [{'title': 'No id'}, {'id': self.post.id}, {'id': self.post.id}, {'id': 0}, 'not an object']
+        response = self.client.patch(POSTS_BULK_URL, items, format='json')
+        statuses = [(result['status'], sorted(result['errors'] or {})) for result in response.json()['results']]
+        self.assertEqual(
+            statuses,
+            [
+                ('error', ['id']),
+                ('updated', []),
+                ('error', ['id']),
+                ('error', ['id']),
+                ('error', ['non_field_errors']),
+            ],
+        )
+
+    def test_bulk_create_comments_coerces_numeric_string_post(self):
+        items = [{'post': str(self.post.id), 'content': 'First'}, {'post': self.post.id, 'content': 'Second'}]
+        # セーブポイントの作成・投稿の存在確認・コメントの作成・コメント数の更新・セーブポイントの解放
+        with self.assertNumQueries(5):
+            response = self.client.post(COMMENTS_BULK_URL, items, format='json')
+        self.assertEqual([result['status'] for result in response.json()['results']], ['created', 'created'])
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 2)
+
+    def test_bulk_create_comments_rejects_unknown_and_boolean_post(self):
+        items = [{'post': self.post.id + 1, 'content': 'Missing'}, {'post': True, 'content': 'Boolean'}]
+        response = self.client.post(COMMENTS_BULK_URL, items, format='json')
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['error', 'error'])
+        self.assertEqual([list(result['errors']) for result in results], [['post'], ['post']])
+        self.assertFalse(Comment.objects.exists())
@@ -0,0 +1,43 @@
+"""
+投稿のコメント数（Post.comment_count）のテスト
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.core.cache import get_tag_versions
+from apps.core.models import Comment, Post, User
+from apps.core.pagination import count_cache_tag
+
+
+class CommentCountTests(TestCase):
+    """コメント数の更新と整合のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+        cls.post = Post.objects.create(title='Post', content='Body', author=cls.user, is_published=True)
+
+    def test_comment_writes_keep_post_updated_at(self):
+        updated_at = self.post.updated_at
+        comment = Comment.objects.create(post=self.post, author=self.user, content='Comment')
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.updated_at), (1, updated_at))
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.updated_at), (0, updated_at))
+
+    def test_reconcile_fixes_drift_and_invalidates_caches(self):
+        Post.objects.filter(pk=self.post.pk).update(comment_count=5)
+        updated_at = self.post.updated_at
+        tags = [count_cache_tag(Post), f'post:{self.post.pk}']
+        before = get_tag_versions(tags)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reconcile_comment_counts', stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.updated_at), (0, updated_at))
+        after = get_tag_versions(tags)
+        self.assertTrue(all(after[tag] != before[tag] for tag in tags))
@@ -0,0 +1,65 @@
+"""
+条件付きGETのテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.models import Comment, Post, User
+
+# レスポンスキャッシュを通さずに検証値を確認するため、dashboardのAPIを使う
+POSTS_URL = f'/api/{settings.API_VERSION}/dashboard/posts/'
+
+
+class ConditionalGetTests(TestCase):
+    """投稿の一覧・詳細の検証値のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+        cls.post = Post.objects.create(title='Post', content='Body', author=cls.user, is_published=True)
+        cls.comment = Comment.objects.create(post=cls.post, author=cls.user, content='Comment')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_not_modified(self, url: str, etag: str, expected: bool):
+        """
+        ETagを指定したリクエストが304になるかどうかを検査
+
+        :param url: URL
+        :param etag: If-None-Matchに指定するETag
+        :param expected: 304になる場合True
+        """
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304 if expected else 200)
+
+    def test_list_etag_detects_writes_without_signals(self):
+        etag = self.client.get(POSTS_URL)['ETag']
+        self.assert_not_modified(POSTS_URL, etag, True)
+
+        # 他のプロセスの書き込みと同様に、タグのバージョンを上げずに更新する
+        Post.objects.filter(pk=self.post.pk).update(title='Changed', updated_at=timezone.now())
+        self.assert_not_modified(POSTS_URL, etag, False)
+
+    def test_list_not_modified_runs_single_query(self):
+        etag = self.client.get(POSTS_URL)['ETag']
+        # 最終更新日時と最後の削除の日時をまとめて取得する1回のみ
+        with self.assertNumQueries(1):
+            self.assert_not_modified(POSTS_URL, etag, True)
+
+    def test_detail_etag_changes_on_comment_delete(self):
+        url = f'{POSTS_URL}{self.post.pk}/'
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        self.comment.delete()
+        self.assert_not_modified(url, response['ETag'], False)
+
+    def test_if_modified_since_alone_is_not_honored(self):
+        url = f'{POSTS_URL}{self.post.pk}/'
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
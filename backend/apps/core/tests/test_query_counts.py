@@ -0,0 +1,68 @@
+"""
+投稿の一覧のクエリ数のテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.core.models import Comment, Post, User
+
+DASHBOARD_POSTS_URL = f'/api/{settings.API_VERSION}/dashboard/posts/'
+PORTAL_POSTS_URL = f'/api/{settings.API_VERSION}/portal/posts/'
+
+
+class PostListQueryCountTests(TestCase):
+    """投稿の一覧のクエリ数が件数によらないことのテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_posts(self, count: int):
+        """
+        コメント付きの公開済みの投稿を作成
+
+        :param count: 投稿の件数
+        """
+        for _ in range(count):
+            post = Post.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+            Comment.objects.create(post=post, author=self.user, content='Comment')
+
+    def count_queries(self, url: str) -> int:
+        """
+        一覧の取得で発行されるクエリ数を取得
+
+        :param url: URL
+        :return: クエリ数
+        """
+        # portalのレスポンスキャッシュを通さずに計測する
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(row['comment_count'] == 1 for row in response.json()['results']))
+        return len(context)
+
+    def assert_constant_queries(self, url: str):
+        """
+        投稿の件数を増やしてもクエリ数が変わらないことを検査
+
+        :param url: URL
+        """
+        self.create_posts(1)
+        expected = self.count_queries(url)
+        self.create_posts(20)
+        self.assertEqual(self.count_queries(url), expected)
+
+    def test_dashboard_list(self):
+        self.assert_constant_queries(DASHBOARD_POSTS_URL)
+
+    def test_portal_list(self):
+        self.assert_constant_queries(PORTAL_POSTS_URL)
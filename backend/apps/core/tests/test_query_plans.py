@@ -0,0 +1,27 @@
+"""
+APIのクエリプランのテスト
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+    """各ViewSetのクエリがインデックスを使うことのテスト"""
+
+    def test_querysets_use_indexes(self):
+        stdout = StringIO()
+        try:
+            call_command('check_query_plans', stdout=stdout)
+        except CommandError as error:
+            self.fail(f'{error}\n{stdout.getvalue()}')
+        self.assertNotIn('NG ', stdout.getvalue())
+
+    def test_dropped_index_is_reported(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX posts_created_idx')
+        with self.assertRaises(CommandError):
+            call_command('check_query_plans', stdout=StringIO())
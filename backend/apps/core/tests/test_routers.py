@@ -0,0 +1,57 @@
+"""
+レプリカへの読み取りの振り分けのテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.checks import check_shared_cache
+from apps.core.models import User
+from apps.core.routers import RECENT_WRITE_KEY, _pin_key
+
+TOKEN_URL = f'/api/{settings.API_VERSION}/token/'
+POSTS_URL = f'/api/{settings.API_VERSION}/dashboard/posts/'
+
+
+# テストではdefaultをレプリカとして扱い、振り分けを有効にする
+@override_settings(DATABASE_REPLICAS=['default'])
+class WritePinTests(TestCase):
+    """書き込んだユーザーの読み取りの固定のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='user@example.com', username='user', password='password')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def assert_pinned(self, expected: bool):
+        """
+        書き込みが記録されたかどうかを検査
+
+        :param expected: 記録された場合True
+        """
+        self.assertEqual(cache.get(_pin_key(self.user.pk)) is not None, expected)
+        self.assertEqual(cache.get(RECENT_WRITE_KEY) is not None, expected)
+
+    def test_login_does_not_pin(self):
+        response = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'password'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assert_pinned(False)
+
+    def test_failed_write_does_not_pin(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(POSTS_URL, {'title': ''}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assert_pinned(False)
+
+    def test_successful_write_pins(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(POSTS_URL, {'title': 'Post', 'content': 'Body'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assert_pinned(True)
+
+    def test_process_local_cache_is_reported(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['core.W001'])
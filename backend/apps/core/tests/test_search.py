@@ -0,0 +1,77 @@
+"""
+全文検索のテスト
+
+テスト用のDBはマイグレーションで作成されるため、マイグレーション後の同期用トリガーも検査する
+"""
+from django.conf import settings
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.models import Comment, Post, User
+from apps.core.search import missing_search_triggers
+
+SEARCH_URL = f'/api/{settings.API_VERSION}/portal/search/'
+
+
+class SearchIndexTests(TestCase):
+    """検索インデックスの同期のテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+        cls.post = Post.objects.create(title='Release notes', content='Nothing here', author=cls.user, is_published=True)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def search(self, query: str) -> list[tuple[str, int]]:
+        """
+        公開検索を実行
+
+        :param query: 検索語
+        :return: (種別, ID) のリスト
+        """
+        response = self.client.get(SEARCH_URL, {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['id']) for result in response.json()['results']]
+
+    def test_comment_is_indexed_after_migrations(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, content='Upgrading Django today')
+        self.assertEqual(self.search('Django'), [('comment', comment.id)])
+
+    def test_comment_update_and_delete_are_indexed(self):
+        comment = Comment.objects.create(post=self.post, author=self.user, content='First draft')
+        comment.content = 'Upgrading Django today'
+        comment.save()
+        self.assertEqual(self.search('Django'), [('comment', comment.id)])
+        comment.delete()
+        self.assertEqual(self.search('Django'), [])
+
+    def test_post_is_indexed(self):
+        self.assertEqual(self.search('Release'), [('post', self.post.id)])
+
+    def test_all_triggers_exist(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search_index_%'")
+            names = {name for (name,) in cursor.fetchall()}
+        self.assertEqual(
+            names,
+            {
+                f'search_index_{table}_{event}'
+                for table in ('posts', 'comments')
+                for event in ('insert', 'update', 'delete')
+            },
+        )
+
+    def test_post_migrate_restores_dropped_triggers(self):
+        # テーブルを作り直すマイグレーションと同様にトリガーを消す
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER search_index_comments_insert')
+        comment = Comment.objects.create(post=self.post, author=self.user, content='Upgrading Django today')
+        self.assertEqual(self.search('Django'), [])
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+        self.assertEqual(missing_search_triggers(), [])
+        self.assertEqual(self.search('Django'), [('comment', comment.id)])
@@ -0,0 +1,64 @@
+"""
+読み取り用シリアライザーの高速化した処理のテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core.models import Comment, Post, User
+
+API_URL = f'/api/{settings.API_VERSION}'
+
+
+class FastReadSerializerTests(TestCase):
+    """高速化した処理の出力が標準のto_representationと一致することのテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='author@example.com', username='author', password='password', bio='Bio'
+        )
+        cls.post = Post.objects.create(title='Post', content='Body', author=cls.user, is_published=True)
+        Post.objects.create(title='Draft', content='Body', author=cls.user)
+        for number in range(3):
+            Comment.objects.create(post=cls.post, author=cls.user, content=f'Comment {number}')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url: str, **params) -> bytes:
+        """
+        レスポンスキャッシュを通さずにGETを実行
+
+        :param url: URL
+        :param params: クエリパラメータ
+        :return: レスポンスの本文
+        """
+        cache.clear()
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assert_same_output(self, url: str, **params):
+        """
+        高速化した処理と標準の処理の出力が一致することを検査
+
+        :param url: URL
+        :param params: クエリパラメータ
+        """
+        fast = self.get(url, **params)
+        with override_settings(FAST_READ_SERIALIZERS=False):
+            default = self.get(url, **params)
+        self.assertEqual(fast, default)
+
+    def test_dashboard(self):
+        self.assert_same_output(f'{API_URL}/dashboard/posts/')
+        self.assert_same_output(f'{API_URL}/dashboard/posts/', fields='id,title,author.username,created_at')
+        self.assert_same_output(f'{API_URL}/dashboard/posts/{self.post.pk}/')
+        self.assert_same_output(f'{API_URL}/dashboard/comments/', expand='post')
+
+    def test_portal(self):
+        self.assert_same_output(f'{API_URL}/portal/posts/')
+        self.assert_same_output(f'{API_URL}/portal/posts/{self.post.pk}/')
@@ -0,0 +1,79 @@
+"""
+差分同期のテスト
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.models import Post, Tombstone, User
+
+SYNC_URL = f'/api/{settings.API_VERSION}/dashboard/posts/sync/'
+
+
+class SyncPaginationTests(TestCase):
+    """差分同期のページネーションのテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='author@example.com', username='author', password='password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.since = (timezone.now() - timedelta(days=1)).isoformat()
+
+    def create_post(self, updated_at) -> Post:
+        """
+        更新日時を指定して投稿を作成
+
+        :param updated_at: 更新日時
+        :return: 投稿
+        """
+        post = Post.objects.create(title='Post', content='Body', author=self.user)
+        Post.objects.filter(pk=post.pk).update(updated_at=updated_at)
+        return post
+
+    def sync(self, **params) -> dict:
+        """
+        差分同期を実行
+
+        :param params: クエリパラメータ
+        :return: レスポンスデータ
+        """
+        response = self.client.get(SYNC_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_position_stays_before_safety_window(self):
+        now = timezone.now()
+        self.create_post(now)
+        self.create_post(now)
+        first = self.sync(updated_since=self.since, page_size=1)
+        # 確定時刻より新しい行で止まったページは続きを求めない
+        self.assertFalse(first['has_more'])
+
+        # 確定時刻より前の日時で遅れてコミットされた行
+        late = self.create_post(now - timedelta(seconds=settings.SYNC_SAFETY_WINDOW / 2))
+        second = self.sync(sync_token=first['sync_token'], page_size=10)
+        self.assertIn(late.pk, [row['id'] for row in second['results']])
+
+    def test_deleted_ids_are_paginated(self):
+        deleted_at = timezone.now() - timedelta(hours=1)
+        Tombstone.objects.bulk_create([Tombstone(model='core.post', object_id=pk) for pk in (11, 12, 13)])
+        Tombstone.objects.update(deleted_at=deleted_at)
+
+        data = self.sync(updated_since=self.since, page_size=2)
+        self.assertEqual((data['deleted'], data['has_more']), ([11, 12], True))
+        data = self.sync(sync_token=data['sync_token'], page_size=2)
+        self.assertEqual((data['deleted'], data['has_more']), ([13], False))
+
+    def test_naive_token_is_rejected(self):
+        naive = timezone.now().replace(tzinfo=None).isoformat()
+        raw = json.dumps({'t': naive, 'i': 0, 'd': naive, 'j': 0}).encode()
+        response = self.client.get(SYNC_URL, {'sync_token': base64.urlsafe_b64encode(raw).decode()})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,53 @@
+"""
+リフレッシュトークンの失効のテスト
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.models import RevokedToken, User
+
+TOKEN_URL = f'/api/{settings.API_VERSION}/token/'
+REFRESH_URL = f'/api/{settings.API_VERSION}/token/refresh/'
+
+
+class TokenRotationTests(TestCase):
+    """リフレッシュトークンのローテーションのテスト"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(email='user@example.com', username='user', password='password')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        response = self.client.post(TOKEN_URL, {'email': 'user@example.com', 'password': 'password'}, format='json')
+        self.refresh = response.json()['refresh']
+
+    def rotate(self, refresh: str):
+        """
+        リフレッシュトークンをローテーション
+
+        :param refresh: リフレッシュトークン
+        :return: レスポンス
+        """
+        return self.client.post(REFRESH_URL, {'refresh': refresh}, format='json')
+
+    def test_refresh_does_not_look_up_revoked_tokens(self):
+        # ユーザーの取得・セーブポイントの作成・失効の追加・セーブポイントの解放
+        with self.assertNumQueries(4):
+            response = self.rotate(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(RevokedToken.objects.exists())
+
+    def test_replay_is_rejected(self):
+        new_refresh = self.rotate(self.refresh).json()['refresh']
+        self.assertEqual(self.rotate(self.refresh).status_code, 401)
+        self.assertEqual(self.rotate(new_refresh).status_code, 200)
+
+    def test_replay_is_rejected_after_cache_loss(self):
+        self.assertEqual(self.rotate(self.refresh).status_code, 200)
+        cache.clear()
+        self.assertEqual(self.rotate(self.refresh).status_code, 401)
+        self.assertEqual(RevokedToken.objects.count(), 1)
@@ -0,0 +1,168 @@
+"""
+リフレッシュトークンの失効
+
+`/token/refresh/` のローテーションで使用済みになったリフレッシュトークンを失効させる。
+simplejwtのtoken_blacklistアプリの代わりに、発行済みトークンは記録せず、
+失効したトークンのjtiのみをRevokedTokenとキャッシュに記録する。
+
+- RevokedTokenを正とし、キャッシュは失効済みの判定を速くするためだけに使う
+- ローテーションでは検証時にキャッシュのみを参照し、使用済みかどうかは失効の追加
+  （RevokedTokenの主キーの一意制約）で確定する。未使用のトークンのリフレッシュは
+  キャッシュの参照1回とRevokedTokenの追加1回で済み、キャッシュから追い出された・
+  別のワーカーで失効したトークンも追加に失敗して拒否される
+- ローテーションしない設定では、キャッシュにない場合にRevokedTokenを主キーで参照する
+- 同じトークンの同時の失効は、RevokedTokenの主キーの一意制約で1つだけが成功する
+- 有効期限を過ぎたRevokedTokenはpurge_revoked_tokensで削除する
+"""
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import RevokedToken
+
+REVOKED_KEY_PREFIX = 'revoked-token'
+
+
+def _revoked_key(jti: str) -> str:
+    """
+    失効したトークンのキャッシュキーを返す
+
+    :param jti: トークンのID
+    :return: キャッシュキー
+    """
+    return f'{REVOKED_KEY_PREFIX}:{jti}'
+
+
+def _remaining_seconds(expires_at: datetime) -> int:
+    """
+    有効期限までの秒数を返す
+
+    :param expires_at: 有効期限
+    :return: 秒数（期限切れの場合も1以上）
+    """
+    return max(int((expires_at - timezone.now()).total_seconds()) + 1, 1)
+
+
+def is_token_revoked(jti: str, check_database: bool = True) -> bool:
+    """
+    トークンが失効しているかどうか
+
+    キャッシュにない場合はRevokedTokenを参照し、失効していればキャッシュに追加する
+
+    :param jti: トークンのID
+    :param check_database: キャッシュにない場合にRevokedTokenを参照するかどうか
+    :return: 失効している場合True
+    """
+    if cache.get(_revoked_key(jti)) is not None:
+        return True
+    if not check_database:
+        return False
+    expires_at = RevokedToken.objects.filter(jti=jti).values_list('expires_at', flat=True).first()
+    if expires_at is None:
+        return False
+    cache.set(_revoked_key(jti), True, _remaining_seconds(expires_at))
+    return True
+
+
+def revoke_token(jti: str, expires_at: datetime) -> bool:
+    """
+    トークンを失効させる
+
+    RevokedTokenへの追加で失効を確定させるため、同じトークンを同時に失効させた場合も1つだけが成功する
+
+    :param jti: トークンのID
+    :param expires_at: トークンの有効期限
+    :return: 失効させた場合True（既に失効していた場合False）
+    """
+    if cache.get(_revoked_key(jti)) is not None:
+        return False
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+    cache.set(_revoked_key(jti), True, _remaining_seconds(expires_at))
+    return True
+
+
+def purge_revoked_tokens(before: datetime, batch_size: int) -> int:
+    """
+    指定日時より前に有効期限が切れた記録をバッチごとに削除
+
+    :param before: 基準日時
+    :param batch_size: 1回の削除件数
+    :return: 削除した件数
+    """
+    deleted = 0
+    expired = RevokedToken.objects.filter(expires_at__lt=before)
+    while True:
+        jtis = list(expired.order_by('expires_at').values_list('jti', flat=True)[:batch_size])
+        if not jtis:
+            return deleted
+        count, _ = RevokedToken.objects.filter(jti__in=jtis).delete()
+        deleted += count
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    失効をRevokedTokenで判定するリフレッシュトークン
+
+    token_blacklistアプリと異なり、発行時の記録（outstand）は行わない
+    """
+
+    def verify(self, *args, **kwargs) -> None:
+        """
+        トークンを検証
+
+        :raises TokenError: トークンが失効している・不正な場合
+        """
+        super().verify(*args, **kwargs)
+        self.check_blacklist()
+
+    def check_blacklist(self) -> None:
+        """
+        トークンが失効していないか確認
+
+        ローテーションで失効させる設定では、続くblacklistが使用済みのトークンを拒否するため、
+        キャッシュのみを参照する
+
+        :raises TokenError: トークンが失効している場合
+        """
+        revoked_on_rotation = api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+        if is_token_revoked(self.payload[api_settings.JTI_CLAIM], check_database=not revoked_on_rotation):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self) -> None:
+        """
+        トークンを失効させる
+
+        同時に送られた同じトークンのローテーションは、先に失効させた1件のみ成功する
+
+        :raises TokenError: 既に失効している場合
+        """
+        expires_at = datetime_from_epoch(self.payload['exp'])
+        if not revoke_token(self.payload[api_settings.JTI_CLAIM], expires_at):
+            raise TokenError(_('Token is blacklisted'))
+
+    def outstand(self) -> None:
+        """
+        発行したトークンを記録しない
+
+        simplejwtの既定の実装はtoken_blacklistアプリのOutstandingTokenに記録するため、
+        アプリを使わない構成では上書きが必要になる
+        """
+        return None
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """使用済みのリフレッシュトークンを失効させるトークンリフレッシュシリアライザー"""
+
+    token_class = RevocableRefreshToken
@@ -49,6 +49,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.QueryInstrumentationMiddleware',
+    'apps.core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,8 +87,70 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Django標準のSQLiteバックエンドに接続プールを加えたもの（apps.core.pool）
+        'ENGINE': 'apps.core.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # リクエストの終了時に接続を閉じる（プールを使う場合はプールへ返す）。
+        # 0より大きくするとスレッドごとに接続を持ち続けるが、ASGIではリクエストごとにスレッドが変わるため効果がない
+        'CONN_MAX_AGE': 0,
+        # 持ち続けた接続をリクエストの開始時に確認する
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Connection pool
+# スレッド間で共有する接続数の上限（0でプールを使わない）
+DATABASE_POOL_SIZE = 10
+# 接続がすべて使用中の場合に返却を待つ時間（秒）。超えるとOperationalError
+DATABASE_POOL_TIMEOUT = 10
+# 接続を作り直すまでの時間（秒、Noneで無期限）
+DATABASE_POOL_MAX_LIFETIME = 3600
+# プールから取り出す際に接続でクエリを実行できるか確認する
+DATABASE_POOL_HEALTH_CHECKS = True
+
+# SQLite
+# 接続の作成時に順に実行するPRAGMA（空の場合はSQLiteの既定値のまま）
+SQLITE_PRAGMAS = {
+    # ロックの解放を待つ時間（ミリ秒）。以降のPRAGMAもロックを待つよう最初に設定する
+    'busy_timeout': 5000,
+    # 読み取りと書き込みが互いを待たないWAL（先行書き込みログ）にする
+    'journal_mode': 'WAL',
+    # WALではコミットごとのfsyncを省いても壊れない（電源断では直近のコミットを失うことがある）
+    'synchronous': 'NORMAL',
+    # メモリーマップで読み込むデータベースファイルの大きさ（バイト）
+    'mmap_size': 256 * 1024 * 1024,
+    # 接続ごとのページキャッシュの大きさ（負の値はKiB）
+    'cache_size': -64000,
+}
+# トランザクションを開始時に書き込みのロックを取るBEGIN IMMEDIATEで始める
+SQLITE_IMMEDIATE_TRANSACTIONS = True
+# トランザクションの外の文がロックで失敗した場合に再実行する回数と、最初の待ち時間（秒、回ごとに倍にする）
+SQLITE_BUSY_RETRIES = 3
+SQLITE_BUSY_RETRY_DELAY = 0.05
+
+# Read replicas
+# 安全なメソッドのリクエストの読み取りを振り分けるレプリカのエイリアス（空の場合はすべてdefaultを使う）。
+# レプリカはDATABASESに定義し、テストでは 'TEST': {'MIRROR': 'default'} でdefaultを参照させる。
+# ローカルではSQLiteのファイルをレプリカとして使い、sync_replicasでdefaultから複製する:
+#   DATABASES['replica1'] = {
+#       'ENGINE': 'apps.core.backends.sqlite3',
+#       'NAME': BASE_DIR / 'db.replica1.sqlite3',
+#       'TEST': {'MIRROR': 'default'},
+#   }
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+# 書き込んだユーザーの読み取りをdefaultに固定する時間（秒）。レプリケーションの遅れより長くする
+REPLICA_PIN_SECONDS = 5
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# LocMemCacheはプロセスごとに値を持つ。複数のプロセスで配信する場合は、RedisやMemcachedなど
+# 共有のキャッシュを指定する（レプリカの読み取りの固定・キャッシュのタグのバージョン・
+# JWT認証のユーザーのスナップショットの無効化は、キャッシュを通じて他のプロセスに伝わる）
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -144,16 +208,90 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.StandardPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # ユーザーのスナップショットをキャッシュし、認証でのusersの取得を省く
+        'apps.core.authentication.CachedJWTAuthentication',
+    ),
+    # JSONの生成・解析にorjsonを使う
+    # （標準のjsonモジュールに戻す場合は rest_framework.renderers.JSONRenderer・rest_framework.parsers.JSONParser を指定する）
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
 }
 
+# Authentication
+# JWT認証でキャッシュするユーザーのスナップショットの有効期間（秒）。保存・削除時に無効化されるが、
+# 無効化はキャッシュを通じて伝わるため、プロセスごとのキャッシュでは他のプロセスで最長この秒数だけ
+# 無効化・パスワード変更前のユーザーが認証される。短い期間でも連続したリクエストの取得を省ける
+AUTH_USER_CACHE_TIMEOUT = 10
+
+# Pagination
+# 件数キャッシュの有効期間（秒）
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+# この行数以上と推定される場合はCOUNT(*)の代わりに推定値を返す（Noneで無効）
+PAGINATION_APPROXIMATE_COUNT_THRESHOLD = None
+# 投稿詳細に埋め込むコメントの件数（続きは /posts/{id}/comments/ から取得する）
+POST_DETAIL_COMMENTS = 20
+
+# Serializers
+# 一覧・詳細の出力をフィールドごとに組み立てた関数で生成する（Falseで標準のSerializer.to_representationを使う）
+FAST_READ_SERIALIZERS = True
+
+# Async views
+# ASGIで配信する場合に、公開投稿の一覧・詳細を非同期ORMで処理する（Falseで常に同期のViewSetを使う）。
+# Django 4.2の非同期ORMはクエリごとにスレッドを切り替えるため、benchmark_asgiで効果を確認してから有効にする
+ASYNC_READ_VIEWS = False
+
+# Delta sync
+# 削除記録の保存期間（日）。これより古い位置からの同期は410を返し、一覧の再取得を求める
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+# コミットの遅れた書き込みを取りこぼさないよう、同期トークンを現在時刻のこの時間（秒）前までに留める
+SYNC_SAFETY_WINDOW = 5
+
+# Response cache
+# 公開APIのレスポンスキャッシュの有効期間（秒）
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Query instrumentation
+# 同じ形のクエリがこの回数以上実行されたリクエストをN+1の疑いとして警告する
+QUERY_REPEAT_THRESHOLD = 5
+# レスポンスにクエリの件数・所要時間のServer-Timingヘッダーを付けるかどうか
+QUERY_SERVER_TIMING = True
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # リクエストごとのクエリ計測（1行1JSON）
+        'apps.core.middleware': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # Simple JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    # 使用済みのリフレッシュトークンをRevokedTokenで失効させる（token_blacklistアプリは使わない）
+    'TOKEN_REFRESH_SERIALIZER': 'apps.core.tokens.RevocableTokenRefreshSerializer',
 }
 
 # drf-spectacular settings
@@ -164,6 +302,10 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
     'COMPONENT_SPLIT_REQUEST': True,
     'SCHEMA_PATH_PREFIX': r'/api/',
+    'ENUM_NAME_OVERRIDES': {
+        'SearchResultTypeEnum': 'apps.core.search.RESULT_TYPES',
+        'BulkResultStatusEnum': 'apps.core.bulk.RESULT_STATUSES',
+    },
 }
 
 # CORS settings (development)
@@ -1,15 +1,24 @@
 import { useQueryClient } from "@tanstack/react-query";
 import { message } from "antd";
 import { parseAsInteger, useQueryState } from "nuqs";
-import { useState } from "react";
+import { useRef, useState } from "react";
 import {
   getPostsListQueryKey,
+  postsSync,
   usePostsCreate,
   usePostsDestroy,
   usePostsList,
   usePostsPartialUpdate,
 } from "@/generated/api/posts/posts";
-import type { PostCreateUpdate } from "@/generated/schemas";
+import type {
+  PaginatedPostListList,
+  PostCreateUpdate,
+  PostSync,
+  PostsSyncParams,
+} from "@/generated/schemas";
+
+// 端末とサーバーの時計のずれを吸収するため、一覧の取得時刻より前から差分同期する
+const SYNC_CLOCK_SKEW_MS = 60_000;
 
 export const usePostListPage = () => {
   // URLクエリパラメータでページ状態を管理
@@ -29,16 +38,85 @@ export const usePostListPage = () => {
   } | null>(null);
 
   const queryClient = useQueryClient();
+  // 差分同期の位置（最初の同期までは一覧の取得時刻から同期する）
+  const syncTokenRef = useRef<string | null>(null);
 
-  const { data, isLoading, error } = usePostsList({
+  const { data, isLoading, error, dataUpdatedAt } = usePostsList({
     page,
   });
 
+  /**
+   * 差分同期の結果をキャッシュ済みの一覧ページに反映
+   *
+   * 表示中の行の更新・削除はその場で反映し、キャッシュにない行（新規作成など）が
+   * 含まれる場合のみ一覧を取得し直す
+   */
+  const applySync = ({ results, deleted }: PostSync) => {
+    const changed = new Map(results.map((post) => [post.id, post]));
+    const deletedIds = new Set(deleted);
+    const cachedIds = new Set<number>();
+    let removed = false;
+
+    queryClient.setQueriesData<PaginatedPostListList>(
+      { queryKey: getPostsListQueryKey() },
+      (old) => {
+        if (!old) return old;
+        const kept = old.results.filter((post) => !deletedIds.has(post.id));
+        kept.forEach((post) => cachedIds.add(post.id));
+        const removedCount = old.results.length - kept.length;
+        removed ||= removedCount > 0;
+        return {
+          ...old,
+          count:
+            old.count === undefined ? undefined : old.count - removedCount,
+          results: kept.map((post) => changed.get(post.id) ?? post),
+        };
+      },
+    );
+
+    if (results.some((post) => !cachedIds.has(post.id))) {
+      queryClient.invalidateQueries({ queryKey: getPostsListQueryKey() });
+    } else if (removed) {
+      // 削除で後続ページの行がずれるため、表示中以外のページは次回表示時に取得し直す
+      queryClient.invalidateQueries({
+        queryKey: getPostsListQueryKey(),
+        refetchType: "none",
+      });
+    }
+  };
+
+  /**
+   * 前回の同期以降の変更を取得してキャッシュに反映
+   *
+   * 同期トークンが失効した場合などは一覧を取得し直す
+   */
+  const syncPosts = async () => {
+    let params: PostsSyncParams = syncTokenRef.current
+      ? { sync_token: syncTokenRef.current }
+      : {
+          updated_since: new Date(
+            dataUpdatedAt - SYNC_CLOCK_SKEW_MS,
+          ).toISOString(),
+        };
+    try {
+      for (;;) {
+        const result = await postsSync(params);
+        applySync(result);
+        syncTokenRef.current = result.sync_token;
+        if (!result.has_more) break;
+        params = { sync_token: result.sync_token };
+      }
+    } catch {
+      syncTokenRef.current = null;
+      queryClient.invalidateQueries({ queryKey: getPostsListQueryKey() });
+    }
+  };
+
   const createMutation = usePostsCreate({
     mutation: {
       onSuccess: () => {
         message.success("Post created successfully");
-        queryClient.invalidateQueries({ queryKey: getPostsListQueryKey() });
+        syncPosts();
         setIsModalOpen(false);
       },
       onError: () => {
@@ -51,7 +129,7 @@ export const usePostListPage = () => {
     mutation: {
       onSuccess: () => {
         message.success("Post updated successfully");
-        queryClient.invalidateQueries({ queryKey: getPostsListQueryKey() });
+        syncPosts();
         setIsModalOpen(false);
         setEditingPost(null);
       },
@@ -65,7 +143,7 @@ export const usePostListPage = () => {
     mutation: {
       onSuccess: () => {
         message.success("Post deleted successfully");
-        queryClient.invalidateQueries({ queryKey: getPostsListQueryKey() });
+        syncPosts();
       },
       onError: () => {
         message.error("Failed to delete post");
@@ -25,10 +25,16 @@ import type {
 } from '@tanstack/react-query';
 
 import type {
+  BulkDeleteRequest,
+  BulkResult,
   Comment,
   CommentCreate,
   CommentCreateRequest,
+  CommentSync,
+  CommentsExportParams,
   CommentsListParams,
+  CommentsRetrieveParams,
+  CommentsSyncParams,
   PaginatedCommentList
 } from '../../schemas';
 
@@ -208,12 +214,14 @@ export const useCommentsCreate = <TError = unknown,
  */
 export const commentsRetrieve = (
     id: number,
+    params?: CommentsRetrieveParams,
  signal?: AbortSignal
 ) => {
       
       
       return customInstance<Comment>(
-      {url: `/api/v0/dashboard/comments/${id}/`, method: 'GET', signal
+      {url: `/api/v0/dashboard/comments/${id}/`, method: 'GET',
+        params, signal
     },
       );
     }
@@ -221,23 +229,25 @@ export const commentsRetrieve = (
 
 
 
-export const getCommentsRetrieveQueryKey = (id?: number,) => {
+export const getCommentsRetrieveQueryKey = (id?: number,
+    params?: CommentsRetrieveParams,) => {
     return [
-    `/api/v0/dashboard/comments/${id}/`
+    `/api/v0/dashboard/comments/${id}/`, ...(params ? [params]: [])
     ] as const;
     }
 
     
-export const getCommentsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
+export const getCommentsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(id: number,
+    params?: CommentsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
 ) => {
 
 const {query: queryOptions} = options ?? {};
 
-  const queryKey =  queryOptions?.queryKey ?? getCommentsRetrieveQueryKey(id);
+  const queryKey =  queryOptions?.queryKey ?? getCommentsRetrieveQueryKey(id,params);
 
   
 
-    const queryFn: QueryFunction<Awaited<ReturnType<typeof commentsRetrieve>>> = ({ signal }) => commentsRetrieve(id, signal);
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof commentsRetrieve>>> = ({ signal }) => commentsRetrieve(id,params, signal);
 
       
 
@@ -251,7 +261,8 @@ export type CommentsRetrieveQueryError = unknown
 
 
 export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(
- id: number, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params: undefined |  CommentsRetrieveParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>> & Pick<
         DefinedInitialDataOptions<
           Awaited<ReturnType<typeof commentsRetrieve>>,
           TError,
@@ -261,7 +272,8 @@ export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRe
  , queryClient?: QueryClient
   ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params?: CommentsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>> & Pick<
         UndefinedInitialDataOptions<
           Awaited<ReturnType<typeof commentsRetrieve>>,
           TError,
@@ -271,7 +283,8 @@ export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRe
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: CommentsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 /**
@@ -279,11 +292,12 @@ export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRe
  */
 
 export function useCommentsRetrieve<TData = Awaited<ReturnType<typeof commentsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: CommentsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsRetrieve>>, TError, TData>>, }
  , queryClient?: QueryClient 
  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
 
-  const queryOptions = getCommentsRetrieveQueryOptions(id,options)
+  const queryOptions = getCommentsRetrieveQueryOptions(id,params,options)
 
   const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
 
@@ -359,4 +373,339 @@ export const useCommentsDestroy = <TError = unknown,
 
       return useMutation(mutationOptions, queryClient);
     }
-    
\ No newline at end of file
+    
+    /**
+ * コメントを一括作成
+
+要素ごとにCommentBulkCreateSerializerで検証し、検証に通った要素だけを
+1つのトランザクションでまとめて作成する。投稿の存在は1回のクエリで確認する
+
+:param request: リクエスト
+:return: 要素ごとの結果
+ * @summary Bulk create comments
+ */
+export const commentsBulkCreate = (
+    commentCreateRequest: CommentCreateRequest[],
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<BulkResult>(
+      {url: `/api/v0/dashboard/comments/bulk/`, method: 'POST',
+      headers: {'Content-Type': 'application/json', },
+      data: commentCreateRequest, signal
+    },
+      );
+    }
+  
+
+
+export const getCommentsBulkCreateMutationOptions = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof commentsBulkCreate>>, TError,{data: CommentCreateRequest[]}, TContext>, }
+): UseMutationOptions<Awaited<ReturnType<typeof commentsBulkCreate>>, TError,{data: CommentCreateRequest[]}, TContext> => {
+
+const mutationKey = ['commentsBulkCreate'];
+const {mutation: mutationOptions} = options ?
+      options.mutation && 'mutationKey' in options.mutation && options.mutation.mutationKey ?
+      options
+      : {...options, mutation: {...options.mutation, mutationKey}}
+      : {mutation: { mutationKey, }};
+
+      
+
+
+      const mutationFn: MutationFunction<Awaited<ReturnType<typeof commentsBulkCreate>>, {data: CommentCreateRequest[]}> = (props) => {
+          const {data} = props ?? {};
+
+          return  commentsBulkCreate(data,)
+        }
+
+        
+
+
+  return  { mutationFn, ...mutationOptions }}
+
+    export type CommentsBulkCreateMutationResult = NonNullable<Awaited<ReturnType<typeof commentsBulkCreate>>>
+    export type CommentsBulkCreateMutationBody = CommentCreateRequest[]
+    export type CommentsBulkCreateMutationError = unknown
+
+    /**
+ * @summary Bulk create comments
+ */
+export const useCommentsBulkCreate = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof commentsBulkCreate>>, TError,{data: CommentCreateRequest[]}, TContext>, }
+ , queryClient?: QueryClient): UseMutationResult<
+        Awaited<ReturnType<typeof commentsBulkCreate>>,
+        TError,
+        {data: CommentCreateRequest[]},
+        TContext
+      > => {
+
+      const mutationOptions = getCommentsBulkCreateMutationOptions(options);
+
+      return useMutation(mutationOptions, queryClient);
+    }
+    /**
+ * コメントを一括削除
+
+:param request: リクエスト
+:return: 要素ごとの結果
+ * @summary Bulk delete comments
+ */
+export const commentsBulkDestroy = (
+    bulkDeleteRequest: BulkDeleteRequest,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<BulkResult>(
+      {url: `/api/v0/dashboard/comments/bulk-delete/`, method: 'POST',
+      headers: {'Content-Type': 'application/json', },
+      data: bulkDeleteRequest, signal
+    },
+      );
+    }
+  
+
+
+export const getCommentsBulkDestroyMutationOptions = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof commentsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext>, }
+): UseMutationOptions<Awaited<ReturnType<typeof commentsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext> => {
+
+const mutationKey = ['commentsBulkDestroy'];
+const {mutation: mutationOptions} = options ?
+      options.mutation && 'mutationKey' in options.mutation && options.mutation.mutationKey ?
+      options
+      : {...options, mutation: {...options.mutation, mutationKey}}
+      : {mutation: { mutationKey, }};
+
+      
+
+
+      const mutationFn: MutationFunction<Awaited<ReturnType<typeof commentsBulkDestroy>>, {data: BulkDeleteRequest}> = (props) => {
+          const {data} = props ?? {};
+
+          return  commentsBulkDestroy(data,)
+        }
+
+        
+
+
+  return  { mutationFn, ...mutationOptions }}
+
+    export type CommentsBulkDestroyMutationResult = NonNullable<Awaited<ReturnType<typeof commentsBulkDestroy>>>
+    export type CommentsBulkDestroyMutationBody = BulkDeleteRequest
+    export type CommentsBulkDestroyMutationError = unknown
+
+    /**
+ * @summary Bulk delete comments
+ */
+export const useCommentsBulkDestroy = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof commentsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext>, }
+ , queryClient?: QueryClient): UseMutationResult<
+        Awaited<ReturnType<typeof commentsBulkDestroy>>,
+        TError,
+        {data: BulkDeleteRequest},
+        TContext
+      > => {
+
+      const mutationOptions = getCommentsBulkDestroyMutationOptions(options);
+
+      return useMutation(mutationOptions, queryClient);
+    }
+    /**
+ * コメントの全件をID順にストリーミングで出力
+
+ページネーションを使わず、サーバーサイドカーソルで読み出した行を逐次返す
+
+:param request: リクエスト
+:return: NDJSONまたはCSVのストリーミングレスポンス
+ * @summary Export all comments
+ */
+export const commentsExport = (
+    params?: CommentsExportParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<string>(
+      {url: `/api/v0/dashboard/comments/export/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getCommentsExportQueryKey = (params?: CommentsExportParams,) => {
+    return [
+    `/api/v0/dashboard/comments/export/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getCommentsExportQueryOptions = <TData = Awaited<ReturnType<typeof commentsExport>>, TError = unknown>(params?: CommentsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getCommentsExportQueryKey(params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof commentsExport>>> = ({ signal }) => commentsExport(params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type CommentsExportQueryResult = NonNullable<Awaited<ReturnType<typeof commentsExport>>>
+export type CommentsExportQueryError = unknown
+
+
+export function useCommentsExport<TData = Awaited<ReturnType<typeof commentsExport>>, TError = unknown>(
+ params: undefined |  CommentsExportParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof commentsExport>>,
+          TError,
+          Awaited<ReturnType<typeof commentsExport>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useCommentsExport<TData = Awaited<ReturnType<typeof commentsExport>>, TError = unknown>(
+ params?: CommentsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof commentsExport>>,
+          TError,
+          Awaited<ReturnType<typeof commentsExport>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useCommentsExport<TData = Awaited<ReturnType<typeof commentsExport>>, TError = unknown>(
+ params?: CommentsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary Export all comments
+ */
+
+export function useCommentsExport<TData = Awaited<ReturnType<typeof commentsExport>>, TError = unknown>(
+ params?: CommentsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsExport>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getCommentsExportQueryOptions(params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
+    /**
+ * 前回の同期以降に作成・更新されたコメントと、削除されたコメントのIDを返す
+
+:param request: リクエスト
+:return: 差分同期のページ
+ * @summary Sync comments changed since a sync token
+ */
+export const commentsSync = (
+    params?: CommentsSyncParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<CommentSync>(
+      {url: `/api/v0/dashboard/comments/sync/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getCommentsSyncQueryKey = (params?: CommentsSyncParams,) => {
+    return [
+    `/api/v0/dashboard/comments/sync/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getCommentsSyncQueryOptions = <TData = Awaited<ReturnType<typeof commentsSync>>, TError = unknown>(params?: CommentsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getCommentsSyncQueryKey(params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof commentsSync>>> = ({ signal }) => commentsSync(params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type CommentsSyncQueryResult = NonNullable<Awaited<ReturnType<typeof commentsSync>>>
+export type CommentsSyncQueryError = unknown
+
+
+export function useCommentsSync<TData = Awaited<ReturnType<typeof commentsSync>>, TError = unknown>(
+ params: undefined |  CommentsSyncParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof commentsSync>>,
+          TError,
+          Awaited<ReturnType<typeof commentsSync>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useCommentsSync<TData = Awaited<ReturnType<typeof commentsSync>>, TError = unknown>(
+ params?: CommentsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof commentsSync>>,
+          TError,
+          Awaited<ReturnType<typeof commentsSync>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useCommentsSync<TData = Awaited<ReturnType<typeof commentsSync>>, TError = unknown>(
+ params?: CommentsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary Sync comments changed since a sync token
+ */
+
+export function useCommentsSync<TData = Awaited<ReturnType<typeof commentsSync>>, TError = unknown>(
+ params?: CommentsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof commentsSync>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getCommentsSyncQueryOptions(params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
@@ -25,12 +25,21 @@ import type {
 } from '@tanstack/react-query';
 
 import type {
+  BulkDeleteRequest,
+  BulkResult,
+  PaginatedCommentList,
   PaginatedPostListList,
   PatchedPostCreateUpdateRequest,
+  PostBulkUpdateRequest,
   PostCreateUpdate,
   PostCreateUpdateRequest,
   PostDetail,
-  PostsListParams
+  PostSync,
+  PostsCommentsListParams,
+  PostsExportParams,
+  PostsListParams,
+  PostsRetrieveParams,
+  PostsSyncParams
 } from '../../schemas';
 
 import { customInstance } from '../../../lib/axios';
@@ -209,12 +218,14 @@ export const usePostsCreate = <TError = unknown,
  */
 export const postsRetrieve = (
     id: number,
+    params?: PostsRetrieveParams,
  signal?: AbortSignal
 ) => {
       
       
       return customInstance<PostDetail>(
-      {url: `/api/v0/dashboard/posts/${id}/`, method: 'GET', signal
+      {url: `/api/v0/dashboard/posts/${id}/`, method: 'GET',
+        params, signal
     },
       );
     }
@@ -222,23 +233,25 @@ export const postsRetrieve = (
 
 
 
-export const getPostsRetrieveQueryKey = (id?: number,) => {
+export const getPostsRetrieveQueryKey = (id?: number,
+    params?: PostsRetrieveParams,) => {
     return [
-    `/api/v0/dashboard/posts/${id}/`
+    `/api/v0/dashboard/posts/${id}/`, ...(params ? [params]: [])
     ] as const;
     }
 
     
-export const getPostsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+export const getPostsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
 ) => {
 
 const {query: queryOptions} = options ?? {};
 
-  const queryKey =  queryOptions?.queryKey ?? getPostsRetrieveQueryKey(id);
+  const queryKey =  queryOptions?.queryKey ?? getPostsRetrieveQueryKey(id,params);
 
   
 
-    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsRetrieve>>> = ({ signal }) => postsRetrieve(id, signal);
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsRetrieve>>> = ({ signal }) => postsRetrieve(id,params, signal);
 
       
 
@@ -252,7 +265,8 @@ export type PostsRetrieveQueryError = unknown
 
 
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params: undefined |  PostsRetrieveParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
         DefinedInitialDataOptions<
           Awaited<ReturnType<typeof postsRetrieve>>,
           TError,
@@ -262,7 +276,8 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  , queryClient?: QueryClient
   ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
         UndefinedInitialDataOptions<
           Awaited<ReturnType<typeof postsRetrieve>>,
           TError,
@@ -272,7 +287,8 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 /**
@@ -280,11 +296,12 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  */
 
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
  , queryClient?: QueryClient 
  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
 
-  const queryOptions = getPostsRetrieveQueryOptions(id,options)
+  const queryOptions = getPostsRetrieveQueryOptions(id,params,options)
 
   const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
 
@@ -494,4 +511,519 @@ export const usePostsDestroy = <TError = unknown,
 
       return useMutation(mutationOptions, queryClient);
     }
-    
\ No newline at end of file
+    
+    /**
+ * 投稿のコメントを新しい順にカーソル方式で返す
+
+投稿詳細に埋め込まれた先頭のコメントの続きは、詳細の `comments_next` から取得する
+
+:param request: リクエスト
+:param id: 投稿ID
+:return: コメントのページ
+ * @summary List comments of a post
+ */
+export const postsCommentsList = (
+    id: number,
+    params?: PostsCommentsListParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<PaginatedCommentList>(
+      {url: `/api/v0/dashboard/posts/${id}/comments/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getPostsCommentsListQueryKey = (id?: number,
+    params?: PostsCommentsListParams,) => {
+    return [
+    `/api/v0/dashboard/posts/${id}/comments/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getPostsCommentsListQueryOptions = <TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getPostsCommentsListQueryKey(id,params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsCommentsList>>> = ({ signal }) => postsCommentsList(id,params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, enabled: !!(id), ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type PostsCommentsListQueryResult = NonNullable<Awaited<ReturnType<typeof postsCommentsList>>>
+export type PostsCommentsListQueryError = unknown
+
+
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params: undefined |  PostsCommentsListParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsCommentsList>>,
+          TError,
+          Awaited<ReturnType<typeof postsCommentsList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsCommentsList>>,
+          TError,
+          Awaited<ReturnType<typeof postsCommentsList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary List comments of a post
+ */
+
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getPostsCommentsListQueryOptions(id,params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
+/**
+ * 投稿を一括作成
+
+要素ごとにPostCreateUpdateSerializerで検証し、検証に通った要素だけを
+1つのトランザクションでまとめて作成する
+
+:param request: リクエスト
+:return: 要素ごとの結果
+ * @summary Bulk create posts
+ */
+export const postsBulkCreate = (
+    postCreateUpdateRequest: PostCreateUpdateRequest[],
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<BulkResult>(
+      {url: `/api/v0/dashboard/posts/bulk/`, method: 'POST',
+      headers: {'Content-Type': 'application/json', },
+      data: postCreateUpdateRequest, signal
+    },
+      );
+    }
+  
+
+
+export const getPostsBulkCreateMutationOptions = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkCreate>>, TError,{data: PostCreateUpdateRequest[]}, TContext>, }
+): UseMutationOptions<Awaited<ReturnType<typeof postsBulkCreate>>, TError,{data: PostCreateUpdateRequest[]}, TContext> => {
+
+const mutationKey = ['postsBulkCreate'];
+const {mutation: mutationOptions} = options ?
+      options.mutation && 'mutationKey' in options.mutation && options.mutation.mutationKey ?
+      options
+      : {...options, mutation: {...options.mutation, mutationKey}}
+      : {mutation: { mutationKey, }};
+
+      
+
+
+      const mutationFn: MutationFunction<Awaited<ReturnType<typeof postsBulkCreate>>, {data: PostCreateUpdateRequest[]}> = (props) => {
+          const {data} = props ?? {};
+
+          return  postsBulkCreate(data,)
+        }
+
+        
+
+
+  return  { mutationFn, ...mutationOptions }}
+
+    export type PostsBulkCreateMutationResult = NonNullable<Awaited<ReturnType<typeof postsBulkCreate>>>
+    export type PostsBulkCreateMutationBody = PostCreateUpdateRequest[]
+    export type PostsBulkCreateMutationError = unknown
+
+    /**
+ * @summary Bulk create posts
+ */
+export const usePostsBulkCreate = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkCreate>>, TError,{data: PostCreateUpdateRequest[]}, TContext>, }
+ , queryClient?: QueryClient): UseMutationResult<
+        Awaited<ReturnType<typeof postsBulkCreate>>,
+        TError,
+        {data: PostCreateUpdateRequest[]},
+        TContext
+      > => {
+
+      const mutationOptions = getPostsBulkCreateMutationOptions(options);
+
+      return useMutation(mutationOptions, queryClient);
+    }
+    /**
+ * 投稿を一括で部分更新
+
+各要素の `id` で対象を指定する。対象はまとめて取得してロックし、
+検証に通った要素だけを1つのトランザクションでまとめて更新する
+
+:param request: リクエスト
+:return: 要素ごとの結果
+ * @summary Bulk partial update posts
+ */
+export const postsBulkPartialUpdate = (
+    postBulkUpdateRequest: PostBulkUpdateRequest[],
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<BulkResult>(
+      {url: `/api/v0/dashboard/posts/bulk/`, method: 'PATCH',
+      headers: {'Content-Type': 'application/json', },
+      data: postBulkUpdateRequest, signal
+    },
+      );
+    }
+  
+
+
+export const getPostsBulkPartialUpdateMutationOptions = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkPartialUpdate>>, TError,{data: PostBulkUpdateRequest[]}, TContext>, }
+): UseMutationOptions<Awaited<ReturnType<typeof postsBulkPartialUpdate>>, TError,{data: PostBulkUpdateRequest[]}, TContext> => {
+
+const mutationKey = ['postsBulkPartialUpdate'];
+const {mutation: mutationOptions} = options ?
+      options.mutation && 'mutationKey' in options.mutation && options.mutation.mutationKey ?
+      options
+      : {...options, mutation: {...options.mutation, mutationKey}}
+      : {mutation: { mutationKey, }};
+
+      
+
+
+      const mutationFn: MutationFunction<Awaited<ReturnType<typeof postsBulkPartialUpdate>>, {data: PostBulkUpdateRequest[]}> = (props) => {
+          const {data} = props ?? {};
+
+          return  postsBulkPartialUpdate(data,)
+        }
+
+        
+
+
+  return  { mutationFn, ...mutationOptions }}
+
+    export type PostsBulkPartialUpdateMutationResult = NonNullable<Awaited<ReturnType<typeof postsBulkPartialUpdate>>>
+    export type PostsBulkPartialUpdateMutationBody = PostBulkUpdateRequest[]
+    export type PostsBulkPartialUpdateMutationError = unknown
+
+    /**
+ * @summary Bulk partial update posts
+ */
+export const usePostsBulkPartialUpdate = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkPartialUpdate>>, TError,{data: PostBulkUpdateRequest[]}, TContext>, }
+ , queryClient?: QueryClient): UseMutationResult<
+        Awaited<ReturnType<typeof postsBulkPartialUpdate>>,
+        TError,
+        {data: PostBulkUpdateRequest[]},
+        TContext
+      > => {
+
+      const mutationOptions = getPostsBulkPartialUpdateMutationOptions(options);
+
+      return useMutation(mutationOptions, queryClient);
+    }
+    /**
+ * 投稿をコメントごと一括削除
+
+:param request: リクエスト
+:return: 要素ごとの結果
+ * @summary Bulk delete posts
+ */
+export const postsBulkDestroy = (
+    bulkDeleteRequest: BulkDeleteRequest,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<BulkResult>(
+      {url: `/api/v0/dashboard/posts/bulk-delete/`, method: 'POST',
+      headers: {'Content-Type': 'application/json', },
+      data: bulkDeleteRequest, signal
+    },
+      );
+    }
+  
+
+
+export const getPostsBulkDestroyMutationOptions = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext>, }
+): UseMutationOptions<Awaited<ReturnType<typeof postsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext> => {
+
+const mutationKey = ['postsBulkDestroy'];
+const {mutation: mutationOptions} = options ?
+      options.mutation && 'mutationKey' in options.mutation && options.mutation.mutationKey ?
+      options
+      : {...options, mutation: {...options.mutation, mutationKey}}
+      : {mutation: { mutationKey, }};
+
+      
+
+
+      const mutationFn: MutationFunction<Awaited<ReturnType<typeof postsBulkDestroy>>, {data: BulkDeleteRequest}> = (props) => {
+          const {data} = props ?? {};
+
+          return  postsBulkDestroy(data,)
+        }
+
+        
+
+
+  return  { mutationFn, ...mutationOptions }}
+
+    export type PostsBulkDestroyMutationResult = NonNullable<Awaited<ReturnType<typeof postsBulkDestroy>>>
+    export type PostsBulkDestroyMutationBody = BulkDeleteRequest
+    export type PostsBulkDestroyMutationError = unknown
+
+    /**
+ * @summary Bulk delete posts
+ */
+export const usePostsBulkDestroy = <TError = unknown,
+    TContext = unknown>(options?: { mutation?:UseMutationOptions<Awaited<ReturnType<typeof postsBulkDestroy>>, TError,{data: BulkDeleteRequest}, TContext>, }
+ , queryClient?: QueryClient): UseMutationResult<
+        Awaited<ReturnType<typeof postsBulkDestroy>>,
+        TError,
+        {data: BulkDeleteRequest},
+        TContext
+      > => {
+
+      const mutationOptions = getPostsBulkDestroyMutationOptions(options);
+
+      return useMutation(mutationOptions, queryClient);
+    }
+    /**
+ * 投稿の全件をID順にストリーミングで出力
+
+ページネーションを使わず、サーバーサイドカーソルで読み出した行を逐次返す
+
+:param request: リクエスト
+:return: NDJSONまたはCSVのストリーミングレスポンス
+ * @summary Export all posts
+ */
+export const postsExport = (
+    params?: PostsExportParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<string>(
+      {url: `/api/v0/dashboard/posts/export/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getPostsExportQueryKey = (params?: PostsExportParams,) => {
+    return [
+    `/api/v0/dashboard/posts/export/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getPostsExportQueryOptions = <TData = Awaited<ReturnType<typeof postsExport>>, TError = unknown>(params?: PostsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getPostsExportQueryKey(params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsExport>>> = ({ signal }) => postsExport(params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type PostsExportQueryResult = NonNullable<Awaited<ReturnType<typeof postsExport>>>
+export type PostsExportQueryError = unknown
+
+
+export function usePostsExport<TData = Awaited<ReturnType<typeof postsExport>>, TError = unknown>(
+ params: undefined |  PostsExportParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsExport>>,
+          TError,
+          Awaited<ReturnType<typeof postsExport>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsExport<TData = Awaited<ReturnType<typeof postsExport>>, TError = unknown>(
+ params?: PostsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsExport>>,
+          TError,
+          Awaited<ReturnType<typeof postsExport>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsExport<TData = Awaited<ReturnType<typeof postsExport>>, TError = unknown>(
+ params?: PostsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary Export all posts
+ */
+
+export function usePostsExport<TData = Awaited<ReturnType<typeof postsExport>>, TError = unknown>(
+ params?: PostsExportParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsExport>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getPostsExportQueryOptions(params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
+    /**
+ * 前回の同期以降に作成・更新された投稿と、削除された投稿のIDを返す
+
+一覧を取得し直す代わりに、クライアントのキャッシュへ差分を反映するために使う
+
+:param request: リクエスト
+:return: 差分同期のページ
+ * @summary Sync posts changed since a sync token
+ */
+export const postsSync = (
+    params?: PostsSyncParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<PostSync>(
+      {url: `/api/v0/dashboard/posts/sync/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getPostsSyncQueryKey = (params?: PostsSyncParams,) => {
+    return [
+    `/api/v0/dashboard/posts/sync/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getPostsSyncQueryOptions = <TData = Awaited<ReturnType<typeof postsSync>>, TError = unknown>(params?: PostsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getPostsSyncQueryKey(params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsSync>>> = ({ signal }) => postsSync(params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type PostsSyncQueryResult = NonNullable<Awaited<ReturnType<typeof postsSync>>>
+export type PostsSyncQueryError = unknown
+
+
+export function usePostsSync<TData = Awaited<ReturnType<typeof postsSync>>, TError = unknown>(
+ params: undefined |  PostsSyncParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsSync>>,
+          TError,
+          Awaited<ReturnType<typeof postsSync>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsSync<TData = Awaited<ReturnType<typeof postsSync>>, TError = unknown>(
+ params?: PostsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsSync>>,
+          TError,
+          Awaited<ReturnType<typeof postsSync>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsSync<TData = Awaited<ReturnType<typeof postsSync>>, TError = unknown>(
+ params?: PostsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary Sync posts changed since a sync token
+ */
+
+export function usePostsSync<TData = Awaited<ReturnType<typeof postsSync>>, TError = unknown>(
+ params?: PostsSyncParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsSync>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getPostsSyncQueryOptions(params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
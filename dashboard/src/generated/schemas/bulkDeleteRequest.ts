@@ -0,0 +1,15 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+/**
+ * 一括削除用シリアライザー
+ */
+export interface BulkDeleteRequest {
+  /** @maxItems 500 */
+  ids: number[];
+}
@@ -0,0 +1,15 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { BulkResultItem } from './bulkResultItem';
+
+/**
+ * 一括操作の結果シリアライザー
+ */
+export interface BulkResult {
+  results: BulkResultItem[];
+}
@@ -0,0 +1,24 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { BulkResultStatusEnum } from './bulkResultStatusEnum';
+
+/**
+ * 一括操作の要素ごとの結果シリアライザー
+ */
+export interface BulkResultItem {
+  /** Position of the item in the request. */
+  index: number;
+  /** @nullable */
+  id: number | null;
+  status: BulkResultStatusEnum;
+  /**
+   * Validation errors when status is "error".
+   * @nullable
+   */
+  errors: {[key: string]: unknown} | null;
+}
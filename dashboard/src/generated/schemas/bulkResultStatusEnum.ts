@@ -0,0 +1,24 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+/**
+ * * `created` - created
+ * * `updated` - updated
+ * * `deleted` - deleted
+ * * `error` - error
+ */
+export type BulkResultStatusEnum = typeof BulkResultStatusEnum[keyof typeof BulkResultStatusEnum];
+
+
+// eslint-disable-next-line @typescript-eslint/no-redeclare
+export const BulkResultStatusEnum = {
+  created: 'created',
+  updated: 'updated',
+  deleted: 'deleted',
+  error: 'error',
+} as const;
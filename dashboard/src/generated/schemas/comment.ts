@@ -9,6 +9,8 @@ import type { User } from './user';
 
 /**
  * コメントシリアライザー
+
+`post` は投稿IDで、`?expand=post` 指定時は投稿のオブジェクトになる
  */
 export interface Comment {
   readonly id: number;
@@ -0,0 +1,22 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { Comment } from './comment';
+
+/**
+ * コメントの差分同期結果シリアライザー
+ */
+export interface CommentSync {
+  /** Comments created or updated since the sync token. */
+  results: Comment[];
+  /** IDs of comments deleted since the sync token. Apply after results. */
+  deleted: number[];
+  /** Token for the next sync. */
+  sync_token: string;
+  /** Whether more changes remain; sync again with sync_token. */
+  has_more: boolean;
+}
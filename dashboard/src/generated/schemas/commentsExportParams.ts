@@ -0,0 +1,19 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { CommentsExportOutput } from './commentsExportOutput';
+
+export type CommentsExportParams = {
+/**
+ * Output format: newline-delimited JSON or CSV with a header row.
+
+* `ndjson` - ndjson
+* `csv` - csv
+ * @minLength 1
+ */
+output?: CommentsExportOutput;
+};
@@ -0,0 +1,32 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+export type CommentsSyncParams = {
+/**
+ * Comma-separated relations to return as nested objects instead of IDs (e.g. "post").
+ */
+expand?: string;
+/**
+ * Comma-separated fields to include; the others are omitted. Use dots to select fields of nested objects (e.g. "id,title,author.username").
+ */
+fields?: string;
+/**
+ * Number of results to return per page.
+ * @minimum 1
+ */
+page_size?: number;
+/**
+ * The sync_token returned by the previous sync. Takes precedence over updated_since.
+ * @minLength 1
+ */
+sync_token?: string;
+/**
+ * Return rows changed after this date/time. Omit both to start a full sync.
+ */
+updated_since?: string;
+};
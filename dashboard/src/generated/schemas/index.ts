@@ -6,16 +6,38 @@
  * OpenAPI spec version: 1.0.0
  */
 
+export * from "./bulkDeleteRequest";
+export * from "./bulkResult";
+export * from "./bulkResultItem";
+export * from "./bulkResultStatusEnum";
 export * from "./comment";
 export * from "./commentCreate";
 export * from "./commentCreateRequest";
+export * from "./commentSync";
+export * from "./commentsExportOutput";
+export * from "./commentsExportParams";
+export * from "./commentsListPagination";
 export * from "./commentsListParams";
+export * from "./commentsRetrieveParams";
+export * from "./commentsSyncParams";
 export * from "./paginatedCommentList";
 export * from "./paginatedPostListList";
+export * from "./paginatedSearchResultList";
 export * from "./patchedPostCreateUpdateRequest";
+export * from "./postBulkUpdateRequest";
 export * from "./postCreateUpdate";
 export * from "./postCreateUpdateRequest";
 export * from "./postDetail";
 export * from "./postList";
+export * from "./postSync";
+export * from "./postsCommentsListParams";
+export * from "./postsExportOutput";
+export * from "./postsExportParams";
+export * from "./postsListPagination";
 export * from "./postsListParams";
+export * from "./postsRetrieveParams";
+export * from "./postsSyncParams";
+export * from "./searchListParams";
+export * from "./searchResult";
+export * from "./searchResultTypeEnum";
 export * from "./user";
\ No newline at end of file
@@ -0,0 +1,24 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+/**
+ * 投稿一括更新用シリアライザー
+
+`id` 以外は省略可能（部分更新）
+ */
+export interface PostBulkUpdateRequest {
+  id: number;
+  /**
+   * @minLength 1
+   * @maxLength 200
+   */
+  title?: string;
+  /** @minLength 1 */
+  content?: string;
+  is_published?: boolean;
+}
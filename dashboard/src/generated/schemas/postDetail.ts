@@ -18,7 +18,13 @@ export interface PostDetail {
   content: string;
   readonly author: User;
   is_published?: boolean;
+  /** Newest comments of the post. Older comments are fetched from comments_next. */
   readonly comments: readonly Comment[];
+  /**
+   * URL of the next page of comments, or null when all comments are embedded.
+   * @nullable
+   */
+  readonly comments_next: string | null;
   readonly created_at: string;
   readonly updated_at: string;
 }
@@ -16,10 +16,6 @@ export interface PostList {
   title: string;
   readonly author: User;
   is_published?: boolean;
-  /** コメント数を取得
-
-:param obj: Postインスタンス
-:return: コメント数 */
   readonly comment_count: number;
   readonly created_at: string;
   readonly updated_at: string;
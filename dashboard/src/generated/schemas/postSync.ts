@@ -0,0 +1,22 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { PostList } from './postList';
+
+/**
+ * 投稿の差分同期結果シリアライザー
+ */
+export interface PostSync {
+  /** Posts created or updated since the sync token. */
+  results: PostList[];
+  /** IDs of posts deleted since the sync token. Apply after results. */
+  deleted: number[];
+  /** Token for the next sync. */
+  sync_token: string;
+  /** Whether more changes remain; sync again with sync_token. */
+  has_more: boolean;
+}
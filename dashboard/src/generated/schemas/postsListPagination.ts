@@ -0,0 +1,16 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+export type PostsListPagination = typeof PostsListPagination[keyof typeof PostsListPagination];
+
+
+// eslint-disable-next-line @typescript-eslint/no-redeclare
+export const PostsListPagination = {
+  page: 'page',
+  cursor: 'cursor',
+} as const;
@@ -0,0 +1,18 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+export type PostsRetrieveParams = {
+/**
+ * Comma-separated relations to return as nested objects instead of IDs (e.g. "post").
+ */
+expand?: string;
+/**
+ * Comma-separated fields to include; the others are omitted. Use dots to select fields of nested objects (e.g. "id,title,author.username").
+ */
+fields?: string;
+};
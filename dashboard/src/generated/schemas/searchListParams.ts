@@ -0,0 +1,24 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+export type SearchListParams = {
+/**
+ * A page number within the paginated result set.
+ */
+page?: number;
+/**
+ * Number of results to return per page.
+ */
+page_size?: number;
+/**
+ * Search terms separated by spaces. Each term must be at least 3 characters.
+ * @minLength 1
+ * @maxLength 200
+ */
+q: string;
+};
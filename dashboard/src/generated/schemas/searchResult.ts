@@ -0,0 +1,23 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import type { SearchResultTypeEnum } from './searchResultTypeEnum';
+
+/**
+ * 検索結果シリアライザー
+ */
+export interface SearchResult {
+  type: SearchResultTypeEnum;
+  id: number;
+  post_id: number;
+  /** Post title as HTML, with matches wrapped in <mark>. */
+  title: string;
+  /** Matching excerpt as HTML, with matches wrapped in <mark>. */
+  snippet: string;
+  /** Relevance score (higher is more relevant). */
+  rank: number;
+}
@@ -0,0 +1,20 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+/**
+ * * `post` - post
+ * * `comment` - comment
+ */
+export type SearchResultTypeEnum = typeof SearchResultTypeEnum[keyof typeof SearchResultTypeEnum];
+
+
+// eslint-disable-next-line @typescript-eslint/no-redeclare
+export const SearchResultTypeEnum = {
+  post: 'post',
+  comment: 'comment',
+} as const;
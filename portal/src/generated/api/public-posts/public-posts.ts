@@ -21,8 +21,11 @@ import type {
 } from '@tanstack/react-query';
 
 import type {
+  PaginatedPublicCommentList,
   PaginatedPublicPostListList,
+  PostsCommentsListParams,
   PostsListParams,
+  PostsRetrieveParams,
   PublicPostDetail
 } from '../../schemas';
 
@@ -135,12 +138,14 @@ export function usePostsList<TData = Awaited<ReturnType<typeof postsList>>, TErr
  */
 export const postsRetrieve = (
     id: number,
+    params?: PostsRetrieveParams,
  signal?: AbortSignal
 ) => {
       
       
       return customInstance<PublicPostDetail>(
-      {url: `/api/v0/portal/posts/${id}/`, method: 'GET', signal
+      {url: `/api/v0/portal/posts/${id}/`, method: 'GET',
+        params, signal
     },
       );
     }
@@ -148,23 +153,25 @@ export const postsRetrieve = (
 
 
 
-export const getPostsRetrieveQueryKey = (id?: number,) => {
+export const getPostsRetrieveQueryKey = (id?: number,
+    params?: PostsRetrieveParams,) => {
     return [
-    `/api/v0/portal/posts/${id}/`
+    `/api/v0/portal/posts/${id}/`, ...(params ? [params]: [])
     ] as const;
     }
 
     
-export const getPostsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+export const getPostsRetrieveQueryOptions = <TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
 ) => {
 
 const {query: queryOptions} = options ?? {};
 
-  const queryKey =  queryOptions?.queryKey ?? getPostsRetrieveQueryKey(id);
+  const queryKey =  queryOptions?.queryKey ?? getPostsRetrieveQueryKey(id,params);
 
   
 
-    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsRetrieve>>> = ({ signal }) => postsRetrieve(id, signal);
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsRetrieve>>> = ({ signal }) => postsRetrieve(id,params, signal);
 
       
 
@@ -178,7 +185,8 @@ export type PostsRetrieveQueryError = unknown
 
 
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params: undefined |  PostsRetrieveParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
         DefinedInitialDataOptions<
           Awaited<ReturnType<typeof postsRetrieve>>,
           TError,
@@ -188,7 +196,8 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  , queryClient?: QueryClient
   ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>> & Pick<
         UndefinedInitialDataOptions<
           Awaited<ReturnType<typeof postsRetrieve>>,
           TError,
@@ -198,7 +207,8 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
  , queryClient?: QueryClient
   ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
 /**
@@ -206,11 +216,119 @@ export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve
  */
 
 export function usePostsRetrieve<TData = Awaited<ReturnType<typeof postsRetrieve>>, TError = unknown>(
- id: number, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+ id: number,
+    params?: PostsRetrieveParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsRetrieve>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getPostsRetrieveQueryOptions(id,params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
+/**
+ * 公開済み投稿のコメントを新しい順にカーソル方式で返す
+
+投稿詳細に埋め込まれた先頭のコメントの続きは、詳細の `comments_next` から取得する
+
+:param request: リクエスト
+:param id: 投稿ID
+:return: コメントのページ
+ * @summary List comments of a published post
+ */
+export const postsCommentsList = (
+    id: number,
+    params?: PostsCommentsListParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<PaginatedPublicCommentList>(
+      {url: `/api/v0/portal/posts/${id}/comments/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getPostsCommentsListQueryKey = (id?: number,
+    params?: PostsCommentsListParams,) => {
+    return [
+    `/api/v0/portal/posts/${id}/comments/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getPostsCommentsListQueryOptions = <TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getPostsCommentsListQueryKey(id,params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof postsCommentsList>>> = ({ signal }) => postsCommentsList(id,params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, enabled: !!(id), ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type PostsCommentsListQueryResult = NonNullable<Awaited<ReturnType<typeof postsCommentsList>>>
+export type PostsCommentsListQueryError = unknown
+
+
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params: undefined |  PostsCommentsListParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsCommentsList>>,
+          TError,
+          Awaited<ReturnType<typeof postsCommentsList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof postsCommentsList>>,
+          TError,
+          Awaited<ReturnType<typeof postsCommentsList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary List comments of a published post
+ */
+
+export function usePostsCommentsList<TData = Awaited<ReturnType<typeof postsCommentsList>>, TError = unknown>(
+ id: number,
+    params?: PostsCommentsListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof postsCommentsList>>, TError, TData>>, }
  , queryClient?: QueryClient 
  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
 
-  const queryOptions = getPostsRetrieveQueryOptions(id,options)
+  const queryOptions = getPostsCommentsListQueryOptions(id,params,options)
 
   const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
 
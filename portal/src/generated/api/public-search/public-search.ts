@@ -0,0 +1,128 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+import {
+  useQuery
+} from '@tanstack/react-query';
+import type {
+  DataTag,
+  DefinedInitialDataOptions,
+  DefinedUseQueryResult,
+  QueryClient,
+  QueryFunction,
+  QueryKey,
+  UndefinedInitialDataOptions,
+  UseQueryOptions,
+  UseQueryResult
+} from '@tanstack/react-query';
+
+import type {
+  PaginatedPublicSearchResultList,
+  SearchListParams
+} from '../../schemas';
+
+import { customInstance } from '../../../lib/axios';
+
+
+
+
+/**
+ * 公開検索のViewSet
+
+公開済み投稿とそのコメントを全文検索する
+ * @summary Search published posts and comments
+ */
+export const searchList = (
+    params: SearchListParams,
+ signal?: AbortSignal
+) => {
+      
+      
+      return customInstance<PaginatedPublicSearchResultList>(
+      {url: `/api/v0/portal/search/`, method: 'GET',
+        params, signal
+    },
+      );
+    }
+  
+
+
+
+export const getSearchListQueryKey = (params?: SearchListParams,) => {
+    return [
+    `/api/v0/portal/search/`, ...(params ? [params]: [])
+    ] as const;
+    }
+
+    
+export const getSearchListQueryOptions = <TData = Awaited<ReturnType<typeof searchList>>, TError = unknown>(params: SearchListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData>>, }
+) => {
+
+const {query: queryOptions} = options ?? {};
+
+  const queryKey =  queryOptions?.queryKey ?? getSearchListQueryKey(params);
+
+  
+
+    const queryFn: QueryFunction<Awaited<ReturnType<typeof searchList>>> = ({ signal }) => searchList(params, signal);
+
+      
+
+      
+
+   return  { queryKey, queryFn, ...queryOptions} as UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData> & { queryKey: DataTag<QueryKey, TData, TError> }
+}
+
+export type SearchListQueryResult = NonNullable<Awaited<ReturnType<typeof searchList>>>
+export type SearchListQueryError = unknown
+
+
+export function useSearchList<TData = Awaited<ReturnType<typeof searchList>>, TError = unknown>(
+ params: SearchListParams, options: { query:Partial<UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData>> & Pick<
+        DefinedInitialDataOptions<
+          Awaited<ReturnType<typeof searchList>>,
+          TError,
+          Awaited<ReturnType<typeof searchList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  DefinedUseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useSearchList<TData = Awaited<ReturnType<typeof searchList>>, TError = unknown>(
+ params: SearchListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData>> & Pick<
+        UndefinedInitialDataOptions<
+          Awaited<ReturnType<typeof searchList>>,
+          TError,
+          Awaited<ReturnType<typeof searchList>>
+        > , 'initialData'
+      >, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+export function useSearchList<TData = Awaited<ReturnType<typeof searchList>>, TError = unknown>(
+ params: SearchListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData>>, }
+ , queryClient?: QueryClient
+  ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> }
+/**
+ * @summary Search published posts and comments
+ */
+
+export function useSearchList<TData = Awaited<ReturnType<typeof searchList>>, TError = unknown>(
+ params: SearchListParams, options?: { query?:Partial<UseQueryOptions<Awaited<ReturnType<typeof searchList>>, TError, TData>>, }
+ , queryClient?: QueryClient 
+ ):  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> } {
+
+  const queryOptions = getSearchListQueryOptions(params,options)
+
+  const query = useQuery(queryOptions, queryClient) as  UseQueryResult<TData, TError> & { queryKey: DataTag<QueryKey, TData, TError> };
+
+  query.queryKey = queryOptions.queryKey ;
+
+  return query;
+}
+
+
+
+
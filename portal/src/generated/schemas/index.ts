@@ -6,9 +6,17 @@
  * OpenAPI spec version: 1.0.0
  */
 
+export * from "./paginatedPublicCommentList";
 export * from "./paginatedPublicPostListList";
+export * from "./paginatedPublicSearchResultList";
+export * from "./postsCommentsListParams";
+export * from "./postsListPagination";
 export * from "./postsListParams";
+export * from "./postsRetrieveParams";
 export * from "./publicComment";
 export * from "./publicPostDetail";
 export * from "./publicPostList";
-export * from "./publicUser";
\ No newline at end of file
+export * from "./publicSearchResult";
+export * from "./publicUser";
+export * from "./searchListParams";
+export * from "./searchResultTypeEnum";
\ No newline at end of file
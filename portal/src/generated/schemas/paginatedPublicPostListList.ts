@@ -8,7 +8,10 @@
 import type { PublicPostList } from './publicPostList';
 
 export interface PaginatedPublicPostListList {
-  count: number;
+  /** Total number of results (page number mode only). */
+  count?: number;
+  /** Whether count is a planner estimate instead of an exact count. */
+  count_approximate?: boolean;
   /** @nullable */
   next?: string | null;
   /** @nullable */
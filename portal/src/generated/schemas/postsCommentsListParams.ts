@@ -0,0 +1,22 @@
+/**
+ * Generated by orval v7.17.0 🍺
+ * Do not edit manually.
+ * Template API
+ * Django + React Template API
+ * OpenAPI spec version: 1.0.0
+ */
+
+export type PostsCommentsListParams = {
+/**
+ * The pagination cursor value.
+ */
+cursor?: string;
+/**
+ * Comma-separated fields to include; the others are omitted. Use dots to select fields of nested objects (e.g. "id,title,author.username").
+ */
+fields?: string;
+/**
+ * Number of results to return per page.
+ */
+page_size?: number;
+};
@@ -5,8 +5,17 @@
  * Django + React Template API
  * OpenAPI spec version: 1.0.0
  */
+import type { PostsListPagination } from './postsListPagination';
 
 export type PostsListParams = {
+/**
+ * The pagination cursor value (cursor mode).
+ */
+cursor?: string;
+/**
+ * Comma-separated fields to include; the others are omitted. Use dots to select fields of nested objects (e.g. "id,title,author.username").
+ */
+fields?: string;
 /**
  * A page number within the paginated result set.
  */
@@ -15,4 +24,8 @@ page?: number;
  * Number of results to return per page.
  */
 page_size?: number;
+/**
+ * Pagination mode. "cursor" switches to keyset pagination without a total count.
+ */
+pagination?: PostsListPagination;
 };
@@ -17,6 +17,12 @@ export interface PublicPostDetail {
   title: string;
   content: string;
   readonly author: PublicUser;
+  /** Newest comments of the post. Older comments are fetched from comments_next. */
   readonly comments: readonly PublicComment[];
+  /**
+   * URL of the next page of comments, or null when all comments are embedded.
+   * @nullable
+   */
+  readonly comments_next: string | null;
   readonly created_at: string;
 }
@@ -15,10 +15,6 @@ export interface PublicPostList {
   /** @maxLength 200 */
   title: string;
   readonly author: PublicUser;
-  /** コメント数を取得
-
-:param obj: Postインスタンス
-:return: コメント数 */
   readonly comment_count: number;
   readonly created_at: string;
 }